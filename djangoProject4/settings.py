@@ -224,3 +224,66 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': 60.0,  # 每分钟检查一次
     },
 }
+
+# 测试套件执行默认配置（可被套件的execution_config和执行请求参数覆盖）
+TEST_EXECUTION_DEFAULTS = {
+    'mode': os.environ.get('TEST_EXECUTION_MODE', 'serial'),  # serial 串行 / parallel 按变量依赖并行
+    'max_workers': int(os.environ.get('TEST_EXECUTION_MAX_WORKERS', '8')),  # 并行执行的最大线程数
+    'backend': os.environ.get('TEST_EXECUTION_BACKEND', 'threads'),  # threads 线程池 / asyncio 事件循环
+    'max_in_flight': int(os.environ.get('TEST_EXECUTION_MAX_IN_FLIGHT', '100')),  # asyncio后端最大在途请求数
+    'per_host_limit': int(os.environ.get('TEST_EXECUTION_PER_HOST_LIMIT', '20')),  # asyncio后端单主机最大并发数
+    'retry_max_attempts': int(os.environ.get('TEST_EXECUTION_RETRY_MAX_ATTEMPTS', '1')),  # 用例最大尝试次数，1表示不重试
+    'retry_budget': int(os.environ.get('TEST_EXECUTION_RETRY_BUDGET', '20')),  # 一次套件执行内的最大重试总次数
+}
+
+# 异步执行运行状态存储（Redis），默认与Celery使用同一实例
+TEST_EXECUTION_REDIS_URL = os.environ.get('TEST_EXECUTION_REDIS_URL', CELERY_BROKER_URL)
+TEST_RUN_STATUS_TTL = int(os.environ.get('TEST_RUN_STATUS_TTL', str(24 * 3600)))  # 运行状态保留时长（秒）
+TEST_PROGRESS_ENABLED = os.environ.get('TEST_PROGRESS_ENABLED', 'true').lower() == 'true'  # 是否发布执行进度事件
+TEST_PROGRESS_STREAM_TIMEOUT = int(os.environ.get('TEST_PROGRESS_STREAM_TIMEOUT', '3600'))  # 进度流最长保持时间（秒）
+
+# 测试流量HTTP连接池配置（按执行环境复用长连接）
+TEST_HTTP_POOL = {
+    'pool_connections': int(os.environ.get('TEST_HTTP_POOL_CONNECTIONS', '10')),  # 每个会话缓存的主机连接池数量
+    'pool_maxsize': int(os.environ.get('TEST_HTTP_POOL_MAXSIZE', '32')),  # 每个主机的最大连接数
+    'keep_alive': os.environ.get('TEST_HTTP_KEEP_ALIVE', 'true').lower() == 'true',  # 是否保持长连接
+    'connect_timeout': float(os.environ.get('TEST_HTTP_CONNECT_TIMEOUT', '10')),  # 默认连接超时（秒）
+    'read_timeout': float(os.environ.get('TEST_HTTP_READ_TIMEOUT', '60')),  # 环境未配置time_out时的读取超时（秒）
+    'dns_cache_ttl': float(os.environ.get('TEST_HTTP_DNS_CACHE_TTL', '300')),  # 执行前预热过的主机名的DNS缓存时间（秒）
+}
+
+# 响应体读取配置
+TEST_RESPONSE_CAPTURE = {
+    'max_capture_bytes': int(os.environ.get('TEST_RESPONSE_MAX_CAPTURE_BYTES', str(64 * 1024))),  # 写入结果数据的响应体上限（字节）
+    'max_parse_bytes': int(os.environ.get('TEST_RESPONSE_MAX_PARSE_BYTES', str(10 * 1024 * 1024))),  # 用于解析和断言的响应体上限（字节）
+    'chunk_size': 64 * 1024,  # 流式读取分块大小
+}
+
+# 目标主机流量限制（跨进程共享，状态保存在TEST_EXECUTION_REDIS_URL）
+# 执行环境上配置的max_concurrency/rate_limit优先，其次按主机配置，如 {'api.example.com:8080': {'max_concurrency': 20, 'rate_limit': 50}}
+TEST_TRAFFIC_LIMITS = {}
+TEST_TRAFFIC_LIMIT = {
+    'max_wait': float(os.environ.get('TEST_TRAFFIC_LIMIT_MAX_WAIT', '60')),  # 等待限流名额的最长时间（秒）
+    'lease': float(os.environ.get('TEST_TRAFFIC_LIMIT_LEASE', '300')),  # 并发名额的租约时长（秒）
+}
+
+# 套件执行计划缓存（按套件ID和用例版本缓存已编译的用例，进程内 + Redis）
+TEST_SUITE_PLAN_CACHE_ENABLED = os.environ.get('TEST_SUITE_PLAN_CACHE_ENABLED', 'true').lower() == 'true'  # 是否使用Redis共享缓存
+TEST_SUITE_PLAN_CACHE_TTL = int(os.environ.get('TEST_SUITE_PLAN_CACHE_TTL', str(24 * 3600)))  # Redis缓存保留时长（秒）
+
+# 请求录制文件目录（执行配置 cassette 为 record/replay 时读写，每个套件一个 gzip 压缩文件）
+TEST_CASSETTE_DIR = os.environ.get('TEST_CASSETTE_DIR', os.path.join(BASE_DIR, 'cassettes'))
+
+# 响应体内容寻址存储（较大的响应内容按SHA-256摘要压缩存入ResponseBlob，执行结果和日志中只保存引用）
+TEST_BLOB_STORE = {
+    'enabled': os.environ.get('TEST_BLOB_STORE_ENABLED', 'true').lower() == 'true',  # 是否启用
+    'min_size': int(os.environ.get('TEST_BLOB_STORE_MIN_SIZE', '1024')),  # 不小于该字节数的内容才单独存储
+    'compress_level': int(os.environ.get('TEST_BLOB_STORE_COMPRESS_LEVEL', '6')),  # zlib压缩级别
+}
+
+# 执行追踪存储配置（追踪级别和采样率在执行配置中设置，事件由后台线程写入TEST_EXECUTION_REDIS_URL）
+TEST_EXECUTION_TRACE = {
+    'max_events': int(os.environ.get('TEST_TRACE_MAX_EVENTS', '5000')),  # 单次执行最多保存的事件数
+    'ttl': int(os.environ.get('TEST_TRACE_TTL', str(24 * 3600))),  # 追踪数据保留时长（秒）
+    'queue_size': int(os.environ.get('TEST_TRACE_QUEUE_SIZE', '10000')),  # 内存队列长度，队列满时丢弃事件
+}
@@ -0,0 +1,241 @@
+"""
+基于 asyncio 的执行后端
+
+与线程池后端相比，单个进程内即可同时发出数百个请求而无需同样数量的线程，
+适合在一个 Celery worker 中驱动大型套件。请求通过 httpx.AsyncClient 发送，
+全局在途请求数和每个主机的并发数分别受 max_in_flight / per_host_limit 限制。
+响应解析、变量提取和断言与同步执行共用 core 中的实现，因此产出的执行结果完全一致。
+
+httpx 为可选依赖，未安装时 is_available() 返回 False，调用方应回退到线程池后端。
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from django.utils import timezone
+
+from test_platform.execution.capture import ResponseCapture, get_capture_config
+from test_platform.execution.core import (
+    CaseResult, build_case_result, build_request_kwargs, render_request, timeout_result
+)
+from test_platform.execution.deadline import resolve_request_timeout
+from test_platform.execution.http_pool import (
+    create_cookie_jar, get_environment_timeout, get_pool_config, resolve_url
+)
+from test_platform.execution.rate_limit import TrafficLimiter, TrafficLimitTimeout
+from test_platform.execution.retry import next_retry_delay, retry_entry
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - 取决于部署环境
+    httpx = None
+
+
+def is_available():
+    """当前环境是否可以使用 asyncio 执行后端"""
+    return httpx is not None
+
+
+def describe_async_request_error(error):
+    """将 httpx 请求异常转换为用户可读的错误信息（与同步执行的提示保持一致）"""
+    if isinstance(error, httpx.ConnectTimeout):
+        return "连接超时，请检查网络或服务是否可用"
+    if isinstance(error, httpx.TimeoutException):
+        return "请求超时，服务器响应时间过长"
+    if isinstance(error, httpx.ConnectError):
+        return "无法连接到服务器，请检查网络或服务是否可用"
+    if "codec can't encode" in str(error):
+        return "请求中包含无法编码的特殊字符，请检查请求参数"
+    return f"请求发送失败: {str(error)}"
+
+
+class HostLimiter:
+    """限制全局在途请求数以及每个主机的并发请求数"""
+
+    def __init__(self, max_in_flight, per_host_limit):
+        self.max_in_flight = max(1, int(max_in_flight or 1))
+        self.per_host_limit = max(1, int(per_host_limit or self.max_in_flight))
+        self._global = asyncio.Semaphore(self.max_in_flight)
+        self._hosts = {}
+
+    @asynccontextmanager
+    async def slot(self, url):
+        host = urlsplit(url).netloc
+        host_semaphore = self._hosts.get(host)
+        if host_semaphore is None:
+            host_semaphore = self._hosts[host] = asyncio.Semaphore(self.per_host_limit)
+        # 先占用主机名额再占用全局名额，避免等待某个繁忙主机时占住全局名额
+        async with host_semaphore:
+            async with self._global:
+                yield
+
+
+class AsyncHttpClient:
+    """
+    异步HTTP客户端，对应同步执行中的 HttpClient
+
+    需在事件循环内通过 async with 使用，退出时关闭底层连接池。
+    """
+
+    def __init__(self, environment=None, execution_config=None):
+        execution_config = execution_config or {}
+        pool_config = get_pool_config()
+        max_in_flight = int(execution_config.get('max_in_flight') or 100)
+        self.timeout = get_environment_timeout(environment, execution_config.get('case_timeout'))
+        connect_timeout, read_timeout = self.timeout
+
+        self.environment = environment
+        self.limiter = HostLimiter(max_in_flight, execution_config.get('per_host_limit'))
+        # 跨进程共享的目标主机限流
+        self.traffic_limiter = TrafficLimiter(environment)
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_in_flight,
+                max_keepalive_connections=max_in_flight if pool_config['keep_alive'] else 0
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            cookies=create_cookie_jar()
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._client.aclose()
+
+    async def request(self, method, url, **kwargs):
+        # httpx 中原始文本请求体需通过 content 传递
+        if isinstance(kwargs.get('data'), (str, bytes)):
+            kwargs['content'] = kwargs.pop('data')
+        if isinstance(kwargs.get('timeout'), tuple):
+            connect_timeout, read_timeout = kwargs['timeout']
+            kwargs['timeout'] = httpx.Timeout(read_timeout, connect=connect_timeout)
+        url = resolve_url(self.environment, url)
+        request = self._client.build_request(method, url, **kwargs)
+        chunk_size = get_capture_config()['chunk_size']
+        capture = ResponseCapture()
+        async with self.limiter.slot(url), self.traffic_limiter.slot_async(url):
+            # 流式读取响应体，返回 capture.CapturedResponse
+            response = await self._client.send(request, stream=True)
+            try:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    capture.feed(chunk)
+            finally:
+                await response.aclose()
+        return capture.finish(response.status_code, response.headers)
+
+
+def _async_error_kind(error):
+    if isinstance(error, (httpx.NetworkError, httpx.RemoteProtocolError)):
+        return 'connection'
+    return 'request'
+
+
+async def execute_case_async(spec, context, client, deadline=None, retry_policy=None, retry_budget=None):
+    """
+    异步执行单个用例，返回值与 core.execute_case 相同
+
+    参数:
+        spec: CaseSpec 用例描述
+        context: 变量上下文字典（只读）
+        client: AsyncHttpClient
+        deadline: Deadline，超出剩余预算时取消请求（包括排队等待并发名额的时间）
+        retry_policy: RetryPolicy，瞬时故障时按策略重试
+        retry_budget: RetryBudget，同一次执行内共享的重试预算
+    """
+    request_info = render_request(spec, context)
+    request_kwargs = build_request_kwargs(spec, request_info)
+
+    attempt, retries = 1, []
+    while True:
+        result = await send_case_request_async(spec, request_info, request_kwargs, client, deadline)
+        delay = next_retry_delay(retry_policy, retry_budget, result, attempt, deadline)
+        if delay is None:
+            break
+        retries.append(retry_entry(attempt, result, delay))
+        await asyncio.sleep(delay)
+        attempt += 1
+    result.attempts = attempt
+    result.retries = retries
+    return result
+
+
+async def send_case_request_async(spec, request_info, request_kwargs, client, deadline=None):
+    """异步发送一次请求并生成执行结果（不重试）"""
+    if deadline is not None and deadline.expired():
+        return timeout_result(request_info)
+    request_kwargs['timeout'] = resolve_request_timeout(client.timeout, spec.timeout, deadline)
+    remaining = deadline.remaining() if deadline is not None else None
+
+    started_at = timezone.localtime(timezone.now())
+    start = time.perf_counter()
+    try:
+        response = await asyncio.wait_for(
+            client.request(spec.method, request_info['url'], **request_kwargs), timeout=remaining
+        )
+    except asyncio.TimeoutError:
+        return timeout_result(request_info, started_at, time.perf_counter() - start)
+    except TrafficLimitTimeout as e:
+        return timeout_result(
+            request_info, started_at, time.perf_counter() - start, error=str(e), error_kind='rate_limit'
+        )
+    except httpx.TimeoutException as e:
+        return timeout_result(
+            request_info, started_at, time.perf_counter() - start,
+            error=describe_async_request_error(e), error_details=str(e)
+        )
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
+        return CaseResult(
+            status='ERROR',
+            request=request_info,
+            started_at=started_at,
+            duration=time.perf_counter() - start,
+            error=describe_async_request_error(e),
+            error_details=str(e),
+            error_kind=_async_error_kind(e)
+        )
+    duration = time.perf_counter() - start
+    return build_case_result(spec, request_info, started_at, duration, response)
+
+
+class AsyncDependencyScheduler:
+    """
+    按依赖关系调度协程，对应线程池后端的 DependencyScheduler
+
+    每个任务在其依赖全部完成后才调用 make_task 创建协程，并发度由 AsyncHttpClient 的限流控制。
+    on_complete 在事件循环中同步调用，可以安全地修改共享的变量上下文。
+    任务按优先级从高到低启动，同时就绪的任务按此顺序排队等待限流名额。
+    """
+
+    def __init__(self, dependencies, priorities=None):
+        self.dependencies = [set(deps) for deps in dependencies]
+        self.priorities = priorities
+
+    async def run(self, make_task, on_complete):
+        """
+        执行全部任务
+
+        参数:
+            make_task: make_task(index) -> 协程对象，在依赖完成后调用
+            on_complete: on_complete(index, result, error)
+        """
+        total = len(self.dependencies)
+        if total == 0:
+            return
+        done = [asyncio.Event() for _ in range(total)]
+
+        async def run_one(index):
+            for dep in self.dependencies[index]:
+                await done[dep].wait()
+            try:
+                result, error = await make_task(index), None
+            except Exception as e:
+                result, error = None, e
+            on_complete(index, result, error)
+            done[index].set()
+
+        order = range(total)
+        if self.priorities:
+            order = sorted(order, key=lambda index: (-self.priorities[index], index))
+        await asyncio.gather(*(run_one(index) for index in order))
@@ -0,0 +1,173 @@
+"""
+响应体的内容寻址存储
+
+执行结果(TestSuiteResult / TestResult / TestPlanResult 的 result_data)和执行日志
+(TestExecutionLog.response_body)中较大的响应内容按内容的SHA-256摘要以zlib压缩后存入 ResponseBlob，
+记录中只保留引用 {"$blob": 摘要, "size": 原始字节数}。夜间重复执行得到的相同响应体只存储一次，
+查询报告时也不必再读取整段大文本。
+
+- pack: 写入记录前调用，把结构中 BLOB_FIELDS 字段里不小于 min_size 的内容替换为引用；
+  pack_value 把整个值作为一份内容存储
+- unpack: 读取记录后调用，一次查询取回结构中的全部引用并还原；找不到的引用保持原样
+- 关闭 enabled 后不再产生新的引用，已有引用仍可还原
+
+配置来自 settings.TEST_BLOB_STORE。
+"""
+import hashlib
+import json
+import logging
+import zlib
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from test_platform.models import ResponseBlob
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BLOB_STORE_CONFIG = {
+    # 是否把较大的响应内容存入 ResponseBlob
+    'enabled': True,
+    # 序列化后不小于该字节数的内容才单独存储
+    'min_size': 1024,
+    # zlib 压缩级别
+    'compress_level': 6,
+}
+
+# 存储为引用的字段：响应体、原始响应文本、日志中的响应体以及报告中的响应数据
+BLOB_FIELDS = ('body', 'raw_text', 'response_body', 'responseData')
+
+BLOB_REF_KEY = '$blob'
+
+
+def get_blob_store_config():
+    config = dict(DEFAULT_BLOB_STORE_CONFIG)
+    config.update(getattr(settings, 'TEST_BLOB_STORE', {}) or {})
+    return config
+
+
+def is_blob_ref(value):
+    return isinstance(value, dict) and isinstance(value.get(BLOB_REF_KEY), str) and set(value) <= {BLOB_REF_KEY, 'size'}
+
+
+def _serialize(value):
+    return json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def _replace_fields(value, replace):
+    """复制结构并对 BLOB_FIELDS 字段的值调用 replace，不修改原对象"""
+    if isinstance(value, list):
+        return [_replace_fields(item, replace) for item in value]
+    if isinstance(value, dict):
+        if is_blob_ref(value):
+            return value
+        return {
+            key: replace(item) if key in BLOB_FIELDS else _replace_fields(item, replace)
+            for key, item in value.items()
+        }
+    return value
+
+
+def pack(value):
+    """
+    把结构中较大的响应内容存入 ResponseBlob 并替换为引用
+
+    返回:
+        替换后的新结构；未开启或写入失败时返回原结构
+    """
+    return _store(value, lambda replace: _replace_fields(value, replace))
+
+
+def pack_value(value):
+    """把整个值作为一份响应内容存储（如日志的 response_body），较小时原样返回"""
+    return _store(value, lambda replace: replace(value))
+
+
+def _store(value, transform):
+    config = get_blob_store_config()
+    if not config['enabled']:
+        return value
+    min_size = int(config['min_size'])
+    blobs = {}
+
+    def replace(item):
+        if item is None or is_blob_ref(item):
+            return item
+        content = _serialize(item)
+        if len(content) < min_size:
+            return _replace_fields(item, replace)
+        sha256 = hashlib.sha256(content).hexdigest()
+        blobs.setdefault(sha256, content)
+        return {BLOB_REF_KEY: sha256, 'size': len(content)}
+
+    packed = transform(replace)
+    if not blobs:
+        return value
+    try:
+        existing = set(ResponseBlob.objects.filter(sha256__in=blobs).values_list('sha256', flat=True))
+        ResponseBlob.objects.bulk_create(
+            [
+                ResponseBlob(sha256=sha256, size=len(content), data=zlib.compress(content, config['compress_level']))
+                for sha256, content in blobs.items() if sha256 not in existing
+            ],
+            batch_size=50,
+            ignore_conflicts=True
+        )
+    except DatabaseError:
+        logger.warning("写入响应体存储失败，按原文保存", exc_info=True)
+        return value
+    return packed
+
+
+def _collect_refs(value, refs):
+    if is_blob_ref(value):
+        refs.add(value[BLOB_REF_KEY])
+    elif isinstance(value, list):
+        for item in value:
+            _collect_refs(item, refs)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_refs(item, refs)
+
+
+def load_blobs(sha256_list):
+    """读取并解压响应体，返回 {摘要: 原始值}"""
+    contents = {}
+    for sha256, data in ResponseBlob.objects.filter(sha256__in=list(sha256_list)).values_list('sha256', 'data'):
+        contents[sha256] = json.loads(zlib.decompress(bytes(data)).decode('utf-8'))
+    return contents
+
+
+def unpack(value):
+    """还原结构中的全部引用，返回新结构；没有引用时原样返回"""
+    refs = set()
+    _collect_refs(value, refs)
+    if not refs:
+        return value
+    try:
+        contents = load_blobs(refs)
+    except (DatabaseError, zlib.error, ValueError):
+        logger.warning("读取响应体存储失败", exc_info=True)
+        return value
+
+    def restore(item):
+        if is_blob_ref(item):
+            return contents.get(item[BLOB_REF_KEY], item)
+        if isinstance(item, list):
+            return [restore(child) for child in item]
+        if isinstance(item, dict):
+            return {key: restore(child) for key, child in item.items()}
+        return item
+
+    return restore(value)
+
+
+def pack_json(value):
+    """pack 后序列化为JSON文本，用于写入 TextField"""
+    return json.dumps(pack(value), ensure_ascii=False, default=str)
+
+
+def unpack_json(text):
+    """解析 TextField 中的JSON文本并还原引用，解析失败时抛出 json.JSONDecodeError"""
+    return unpack(json.loads(text))
@@ -0,0 +1,133 @@
+"""
+响应体的有界读取
+
+响应体以流式分块读取：完整内容只计算大小和SHA-256摘要，内存中最多保留 max_parse_bytes 字节
+用于解析JSON、提取变量和执行断言；写入执行结果、日志等存储时再按 max_capture_bytes 截断，
+并在截断处附加标记。二进制内容不解码为文本，只记录大小和摘要。
+"""
+import hashlib
+import json
+
+from django.conf import settings
+
+
+DEFAULT_CAPTURE_CONFIG = {
+    # 存储到执行结果/日志中的响应体最大字节数
+    'max_capture_bytes': 64 * 1024,
+    # 内存中保留用于解析和断言的最大字节数，超出时不再解析JSON
+    'max_parse_bytes': 10 * 1024 * 1024,
+    # 流式读取的分块大小
+    'chunk_size': 64 * 1024,
+}
+
+# 视为文本的内容类型关键字，其他内容类型按二进制处理
+TEXT_CONTENT_TYPES = ('text/', 'json', 'xml', 'javascript', 'x-www-form-urlencoded', 'html')
+
+BINARY_PLACEHOLDER = '[二进制内容，共{size}字节，sha256={sha256}]'
+TRUNCATION_MARKER = '...[内容已截断，共{size}字节]'
+
+
+def get_capture_config():
+    config = dict(DEFAULT_CAPTURE_CONFIG)
+    config.update(getattr(settings, 'TEST_RESPONSE_CAPTURE', {}) or {})
+    return config
+
+
+def is_text_content(content_type):
+    """内容类型为空时按文本处理（与历史行为一致）"""
+    content_type = (content_type or '').lower()
+    return not content_type or any(keyword in content_type for keyword in TEXT_CONTENT_TYPES)
+
+
+class ResponseCapture:
+    """流式读取响应体时的累加器"""
+
+    def __init__(self, max_parse_bytes=None):
+        self.max_parse_bytes = max_parse_bytes or get_capture_config()['max_parse_bytes']
+        self._digest = hashlib.sha256()
+        self._chunks = []
+        self._kept = 0
+        self.size = 0
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        self._digest.update(chunk)
+        self.size += len(chunk)
+        if self._kept < self.max_parse_bytes:
+            chunk = chunk[:self.max_parse_bytes - self._kept]
+            self._chunks.append(chunk)
+            self._kept += len(chunk)
+
+    def finish(self, status_code, headers):
+        return CapturedResponse(
+            status_code=status_code,
+            headers=headers,
+            content=b''.join(self._chunks),
+            size=self.size,
+            sha256=self._digest.hexdigest()
+        )
+
+
+class CapturedResponse:
+    """
+    读取完成的响应
+
+    提供 status_code / headers / encoding / text / json()，可直接用于 core.build_case_result
+    """
+
+    def __init__(self, status_code, headers, content, size, sha256):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.size = size
+        self.sha256 = sha256
+        self.encoding = 'utf-8'
+        self._text = None
+
+    @property
+    def truncated(self):
+        """内存中保留的内容是否不完整"""
+        return len(self.content) < self.size
+
+    @property
+    def is_binary(self):
+        return not is_text_content(self.headers.get('Content-Type', ''))
+
+    @property
+    def text(self):
+        if self._text is None:
+            if self.is_binary:
+                self._text = BINARY_PLACEHOLDER.format(size=self.size, sha256=self.sha256)
+            else:
+                self._text = self.content.decode(self.encoding or 'utf-8', errors='replace')
+                if self.truncated:
+                    self._text += TRUNCATION_MARKER.format(size=self.size)
+        return self._text
+
+    def json(self):
+        # 内容不完整或为二进制时无法解析，由调用方按文本处理
+        if self.truncated or self.is_binary:
+            raise ValueError('响应内容不完整或为二进制，无法解析为JSON')
+        return json.loads(self.content.decode(self.encoding or 'utf-8'))
+
+
+def truncate_for_storage(value, limit=None):
+    """
+    按存储上限截断响应内容
+
+    参数:
+        value: 解析后的响应体（字典、列表或字符串）
+        limit: 最大字节数，默认取 max_capture_bytes
+
+    返回:
+        (可能被截断的值, 是否截断)；截断后的值为带截断标记的字符串
+    """
+    limit = limit or get_capture_config()['max_capture_bytes']
+    if value is None:
+        return value, False
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+    encoded = text.encode('utf-8')
+    if len(encoded) <= limit:
+        return value, False
+    return encoded[:limit].decode('utf-8', errors='ignore') + TRUNCATION_MARKER.format(size=len(encoded)), True
@@ -0,0 +1,255 @@
+"""
+请求录制与回放（cassette）
+
+执行配置 cassette 为 record 时，套件执行发出的每个请求及其响应按发送顺序录制到该套件的录制文件中；
+为 replay 时不访问网络，由进程内的回放客户端按录制内容返回响应，
+响应解析、变量提取、断言和报告逻辑与真实执行完全相同，可脱离测试环境快速回归，
+也可作为衡量平台自身开销的固定基准。
+
+- 录制文件为 gzip 压缩的 JSON Lines，每个套件一个文件，保存在 settings.TEST_CASSETTE_DIR 下
+- 按 方法 + URL + 查询参数 + 请求体摘要 匹配请求，请求头（如每次登录得到的令牌）不参与匹配；
+  请求体中含有时间戳等动态内容而无法精确匹配时，退而按 方法 + URL 匹配
+- 同一请求录制了多次（如重试、轮询）时按录制顺序依次返回，用完后重复返回最后一次
+- 只执行部分用例（如重跑失败用例）时录制结果与已有录制合并，只替换本次重新录制的请求
+- 回放时找不到匹配的请求，该用例记为 ERROR
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from urllib.parse import urlencode
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+from requests.structures import CaseInsensitiveDict
+
+from test_platform.execution.capture import CapturedResponse
+from test_platform.execution.http_pool import get_environment_timeout
+
+
+CASSETTE_MODES = ('off', 'record', 'replay')
+
+CASSETTE_VERSION = 1
+
+# 同一进程内串行写入录制文件，避免合并时的读-改-写互相覆盖
+_save_lock = threading.Lock()
+
+
+class CassetteMiss(requests.RequestException):
+    """回放时录制中没有匹配的请求"""
+
+
+class CassetteNotFound(ValueError):
+    """回放模式下套件没有录制文件"""
+
+
+def get_cassette_mode(execution_config):
+    mode = (execution_config.get('cassette') or 'off')
+    return mode if mode in CASSETTE_MODES else 'off'
+
+
+def cassette_path(suite_id):
+    directory = getattr(settings, 'TEST_CASSETTE_DIR', None) or os.path.join(settings.BASE_DIR, 'cassettes')
+    return os.path.join(directory, f'suite_{suite_id}.jsonl.gz')
+
+
+def _canonical(value):
+    if value is None:
+        return ''
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def request_keys(method, url, kwargs):
+    """
+    计算请求的匹配键
+
+    返回:
+        (精确匹配键, 宽松匹配键)
+    """
+    loose_key = f'{method.upper()} {url}'
+    params = kwargs.get('params')
+    if params:
+        items = params.items() if isinstance(params, dict) else params
+        loose_key += '?' + urlencode(sorted((str(k), _canonical(v)) for k, v in items))
+    body = kwargs.get('json', kwargs.get('data'))
+    body_digest = hashlib.sha1(_canonical(body).encode('utf-8')).hexdigest()[:16]
+    return f'{loose_key}#{body_digest}', f'{method.upper()} {url}'
+
+
+def _encode_content(content):
+    try:
+        return {'text': content.decode('utf-8')}
+    except UnicodeDecodeError:
+        return {'base64': base64.b64encode(content).decode('ascii')}
+
+
+def _decode_content(entry):
+    if 'base64' in entry:
+        return base64.b64decode(entry['base64'])
+    return (entry.get('text') or '').encode('utf-8')
+
+
+class Cassette:
+    """一个套件的录制内容，可在多个线程中同时录制或回放"""
+
+    def __init__(self, suite_id, mode, entries=None):
+        self.suite_id = suite_id
+        self.mode = mode
+        self.path = cassette_path(suite_id)
+        self._lock = threading.Lock()
+        self._loaded = list(entries or [])
+        self._recorded = []
+        self._exact = {}
+        self._loose = {}
+        self._cursors = {}
+        for entry in self._loaded:
+            self._exact.setdefault(entry['key'], []).append(entry)
+            self._loose.setdefault(entry['loose_key'], []).append(entry)
+        self.replayed = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, suite_id, mode='replay'):
+        """读取套件的录制文件，文件不存在时抛出 CassetteNotFound"""
+        path = cassette_path(suite_id)
+        if not os.path.exists(path):
+            raise CassetteNotFound(f'测试套件 {suite_id} 没有录制文件，请先以 record 模式执行一次')
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        entries = [line for line in lines[1:] if isinstance(line, dict) and 'key' in line]
+        return cls(suite_id, mode, entries)
+
+    def record(self, method, url, kwargs, response):
+        key, loose_key = request_keys(method, url, kwargs)
+        entry = {
+            'key': key,
+            'loose_key': loose_key,
+            'status_code': response.status_code,
+            'headers': dict(response.headers),
+            'size': response.size,
+            'sha256': response.sha256,
+            **_encode_content(response.content)
+        }
+        with self._lock:
+            self._recorded.append(entry)
+
+    def _next(self, index, key):
+        entries = index.get(key)
+        if not entries:
+            return None
+        cursor_key = (id(index), key)
+        position = self._cursors.get(cursor_key, 0)
+        self._cursors[cursor_key] = position + 1
+        return entries[min(position, len(entries) - 1)]
+
+    def replay(self, method, url, kwargs):
+        """返回录制的响应(CapturedResponse)，没有匹配的请求时抛出 CassetteMiss"""
+        key, loose_key = request_keys(method, url, kwargs)
+        with self._lock:
+            entry = self._next(self._exact, key) or self._next(self._loose, loose_key)
+            if entry is None:
+                self.misses += 1
+                raise CassetteMiss(f'录制中没有匹配的请求: {loose_key}')
+            self.replayed += 1
+        return CapturedResponse(
+            status_code=entry['status_code'],
+            headers=CaseInsensitiveDict(entry.get('headers') or {}),
+            content=_decode_content(entry),
+            size=entry.get('size', 0),
+            sha256=entry.get('sha256')
+        )
+
+    def save(self, merge=False):
+        """
+        写入录制文件
+
+        参数:
+            merge: 为True时保留已有录制中本次没有重新录制的请求
+        """
+        with _save_lock:
+            entries = self._recorded
+            if merge and os.path.exists(self.path):
+                recorded_keys = {entry['key'] for entry in entries}
+                previous = Cassette.load(self.suite_id)._loaded
+                entries = [entry for entry in previous if entry['key'] not in recorded_keys] + entries
+
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            header = {
+                'version': CASSETTE_VERSION,
+                'suite_id': self.suite_id,
+                'recorded_at': timezone.localtime(timezone.now()).strftime('%Y-%m-%d %H:%M:%S'),
+                'entries': len(entries)
+            }
+            # 每次写入使用唯一的临时文件，写完后原子替换
+            fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + '.', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8') as f:
+                    for line in [header] + entries:
+                        f.write(json.dumps(line, ensure_ascii=False) + '\n')
+                os.replace(temp_path, self.path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+    def summary(self):
+        """记录在套件执行结果中的录制/回放信息"""
+        data = {'mode': self.mode, 'path': self.path}
+        if self.mode == 'record':
+            data['recorded'] = len(self._recorded)
+        else:
+            data.update(entries=len(self._loaded), replayed=self.replayed, misses=self.misses)
+        return data
+
+
+def open_cassette(suite_id, execution_config):
+    """按执行配置打开套件的录制，未开启时返回None；回放时录制文件不存在抛出 CassetteNotFound"""
+    mode = get_cassette_mode(execution_config)
+    if mode == 'off':
+        return None
+    if mode == 'replay':
+        return Cassette.load(suite_id)
+    return Cassette(suite_id, mode)
+
+
+class RecordingClient:
+    """包装 HttpClient，把每次请求的响应录制到 Cassette"""
+
+    def __init__(self, client, cassette):
+        self.client = client
+        self.cassette = cassette
+        self.timeout = client.timeout
+
+    def request(self, method, url, **kwargs):
+        response = self.client.request(method, url, **kwargs)
+        self.cassette.record(method, url, kwargs, response)
+        return response
+
+
+class AsyncRecordingClient(RecordingClient):
+    """包装 AsyncHttpClient，把每次请求的响应录制到 Cassette"""
+
+    async def request(self, method, url, **kwargs):
+        response = await self.client.request(method, url, **kwargs)
+        self.cassette.record(method, url, kwargs, response)
+        return response
+
+
+class ReplayClient:
+    """按录制内容返回响应的客户端，不访问网络，也不受目标主机限流"""
+
+    def __init__(self, cassette, environment=None, case_timeout=None):
+        self.cassette = cassette
+        self.timeout = get_environment_timeout(environment, case_timeout)
+
+    def request(self, method, url, **kwargs):
+        return self.cassette.replay(method, url, kwargs)
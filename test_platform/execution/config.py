@@ -0,0 +1,105 @@
+"""
+测试套件执行配置
+
+执行配置按以下优先级合并（后者覆盖前者）：
+内置默认值 < settings.TEST_EXECUTION_DEFAULTS < 套件的 execution_config
+< 测试计划的 execution_config < 本次请求参数
+"""
+import json
+from django.conf import settings
+
+
+# 内置默认执行配置
+DEFAULT_EXECUTION_CONFIG = {
+    # 执行模式: serial 按顺序串行执行 / parallel 按变量依赖关系并行执行
+    'mode': 'serial',
+    # 并行模式下的最大工作线程数
+    'max_workers': 8,
+    # 并行执行和分片时按用例历史耗时调度：关键路径长的用例优先执行，分片按预计耗时均衡
+    'history_scheduling': True,
+    # 执行后端: threads 线程池 / asyncio 事件循环（需要安装httpx）
+    'backend': 'threads',
+    # 分片数：大于1时异步执行会把套件拆分到多个Celery worker上执行（共享变量的用例位于同一分片）
+    'shards': 1,
+    # asyncio后端的全局最大在途请求数
+    'max_in_flight': 100,
+    # asyncio后端对单个主机的最大并发请求数
+    'per_host_limit': 20,
+    # 用例默认请求超时（秒），为空时使用环境的time_out；用例数据中的timeout优先
+    'case_timeout': None,
+    # 套件执行时间预算（秒），为空或0表示不限制；分片执行时各分片共用从提交时刻起算的同一预算
+    'suite_timeout': None,
+    # 测试计划执行时间预算（秒），仅在计划执行时生效
+    'plan_timeout': None,
+    # 单个用例的最大尝试次数（包含第一次），1表示失败不重试；用例数据中的retry可覆盖以下重试配置
+    'retry_max_attempts': 1,
+    # 第一次重试前的等待秒数，之后按指数翻倍，不超过retry_backoff_max
+    'retry_backoff': 0.5,
+    'retry_backoff_max': 10,
+    # 是否对等待时间加随机抖动
+    'retry_jitter': True,
+    # 需要重试的HTTP状态码
+    'retry_status_codes': [502, 503, 504],
+    # 需要重试的请求错误类型: connection 连接失败或中断 / timeout 请求超时
+    'retry_on_errors': ['connection', 'timeout'],
+    # 一次套件执行内最多重试的总次数，防止环境不可用时反复请求
+    'retry_budget': 20,
+    # 有用例失败(FAIL/ERROR/TIMEOUT)后不再执行套件中剩余的用例，记为SKIP
+    'stop_on_failure': False,
+    # 请求引用的 ${变量} 在执行前仍未提取到时跳过该用例，记为SKIP
+    'skip_missing_variables': False,
+    # 测试计划中有套件未通过后不再执行剩余的套件，仅在计划执行时生效
+    'stop_plan_on_failure': False,
+    # 执行前预热：解析并缓存目标主机的DNS，在连接池中预先建立连接，预热耗时不计入用例耗时
+    'warmup': True,
+    # 每个目标主机预先建立的连接数，为空时串行执行为1、线程池并行执行为max_workers（不超过连接池大小）
+    'warmup_connections': None,
+    # 请求录制与回放: off 不使用 / record 录制本次执行的请求和响应 / replay 按录制内容返回响应，不访问网络
+    'cassette': 'off',
+    # 执行追踪级别: off 不记录 / summary 只记录用例摘要 / full 记录完整的请求、响应和变量上下文
+    'trace_level': 'summary',
+    # summary级别下随机记录完整信息的比例(0-1)
+    'trace_sample_rate': 0.0,
+    # 失败(FAIL/ERROR/TIMEOUT)的用例始终记录完整信息
+    'trace_full_on_failure': True,
+}
+
+
+def parse_execution_config(raw_config):
+    """
+    解析模型上以JSON文本保存的执行配置
+
+    参数:
+        raw_config: JSON字符串、字典或None
+
+    返回:
+        配置字典，解析失败时返回空字典
+    """
+    if not raw_config:
+        return {}
+    if isinstance(raw_config, dict):
+        return raw_config
+    try:
+        config = json.loads(raw_config)
+    except (TypeError, json.JSONDecodeError):
+        return {}
+    return config if isinstance(config, dict) else {}
+
+
+def resolve_execution_config(*sources):
+    """
+    合并多个来源的执行配置
+
+    参数:
+        sources: 按优先级从低到高排列的配置（字典或JSON字符串），None会被忽略
+
+    返回:
+        合并后的配置字典
+    """
+    config = dict(DEFAULT_EXECUTION_CONFIG)
+    config.update(getattr(settings, 'TEST_EXECUTION_DEFAULTS', {}) or {})
+    for source in sources:
+        for key, value in parse_execution_config(source).items():
+            if value is not None:
+                config[key] = value
+    return config
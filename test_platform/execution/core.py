@@ -0,0 +1,725 @@
+"""
+用例执行核心
+
+把“变量替换 → 发送请求 → 解析响应 → 提取变量 → 执行断言”封装为一次函数调用：
+输入用例描述(CaseSpec)和变量上下文，返回结构化的执行结果(CaseResult)。
+套件执行、单用例执行、接口调试和测试计划均直接调用这里，不再经过
+模拟请求对象和 JsonResponse 的序列化/反序列化。
+"""
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from urllib.parse import parse_qs
+
+import requests
+from django.utils import timezone
+
+from test_platform.execution.capture import truncate_for_storage
+from test_platform.execution.deadline import resolve_request_timeout
+from test_platform.execution.http_pool import HttpClient
+from test_platform.execution.jsonpath_cache import find_values
+from test_platform.execution.rate_limit import TrafficLimitTimeout
+from test_platform.execution.retry import next_retry_delay, retry_entry
+from test_platform.execution.template import render
+
+logger = logging.getLogger(__name__)
+
+
+# 需要发送请求体的HTTP方法
+BODY_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+def replace_variables(data, context, preserve_types=False):
+    """
+    递归替换数据中的${变量名}为上下文中的实际值（使用缓存的编译模板，见 template.render）
+
+    参数:
+        data: 要处理的数据(可以是字典、列表、字符串)
+        context: 变量上下文字典
+        preserve_types: 值恰好是一个${变量名}时是否保留变量的原始类型（数字、布尔、对象等）
+
+    返回:
+        替换变量后的数据
+    """
+    return render(data, context or {}, preserve_types)
+
+
+def handle_variable_extraction(response_data, extractors):
+    """
+    从响应中提取变量
+
+    参数:
+        response_data: 响应数据，可以是响应体或完整的响应信息对象
+        extractors: 提取器配置列表
+
+    返回:
+        提取的变量字典 {变量名: 变量值} 和错误信息
+    """
+    extracted_vars = {}
+    error_message = None
+
+    # 如果extractors不是合法的格式，直接返回空结果
+    if not extractors:
+        return extracted_vars, None
+
+    # 尝试解析extractors为JSON
+    if isinstance(extractors, str):
+        try:
+            extractors = json.loads(extractors)
+        except json.JSONDecodeError:
+            error_message = "提取器格式错误：不是有效的JSON格式"
+            return extracted_vars, error_message
+
+    if not isinstance(extractors, list):
+        error_message = "提取器格式错误：不是有效的列表格式"
+        return extracted_vars, error_message
+
+    # 确定响应体
+    if isinstance(response_data, dict) and 'body' in response_data:
+        # 如果传入的是完整的响应信息对象
+        response_body = response_data.get('body', {})
+    else:
+        # 如果直接传入的是响应体
+        response_body = response_data
+
+    # 如果响应体不是一个可提取的格式，直接返回错误
+    if not (isinstance(response_body, dict) or isinstance(response_body, list) or isinstance(response_body, str)):
+        error_message = "响应体格式不支持变量提取"
+        return extracted_vars, error_message
+
+    for extractor in extractors:
+        if not isinstance(extractor, dict):
+            continue
+
+        # 检查提取器是否启用
+        if not extractor.get('enabled', True):
+            continue
+
+        name = extractor.get('name')
+        expression = extractor.get('expression')
+        extractor_type = extractor.get('type', 'jsonpath')
+        default_value = extractor.get('defaultValue', '')
+
+        if name and expression:
+            # 根据提取器类型提取变量
+            if extractor_type == 'jsonpath':
+                try:
+                    if isinstance(response_body, dict) or isinstance(response_body, list):
+                        matches = find_values(expression, response_body)
+                        if matches:
+                            # 存储提取的变量
+                            extracted_vars[name] = matches[0]
+                        else:
+                            # 使用默认值
+                            extracted_vars[name] = default_value
+                    else:
+                        # 如果响应体不是JSON格式，使用默认值
+                        extracted_vars[name] = default_value
+                except Exception as e:
+                    error_msg = f"提取器'{name}'执行失败: {str(e)}"
+                    extracted_vars[name] = default_value
+                    if not error_message:
+                        error_message = error_msg
+
+            # 可以添加其他类型的提取器支持，如正则表达式等
+
+    return extracted_vars, error_message
+
+
+def parse_assertions(tests):
+    """
+    解析断言配置，支持JSON格式的断言列表和简单表达式
+
+    参数:
+        tests: 断言配置（JSON字符串、列表、字典或简单表达式）
+
+    返回:
+        断言字典列表
+    """
+    if isinstance(tests, list):
+        return tests
+    if isinstance(tests, dict):
+        return [tests]
+
+    try:
+        # 尝试解析JSON格式断言
+        test_assertions = json.loads(tests)
+        if not isinstance(test_assertions, list):
+            test_assertions = [test_assertions]
+        return test_assertions
+    except json.JSONDecodeError:
+        pass
+
+    # 如果不是JSON格式，尝试解析简单表达式
+    simple_assertion = tests.strip()
+    if simple_assertion.startswith("=="):
+        # 状态码等于断言
+        return [{
+            "type": "status_code",
+            "expect": simple_assertion[2:].strip(),
+            "actual": "status_code"
+        }]
+    if simple_assertion.startswith("contains"):
+        # 包含断言
+        return [{
+            "type": "contains",
+            "expect": simple_assertion[8:].strip(),
+            "actual": ""
+        }]
+    if "$." in simple_assertion:
+        # JSONPath断言
+        parts = simple_assertion.split("==")
+        if len(parts) == 2:
+            return [{
+                "type": "jsonpath",
+                "expect": parts[1].strip(),
+                "actual": parts[0].strip()
+            }]
+    return []
+
+
+def evaluate_assertions(tests, status_code, response_body, response_text):
+    """
+    执行断言
+
+    参数:
+        tests: 断言配置
+        status_code: HTTP状态码
+        response_body: 解析后的响应体
+        response_text: 响应原始文本
+
+    返回:
+        {'has_assertions', 'all_passed', 'results', 'error'}
+    """
+    is_http_success = 200 <= status_code < 300
+    outcome = {
+        'has_assertions': False,
+        'all_passed': True,
+        'results': [],
+        'error': None
+    }
+
+    if isinstance(tests, str):
+        if not tests.strip():
+            return outcome
+    elif not tests:
+        return outcome
+
+    assertion_results = outcome['results']
+    try:
+        outcome['has_assertions'] = True
+        test_assertions = parse_assertions(tests)
+
+        # 逐个执行断言
+        for assertion in test_assertions:
+            assertion_type = assertion.get('type', '')
+            expect = assertion.get('expect', '')
+            actual = assertion.get('actual', '')
+
+            # 不同类型的断言处理
+            if assertion_type == 'jsonpath':
+                # 使用jsonpath提取实际值
+                try:
+                    matches = find_values(actual, response_body)
+                    actual_value = matches[0] if matches else None
+
+                    # 比较预期值和实际值
+                    if actual_value is not None:
+                        # 尝试将字符串转换为相应类型进行比较
+                        try:
+                            if isinstance(actual_value, (int, float)):
+                                expect_value = float(expect)
+                            elif isinstance(actual_value, bool):
+                                expect_value = expect.lower() == 'true'
+                            else:
+                                expect_value = expect
+
+                            assertion_pass = actual_value == expect_value
+                        except:
+                            # 如果转换失败，直接比较字符串
+                            assertion_pass = str(actual_value) == expect
+                    else:
+                        assertion_pass = False
+
+                    assertion_results.append({
+                        'type': assertion_type,
+                        'expect': expect,
+                        'actual': actual,
+                        'actual_value': actual_value,
+                        'success': assertion_pass,
+                        'message': '断言通过' if assertion_pass else f'断言失败: 期望值 {expect}, 实际值 {actual_value}'
+                    })
+
+                    if not assertion_pass:
+                        outcome['all_passed'] = False
+                        outcome['error'] = f'JsonPath断言失败: {actual} 的值 {actual_value} 不等于期望值 {expect}'
+                except Exception as e:
+                    outcome['all_passed'] = False
+                    error_msg = f'JsonPath断言执行异常: {str(e)}'
+                    assertion_results.append({
+                        'type': assertion_type,
+                        'expect': expect,
+                        'actual': actual,
+                        'success': False,
+                        'message': error_msg
+                    })
+                    outcome['error'] = error_msg
+
+            elif assertion_type == 'status_code':
+                # 校验HTTP状态码
+                expected_status = int(expect)
+                assertion_pass = status_code == expected_status
+
+                assertion_results.append({
+                    'type': assertion_type,
+                    'expect': expected_status,
+                    'actual': status_code,
+                    'success': assertion_pass,
+                    'message': '断言通过' if assertion_pass else f'断言失败: 期望状态码 {expected_status}, 实际状态码 {status_code}'
+                })
+
+                if not assertion_pass:
+                    outcome['all_passed'] = False
+                    outcome['error'] = f'状态码断言失败: 期望 {expected_status}, 实际 {status_code}'
+
+            elif assertion_type == 'contains':
+                # 检查响应文本是否包含指定内容
+                assertion_pass = expect in response_text
+
+                assertion_results.append({
+                    'type': assertion_type,
+                    'expect': expect,
+                    'actual': '响应文本',
+                    'success': assertion_pass,
+                    'message': '断言通过' if assertion_pass else f'断言失败: 响应文本不包含 {expect}'
+                })
+
+                if not assertion_pass:
+                    outcome['all_passed'] = False
+                    outcome['error'] = f'包含断言失败: 响应文本不包含 {expect}'
+
+            elif assertion_type == 'regex':
+                # 正则表达式匹配
+                try:
+                    pattern = re.compile(expect)
+                    assertion_pass = bool(pattern.search(response_text))
+
+                    assertion_results.append({
+                        'type': assertion_type,
+                        'expect': expect,
+                        'actual': '响应文本',
+                        'success': assertion_pass,
+                        'message': '断言通过' if assertion_pass else f'断言失败: 响应文本不匹配正则表达式 {expect}'
+                    })
+
+                    if not assertion_pass:
+                        outcome['all_passed'] = False
+                        outcome['error'] = f'正则断言失败: 响应文本不匹配 {expect}'
+                except re.error as e:
+                    outcome['all_passed'] = False
+                    error_msg = f'正则表达式错误: {str(e)}'
+                    assertion_results.append({
+                        'type': assertion_type,
+                        'expect': expect,
+                        'actual': '响应文本',
+                        'success': False,
+                        'message': error_msg
+                    })
+                    outcome['error'] = error_msg
+
+        # 如果有断言定义但没有执行任何断言（结果为空），则使用HTTP状态码判断
+        if not assertion_results:
+            outcome['all_passed'] = is_http_success
+            if not is_http_success:
+                outcome['error'] = f'HTTP状态码: {status_code} 不在成功范围内'
+
+            # 添加一个默认的HTTP状态码断言结果
+            assertion_results.append({
+                'type': 'status_code',
+                'expect': '200-299',
+                'actual': status_code,
+                'success': is_http_success,
+                'message': '断言通过' if is_http_success else f'断言失败: HTTP状态码 {status_code} 不在成功范围内'
+            })
+
+    except Exception:
+        logger.exception("断言处理发生异常")
+        # 断言处理异常，不影响原有逻辑，仍然根据HTTP状态码判断
+        outcome['has_assertions'] = False
+
+    return outcome
+
+
+def describe_request_error(error):
+    """将请求异常转换为用户可读的错误信息"""
+    error_msg = f"请求发送失败: {str(error)}"
+    if "codec can't encode" in str(error):
+        error_msg = "请求中包含无法编码的特殊字符，请检查请求参数"
+    elif "Failed to establish a new connection" in str(error):
+        error_msg = "无法连接到服务器，请检查网络或服务是否可用"
+    elif isinstance(error, requests.ConnectTimeout):
+        error_msg = "连接超时，请检查网络或服务是否可用"
+    elif "Read timed out" in str(error):
+        error_msg = "请求超时，服务器响应时间过长"
+    return error_msg
+
+
+def _parse_timeout(value):
+    """解析用例上配置的超时秒数，无效或不大于0时返回None"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def _as_dict(value, key_field='key', value_field='value'):
+    """把 {key, value} 形式的列表或JSON字符串统一转换为字典"""
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        result = {}
+        for item in value:
+            if isinstance(item, dict) and item.get(key_field):
+                result[item[key_field]] = item.get(value_field)
+        return result
+    if isinstance(value, str) and value.strip():
+        try:
+            parsed = json.loads(value)
+            return _as_dict(parsed, key_field, value_field) if isinstance(parsed, (dict, list)) else {}
+        except json.JSONDecodeError:
+            return {}
+    return {}
+
+
+def _parse_params(params):
+    """解析请求参数，兼容字典、{key, value}列表、JSON字符串和URL查询字符串"""
+    if isinstance(params, str) and params.strip() and not params.strip().startswith(('{', '[')):
+        return {k: v[0] for k, v in parse_qs(params.strip()).items()}
+    return _as_dict(params)
+
+
+@dataclass
+class CaseSpec:
+    """单个用例的请求描述（变量替换前）"""
+    method: str
+    url: str
+    headers: dict = field(default_factory=dict)
+    params: Any = None
+    body: Any = None
+    # json 以JSON发送；none 不发送请求体；其他(form-data/raw等)以data发送
+    body_type: str = 'json'
+    extractors: Any = None
+    # 断言配置，为空时按HTTP状态码判断
+    tests: Any = None
+    case_id: Optional[int] = None
+    title: str = ''
+    # 用例级请求超时（秒），为空时使用环境的超时设置
+    timeout: Optional[float] = None
+    # 用例级重试配置，覆盖执行配置中的 retry_* 项，如 {"max_attempts": 3, "status_codes": [502]}
+    retry: Optional[dict] = None
+
+    @classmethod
+    def from_suite_case_data(cls, case_data, case_id=None):
+        """根据套件用例的 case_data 构建（与套件执行的既有请求规则保持一致）"""
+        method = (case_data.get('method') or '').upper()
+        body = case_data.get('body', {})
+        if isinstance(body, str):
+            try:
+                body = json.loads(body) if body else {}
+            except json.JSONDecodeError:
+                body = {}
+
+        return cls(
+            method=method,
+            url=case_data.get('api_path', ''),
+            headers=_as_dict(case_data.get('headers', {})),
+            params=_parse_params(case_data.get('params', {})),
+            body=body if method in BODY_METHODS else None,
+            body_type='form-data' if case_data.get('body_type') == 'form-data' else 'json',
+            extractors=case_data.get('extractors', []),
+            case_id=case_id,
+            title=case_data.get('title', ''),
+            timeout=_parse_timeout(case_data.get('timeout')),
+            retry=case_data.get('retry') if isinstance(case_data.get('retry'), dict) else None
+        )
+
+    @classmethod
+    def from_test_case(cls, test_case):
+        """根据 TestCase 模型构建（单用例执行）"""
+        method = test_case.case_request_method
+
+        # 安全解析 headers
+        try:
+            headers = json.loads(test_case.case_request_headers) if test_case.case_request_headers else {}
+        except json.JSONDecodeError:
+            headers = {}
+
+        # 安全解析 body
+        try:
+            body = json.loads(test_case.case_requests_body) if test_case.case_requests_body else None
+        except json.JSONDecodeError:
+            body = test_case.case_requests_body
+
+        # 安全解析 params
+        try:
+            params = json.loads(test_case.case_params) if test_case.case_params else None
+        except json.JSONDecodeError:
+            params = test_case.case_params
+
+        return cls(
+            method=method,
+            url=test_case.case_path,
+            headers=headers,
+            params=params if method == 'GET' else None,
+            body=body if method in ['POST', 'PUT', 'PATCH'] else None,
+            body_type='json',
+            extractors=test_case.case_extractors,
+            tests=test_case.case_tests,
+            case_id=test_case.test_case_id,
+            title=test_case.case_name
+        )
+
+
+@dataclass
+class CaseResult:
+    """单个用例的执行结果"""
+    status: str
+    request: dict
+    started_at: Any = None
+    duration: float = 0
+    status_code: int = 0
+    headers: dict = field(default_factory=dict)
+    content_type: str = ''
+    body: Any = None
+    raw_text: str = ''
+    extracted_variables: dict = field(default_factory=dict)
+    extraction_error: Optional[str] = None
+    assertions: dict = field(default_factory=lambda: {
+        'has_assertions': False, 'all_passed': True, 'results': [], 'error': None
+    })
+    # 请求未能完成时的错误信息（如连接失败、超时）
+    error: Optional[str] = None
+    error_details: Optional[str] = None
+    # 请求错误类型: connection 连接失败/中断 / timeout 请求超时 / deadline 超出时间预算
+    # / rate_limit 等待限流名额超时 / request 其他错误
+    error_kind: Optional[str] = None
+    # 尝试次数及每次失败尝试的记录（见 retry.retry_entry）
+    attempts: int = 1
+    retries: list = field(default_factory=list)
+    # 完整响应体的字节数和SHA-256摘要；body_truncated 表示响应体超出解析上限，只保留了前一部分
+    body_size: int = 0
+    body_sha256: Optional[str] = None
+    body_truncated: bool = False
+
+    @property
+    def success(self):
+        return self.status == 'PASS'
+
+    @property
+    def is_http_success(self):
+        return 200 <= self.status_code < 300
+
+    @property
+    def failure_message(self):
+        """失败原因：请求错误 > 断言错误 > HTTP状态码"""
+        if self.success:
+            return None
+        if self.error:
+            return self.error
+        if self.assertions.get('has_assertions') and not self.assertions.get('all_passed'):
+            return self.assertions.get('error')
+        return f'HTTP状态码: {self.status_code}'
+
+    def stored_body(self):
+        """写入结果数据的响应体，超出存储上限时截断为带标记的文本"""
+        return truncate_for_storage(self.body)[0]
+
+    def stored_raw_text(self):
+        """写入结果数据的原始响应文本，超出存储上限时截断"""
+        return truncate_for_storage(self.raw_text)[0]
+
+    def response_dict(self):
+        """响应信息字典（与历史结果数据中 response 字段的格式一致，附加响应体大小、摘要和截断标记）"""
+        body, body_truncated = truncate_for_storage(self.body)
+        return {
+            'status_code': self.status_code,
+            'headers': self.headers,
+            'body': body,
+            'content_type': self.content_type,
+            'body_size': self.body_size,
+            'body_sha256': self.body_sha256,
+            'truncated': body_truncated or self.body_truncated
+        }
+
+
+def render_request(spec, context):
+    """
+    对请求的各部分进行变量替换，返回最终发送的请求信息
+
+    URL和请求头始终替换为字符串；查询参数和请求体中恰好是一个${变量名}的值保留变量的原始类型
+    """
+    context = context or {}
+    return {
+        'url': replace_variables(spec.url, context),
+        'method': spec.method,
+        'headers': replace_variables(spec.headers or {}, context),
+        'params': replace_variables(spec.params, context, preserve_types=True),
+        'body': replace_variables(spec.body, context, preserve_types=True)
+    }
+
+
+def parse_response_body(response):
+    """解析响应体：JSON响应解析为对象，其他内容包装为 {'content': 文本}"""
+    content_type = response.headers.get('Content-Type', '')
+    try:
+        if 'application/json' in content_type:
+            return response.json()
+    except ValueError:
+        pass
+    return {'content': response.text}
+
+
+def build_request_kwargs(spec, request_info):
+    """根据用例描述和渲染后的请求生成发送参数（不含method和url）"""
+    request_kwargs = {
+        'headers': request_info['headers'],
+    }
+    if request_info['params']:
+        request_kwargs['params'] = request_info['params']
+    if request_info['body'] is not None and spec.body_type != 'none':
+        if spec.body_type == 'json':
+            request_kwargs['json'] = request_info['body']
+        else:
+            request_kwargs['data'] = request_info['body']
+    return request_kwargs
+
+
+def build_case_result(spec, request_info, started_at, duration, response):
+    """
+    根据收到的响应生成执行结果（解析响应体、提取变量、执行断言）
+
+    response 只需提供 status_code / headers / text / json()，HttpClient 和 AsyncHttpClient
+    返回的 CapturedResponse 以及 requests / httpx 的响应对象均可直接使用。
+    响应体超出解析上限时不解析JSON，提取和断言针对已读取的文本进行。
+    """
+    response.encoding = 'utf-8'
+    body = parse_response_body(response)
+    raw_text = response.text
+
+    extracted_variables, extraction_error = {}, None
+    if spec.extractors:
+        extracted_variables, extraction_error = handle_variable_extraction(body, spec.extractors)
+
+    assertions = evaluate_assertions(spec.tests, response.status_code, body, raw_text)
+    if assertions['has_assertions']:
+        status = 'PASS' if assertions['all_passed'] else 'FAIL'
+    else:
+        status = 'PASS' if 200 <= response.status_code < 300 else 'FAIL'
+
+    return CaseResult(
+        status=status,
+        request=request_info,
+        started_at=started_at,
+        duration=duration,
+        status_code=response.status_code,
+        headers=dict(response.headers),
+        content_type=response.headers.get('Content-Type', ''),
+        body=body,
+        raw_text=raw_text,
+        extracted_variables=extracted_variables,
+        extraction_error=extraction_error,
+        assertions=assertions,
+        body_size=getattr(response, 'size', len(response.content or b'')),
+        body_sha256=getattr(response, 'sha256', None),
+        body_truncated=getattr(response, 'truncated', False)
+    )
+
+
+def timeout_result(request_info, started_at=None, duration=0, error=None, error_details=None, error_kind=None):
+    """构建超时（请求超时、等待限流名额超时或超出时间预算）的执行结果"""
+    return CaseResult(
+        status='TIMEOUT',
+        request=request_info,
+        started_at=started_at or timezone.localtime(timezone.now()),
+        duration=duration,
+        error=error or '超出执行时间预算，用例已取消',
+        error_details=error_details,
+        error_kind=error_kind or ('timeout' if error else 'deadline')
+    )
+
+
+def _request_error_kind(error):
+    if isinstance(error, (requests.ConnectionError, requests.exceptions.ChunkedEncodingError)):
+        return 'connection'
+    return 'request'
+
+
+def send_case_request(spec, request_info, request_kwargs, client, deadline=None):
+    """发送一次请求并生成执行结果（不重试）"""
+    if deadline is not None and deadline.expired():
+        return timeout_result(request_info)
+    request_kwargs['timeout'] = resolve_request_timeout(client.timeout, spec.timeout, deadline)
+
+    started_at = timezone.localtime(timezone.now())
+    start = time.perf_counter()
+    try:
+        response = client.request(spec.method, request_info['url'], **request_kwargs)
+    except TrafficLimitTimeout as e:
+        return timeout_result(
+            request_info, started_at, time.perf_counter() - start, error=str(e), error_kind='rate_limit'
+        )
+    except requests.Timeout as e:
+        return timeout_result(
+            request_info, started_at, time.perf_counter() - start,
+            error=describe_request_error(e), error_details=str(e)
+        )
+    except requests.RequestException as e:
+        return CaseResult(
+            status='ERROR',
+            request=request_info,
+            started_at=started_at,
+            duration=time.perf_counter() - start,
+            error=describe_request_error(e),
+            error_details=str(e),
+            error_kind=_request_error_kind(e)
+        )
+    duration = time.perf_counter() - start
+    return build_case_result(spec, request_info, started_at, duration, response)
+
+
+def execute_case(spec, context=None, client=None, deadline=None, retry_policy=None, retry_budget=None):
+    """
+    执行单个用例
+
+    参数:
+        spec: CaseSpec 用例描述
+        context: 变量上下文字典，用于替换 ${变量名}；本函数不会修改它
+        client: HttpClient，复用对应环境的连接池和超时设置；未指定时使用默认会话
+        deadline: Deadline，请求超时不超过剩余预算；预算已用尽时不发送请求，直接返回 TIMEOUT
+        retry_policy: RetryPolicy，瞬时故障时按策略重试；为空时不重试
+        retry_budget: RetryBudget，同一次执行内共享的重试预算
+
+    返回:
+        CaseResult 执行结果（最后一次尝试），提取到的变量在 extracted_variables 中，由调用方决定如何合并到上下文
+    """
+    request_info = render_request(spec, context)
+    if client is None:
+        client = HttpClient()
+    request_kwargs = build_request_kwargs(spec, request_info)
+
+    attempt, retries = 1, []
+    while True:
+        result = send_case_request(spec, request_info, request_kwargs, client, deadline)
+        delay = next_retry_delay(retry_policy, retry_budget, result, attempt, deadline)
+        if delay is None:
+            break
+        retries.append(retry_entry(attempt, result, delay))
+        time.sleep(delay)
+        attempt += 1
+    result.attempts = attempt
+    result.retries = retries
+    return result
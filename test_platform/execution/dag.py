@@ -0,0 +1,308 @@
+"""
+基于变量依赖关系的用例调度
+
+套件中的用例通过提取器(extractors)产出变量，并在请求的 api_path/headers/params/body
+中以 ${变量名} 的形式引用变量。这里根据这些产出和引用推断用例之间的依赖关系，
+构建有向无环图，再由有界线程池并发执行互不依赖的用例。
+"""
+import heapq
+import json
+import queue
+import threading
+
+from django.db import connections
+
+from test_platform.execution.template import template_variables
+
+
+# 会进行变量替换的请求字段
+TEMPLATE_FIELDS = ('api_path', 'headers', 'params', 'body')
+
+
+def collect_variable_refs(data, refs=None):
+    """
+    递归收集数据中以 ${变量名} 形式引用的变量名（与 replace_variables 的替换范围一致）
+
+    参数:
+        data: 要扫描的数据(字典、列表、字符串)
+        refs: 用于累积结果的集合
+
+    返回:
+        变量名集合
+    """
+    return template_variables(data, refs)
+
+
+def collect_extractor_outputs(extractors):
+    """
+    获取提取器会产出的变量名（与 handle_variable_extraction 的启用规则一致）
+
+    参数:
+        extractors: 提取器配置列表或其JSON字符串
+
+    返回:
+        变量名集合
+    """
+    if isinstance(extractors, str):
+        try:
+            extractors = json.loads(extractors) if extractors else []
+        except json.JSONDecodeError:
+            return set()
+    if not isinstance(extractors, list):
+        return set()
+
+    outputs = set()
+    for extractor in extractors:
+        if not isinstance(extractor, dict) or not extractor.get('enabled', True):
+            continue
+        if extractor.get('name') and extractor.get('expression'):
+            outputs.add(extractor['name'])
+    return outputs
+
+
+def build_dependency_graph(case_datas):
+    """
+    根据变量的产出和引用推断用例依赖关系
+
+    对同一个变量，依赖规则与串行执行的语义保持一致：
+    - 引用变量的用例依赖于在它之前最近一次产出该变量的用例
+    - 产出变量的用例依赖于之前产出同名变量的用例，以及在此期间引用过该变量的用例，
+      避免后面的用例提前覆盖前面用例要读取的值
+
+    参数:
+        case_datas: 按执行顺序排列的用例数据字典列表
+
+    返回:
+        与 case_datas 等长的列表，每项为该用例所依赖的前序用例下标集合
+    """
+    last_producer = {}
+    readers_since_producer = {}
+    dependencies = []
+
+    for index, case_data in enumerate(case_datas):
+        case_data = case_data if isinstance(case_data, dict) else {}
+        consumes = set()
+        for field in TEMPLATE_FIELDS:
+            collect_variable_refs(case_data.get(field), consumes)
+        produces = collect_extractor_outputs(case_data.get('extractors', []))
+
+        case_deps = set()
+        for var_name in consumes:
+            if var_name in last_producer:
+                case_deps.add(last_producer[var_name])
+        for var_name in produces:
+            if var_name in last_producer:
+                case_deps.add(last_producer[var_name])
+            case_deps.update(readers_since_producer.get(var_name, ()))
+        case_deps.discard(index)
+        dependencies.append(case_deps)
+
+        for var_name in consumes:
+            readers_since_producer.setdefault(var_name, []).append(index)
+        for var_name in produces:
+            last_producer[var_name] = index
+            readers_since_producer[var_name] = []
+
+    return dependencies
+
+
+def with_variable_producers(case_datas, targets):
+    """
+    补全目标用例（直接或间接）引用的变量的产出用例，用于只重跑部分用例
+
+    参数:
+        case_datas: 按执行顺序排列的用例数据字典列表
+        targets: 目标用例下标集合
+
+    返回:
+        目标用例及其依赖的产出用例下标，按原始顺序排列
+    """
+    last_producer = {}
+    producers = []
+    for case_data in case_datas:
+        case_data = case_data if isinstance(case_data, dict) else {}
+        consumes = set()
+        for field in TEMPLATE_FIELDS:
+            collect_variable_refs(case_data.get(field), consumes)
+        producers.append({last_producer[var_name] for var_name in consumes if var_name in last_producer})
+        for var_name in collect_extractor_outputs(case_data.get('extractors', [])):
+            last_producer[var_name] = len(producers) - 1
+
+    required = set()
+    pending = [index for index in targets if 0 <= index < len(case_datas)]
+    while pending:
+        index = pending.pop()
+        if index in required:
+            continue
+        required.add(index)
+        pending.extend(producers[index])
+    return sorted(required)
+
+
+def group_dependent_cases(dependencies):
+    """
+    将存在依赖关系（直接或间接共享变量）的用例归为一组
+
+    参数:
+        dependencies: build_dependency_graph 的返回值
+
+    返回:
+        用例下标分组列表，组内及各组之间均按原始顺序排列
+    """
+    parent = list(range(len(dependencies)))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for index, deps in enumerate(dependencies):
+        for dep in deps:
+            root, dep_root = find(index), find(dep)
+            if root != dep_root:
+                parent[max(root, dep_root)] = min(root, dep_root)
+
+    groups = {}
+    for index in range(len(dependencies)):
+        groups.setdefault(find(index), []).append(index)
+    return [groups[root] for root in sorted(groups)]
+
+
+def split_into_shards(dependencies, shard_count, durations=None):
+    """
+    把用例划分为最多 shard_count 个分片，共享变量的用例始终位于同一分片
+
+    按组的预计耗时（未提供 durations 时按用例数）从大到小依次放入当前负载最小的分片，使各分片尽量均衡。
+
+    参数:
+        durations: 与 dependencies 等长的各用例预计耗时（秒）
+
+    返回:
+        非空分片列表，每个分片为按原始顺序排列的用例下标列表
+    """
+    shard_count = max(1, int(shard_count or 1))
+
+    def weight(group):
+        return sum(durations[index] for index in group) if durations else len(group)
+
+    groups = sorted(group_dependent_cases(dependencies), key=weight, reverse=True)
+    shards = [[] for _ in range(min(shard_count, len(groups)))]
+    loads = [0] * len(shards)
+    for group in groups:
+        position = loads.index(min(loads))
+        shards[position].extend(group)
+        loads[position] += weight(group)
+    return [sorted(shard) for shard in shards if shard]
+
+
+def critical_path_priorities(dependencies, durations):
+    """
+    计算用例的调度优先级：自身预计耗时加上依赖它的用例链中最长的预计耗时（即从该用例到结束的关键路径长度）
+
+    依赖总是指向前序用例，倒序遍历一次即可。优先分发关键路径长的用例，
+    避免耗时长的用例最后才开始而拖长整体执行时间。
+
+    参数:
+        dependencies: build_dependency_graph 的返回值
+        durations: 与 dependencies 等长的各用例预计耗时（秒）
+
+    返回:
+        与 dependencies 等长的优先级列表
+    """
+    total = len(dependencies)
+    downstream = [0.0] * total
+    priorities = [0.0] * total
+    for index in range(total - 1, -1, -1):
+        priorities[index] = durations[index] + downstream[index]
+        for dep in dependencies[index]:
+            downstream[dep] = max(downstream[dep], priorities[index])
+    return priorities
+
+
+class DependencyScheduler:
+    """
+    按依赖关系调度任务的有界线程池
+
+    调度线程负责分发就绪任务并按完成顺序回调 on_complete，
+    工作线程只负责执行任务，因此回调中可以安全地修改共享的变量上下文。
+    同时就绪的任务按优先级从高到低分发（未提供优先级时按原始顺序）。
+    """
+
+    def __init__(self, dependencies, max_workers=8, priorities=None):
+        self.dependencies = [set(deps) for deps in dependencies]
+        self.max_workers = max(1, int(max_workers or 1))
+        self.priorities = priorities
+
+    def run(self, make_task, on_complete):
+        """
+        执行全部任务
+
+        参数:
+            make_task: make_task(index) -> 无参可调用对象，在调度线程中调用，
+                       可用于在分发时刻固定变量上下文快照
+            on_complete: on_complete(index, result, error)，在调度线程中按完成顺序调用
+        """
+        total = len(self.dependencies)
+        if total == 0:
+            return
+
+        remaining = [len(deps) for deps in self.dependencies]
+        dependents = [[] for _ in range(total)]
+        for index, deps in enumerate(self.dependencies):
+            for dep in deps:
+                dependents[dep].append(index)
+
+        task_queue = queue.Queue()
+        done_queue = queue.Queue()
+        workers = [
+            threading.Thread(target=self._worker, args=(task_queue, done_queue), daemon=True)
+            for _ in range(min(self.max_workers, total))
+        ]
+        for worker in workers:
+            worker.start()
+
+        priorities = self.priorities or [0] * total
+        # 就绪任务堆：(-优先级, 下标)，优先级相同时按原始顺序
+        ready = [(-priorities[index], index) for index in range(total) if remaining[index] == 0]
+        heapq.heapify(ready)
+        in_flight = 0
+
+        try:
+            finished = 0
+            while finished < total:
+                # 在途任务数不超过工作线程数，其余就绪任务留在堆中，后续就绪的高优先级任务可以先分发
+                while ready and in_flight < len(workers):
+                    _, index = heapq.heappop(ready)
+                    task_queue.put((index, make_task(index)))
+                    in_flight += 1
+
+                index, result, error = done_queue.get()
+                in_flight -= 1
+                finished += 1
+                on_complete(index, result, error)
+                for dependent in dependents[index]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        heapq.heappush(ready, (-priorities[dependent], dependent))
+        finally:
+            for _ in workers:
+                task_queue.put(None)
+            for worker in workers:
+                worker.join()
+
+    @staticmethod
+    def _worker(task_queue, done_queue):
+        try:
+            while True:
+                item = task_queue.get()
+                if item is None:
+                    break
+                index, task = item
+                try:
+                    done_queue.put((index, task(), None))
+                except Exception as e:
+                    done_queue.put((index, None, e))
+        finally:
+            # 每个工作线程持有独立的数据库连接，退出前关闭
+            connections.close_all()
@@ -0,0 +1,63 @@
+"""
+执行时间预算
+
+套件和测试计划可以配置总的执行时间预算（suite_timeout / plan_timeout，单位秒）。
+预算用尽后剩余用例不再发送请求，直接记为 TIMEOUT；正在执行的请求超时时间也会被压缩到剩余预算内，
+保证工作进程在预算结束后很快被释放。
+"""
+import time
+
+
+# 剩余预算不足该值（秒）时视为已用尽，避免发出注定超时的请求
+MIN_REQUEST_BUDGET = 0.05
+
+
+class Deadline:
+    """
+    执行截止时间
+
+    参数:
+        seconds: 预算秒数，None或不大于0表示不限制
+        parent: 上层截止时间（如计划的截止时间），取两者中较早的一个
+        elapsed: 预算开始后已经过去的秒数（如分片任务在队列中等待的时间）
+    """
+
+    def __init__(self, seconds=None, parent=None, elapsed=0):
+        self.parent = parent
+        self.seconds = float(seconds) if seconds and float(seconds) > 0 else None
+        self.expires_at = time.monotonic() + self.seconds - max(0.0, elapsed) if self.seconds else None
+
+    def remaining(self):
+        """剩余秒数，不限制时返回None"""
+        candidates = []
+        if self.expires_at is not None:
+            candidates.append(self.expires_at - time.monotonic())
+        if self.parent is not None:
+            parent_remaining = self.parent.remaining()
+            if parent_remaining is not None:
+                candidates.append(parent_remaining)
+        return max(0.0, min(candidates)) if candidates else None
+
+    def expired(self):
+        remaining = self.remaining()
+        return remaining is not None and remaining < MIN_REQUEST_BUDGET
+
+
+def resolve_request_timeout(default_timeout, case_timeout=None, deadline=None):
+    """
+    计算单个请求的 (连接超时, 读取超时)
+
+    参数:
+        default_timeout: 环境默认超时 (连接超时, 读取超时)
+        case_timeout: 用例上配置的超时秒数，覆盖环境的读取超时
+        deadline: Deadline，超时不超过剩余预算
+    """
+    connect_timeout, read_timeout = default_timeout
+    if case_timeout:
+        read_timeout = float(case_timeout)
+        connect_timeout = min(connect_timeout, read_timeout)
+    remaining = deadline.remaining() if deadline is not None else None
+    if remaining is not None:
+        connect_timeout = min(connect_timeout, remaining)
+        read_timeout = min(read_timeout, remaining)
+    return connect_timeout, read_timeout
@@ -0,0 +1,183 @@
+"""
+用例历史耗时与执行时间预估
+
+并行调度和分片时使用用例最近的实际耗时：优先取套件执行中的用例结果(TestSuiteCaseResult，
+即 TestSuiteResult.result_data 中的用例结果)，没有记录时取单用例执行结果(TestResult)，
+都没有时按已知用例耗时的中位数估计。
+根据预计耗时计算关键路径，同时就绪的用例中关键路径最长的先执行，缩短并行执行的总耗时。
+"""
+import heapq
+import logging
+from datetime import timedelta
+from statistics import median
+
+from django.db import DatabaseError
+from django.db.models import Avg
+from django.utils import timezone
+
+from test_platform.models import TestResult, TestSuiteCaseResult
+from test_platform.execution.dag import critical_path_priorities, split_into_shards
+
+logger = logging.getLogger(__name__)
+
+
+# 统计最近多少天的执行记录
+HISTORY_DAYS = 30
+
+# 没有任何历史记录时的用例预计耗时（秒）
+DEFAULT_CASE_DURATION = 1.0
+
+
+def load_case_durations(case_ids):
+    """
+    查询用例最近的平均耗时
+
+    返回:
+        {原始用例ID: 平均耗时(秒)}，没有历史记录的用例不在结果中
+    """
+    since = timezone.now() - timedelta(days=HISTORY_DAYS)
+    # 跳过的用例和未发出请求的错误用例耗时为0，不参与统计
+    durations = dict(
+        TestSuiteCaseResult.objects.filter(case_id__in=case_ids, execution_time__gte=since, duration__gt=0)
+        .exclude(status='SKIP').order_by().values('case_id').annotate(avg=Avg('duration'))
+        .values_list('case_id', 'avg')
+    )
+    missing = set(case_ids) - durations.keys()
+    if missing:
+        durations.update(
+            TestResult.objects.filter(case_id__in=missing, execution_time__gte=since, duration__gt=0)
+            .exclude(status='SKIP').order_by().values('case_id').annotate(avg=Avg('duration'))
+            .values_list('case_id', 'avg')
+        )
+    return {case_id: float(avg) for case_id, avg in durations.items() if avg is not None}
+
+
+def estimate_case_durations(suite_cases):
+    """
+    按执行顺序返回各用例的预计耗时
+
+    返回:
+        (预计耗时列表, 有历史记录的用例数)
+    """
+    history = load_case_durations({suite_case.original_case_id for suite_case in suite_cases})
+    fallback = median(history.values()) if history else DEFAULT_CASE_DURATION
+    durations = [history.get(suite_case.original_case_id, fallback) for suite_case in suite_cases]
+    return durations, sum(1 for suite_case in suite_cases if suite_case.original_case_id in history)
+
+
+def history_durations(suite_cases, execution_config):
+    """开启 history_scheduling 时返回各用例的预计耗时，否则或查询失败时返回None"""
+    if not execution_config.get('history_scheduling'):
+        return None
+    try:
+        return estimate_case_durations(suite_cases)[0]
+    except DatabaseError as e:
+        logger.warning("查询用例历史耗时失败，按原始顺序调度: %s", e)
+        return None
+
+
+def schedule_priorities(suite_cases, dependencies, execution_config):
+    """并行执行时的调度优先级（关键路径长度），未开启 history_scheduling 时返回None"""
+    durations = history_durations(suite_cases, execution_config)
+    if durations is None:
+        return None
+    return critical_path_priorities(dependencies, durations)
+
+
+def simulate_schedule(dependencies, durations, workers, priorities=None):
+    """
+    按 DependencyScheduler 的分发规则模拟执行，返回预计总耗时（秒）
+
+    参数:
+        workers: 最大并发数
+        priorities: 调度优先级，为空时按原始顺序分发
+    """
+    total = len(dependencies)
+    priorities = priorities or [0] * total
+    remaining = [len(deps) for deps in dependencies]
+    dependents = [[] for _ in range(total)]
+    for index, deps in enumerate(dependencies):
+        for dep in deps:
+            dependents[dep].append(index)
+
+    ready = [(-priorities[index], index) for index in range(total) if remaining[index] == 0]
+    heapq.heapify(ready)
+    running = []
+    now = 0.0
+    finished = 0
+    while finished < total:
+        while ready and len(running) < workers:
+            _, index = heapq.heappop(ready)
+            heapq.heappush(running, (now + durations[index], index))
+        now, index = heapq.heappop(running)
+        finished += 1
+        for dependent in dependents[index]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                heapq.heappush(ready, (-priorities[dependent], dependent))
+    return now
+
+
+def predict_suite_duration(plan, execution_config):
+    """
+    执行前预估套件的执行时间
+
+    参数:
+        plan: 套件的执行计划 SuitePlan
+        execution_config: 合并后的执行配置
+
+    返回:
+        预估结果字典：predicted_duration 为按当前执行配置（模式、并发数、分片数）预计的总耗时，
+        serial_duration 为串行执行的预计耗时，critical_path 为变量依赖链上最长的预计耗时
+    """
+    from test_platform.execution.sharding import get_shard_count
+
+    suite_cases = plan.cases
+    durations, history_cases = estimate_case_durations(suite_cases)
+    parallel = execution_config.get('mode') == 'parallel'
+    if not parallel:
+        workers = 1
+    elif execution_config.get('backend') == 'asyncio':
+        workers = min(int(execution_config.get('max_in_flight') or 1), int(execution_config.get('per_host_limit') or 1))
+    else:
+        workers = int(execution_config.get('max_workers') or 1)
+    workers = max(1, workers)
+    use_history = bool(execution_config.get('history_scheduling'))
+
+    shard_count = get_shard_count(execution_config)
+    shards = split_into_shards(plan.dependencies, shard_count, durations if use_history else None) \
+        if shard_count > 1 else [list(range(len(suite_cases)))]
+
+    predicted = 0.0
+    for shard in shards:
+        positions = {index: position for position, index in enumerate(shard)}
+        if parallel:
+            dependencies = [{positions[dep] for dep in plan.dependencies[index] if dep in positions} for index in shard]
+        else:
+            dependencies = [{position - 1} if position > 0 else set() for position in range(len(shard))]
+        shard_durations = [durations[index] for index in shard]
+        priorities = critical_path_priorities(dependencies, shard_durations) if use_history and parallel else None
+        predicted = max(predicted, simulate_schedule(dependencies, shard_durations, workers, priorities))
+
+    critical_path = max(critical_path_priorities(plan.dependencies, durations), default=0.0)
+    return {
+        'suite_id': plan.suite_id,
+        'mode': execution_config.get('mode'),
+        'backend': execution_config.get('backend'),
+        'workers': workers,
+        'shards': len(shards),
+        'total_cases': len(suite_cases),
+        'history_cases': history_cases,
+        'predicted_duration': round(predicted, 2),
+        'serial_duration': round(sum(durations), 2),
+        'critical_path': round(critical_path, 2),
+        'cases': [
+            {
+                'index': index + 1,
+                'case_id': suite_case.original_case_id,
+                'title': suite_case.case_data.get('title', '') if isinstance(suite_case.case_data, dict) else '',
+                'estimated_duration': round(durations[index], 3)
+            }
+            for index, suite_case in enumerate(suite_cases)
+        ]
+    }
@@ -0,0 +1,186 @@
+"""
+测试流量的HTTP会话池
+
+按执行环境(TestEnvironment)维护长连接的 requests.Session，
+同一环境下套件内的用例、计划内的多个套件复用同一个连接池，避免每个用例重新建立TCP/TLS连接。
+连接池大小、是否保持长连接及默认超时由 settings.TEST_HTTP_POOL 配置，
+环境上配置的 time_out 会覆盖默认的读取超时。
+用例中的相对路径按执行环境的基础地址补全，同一套件可以在不同环境上执行。
+"""
+import threading
+from http import cookiejar
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from test_platform.execution.capture import ResponseCapture, get_capture_config
+from test_platform.execution.rate_limit import TrafficLimiter
+
+
+# 内置默认连接池配置
+DEFAULT_POOL_CONFIG = {
+    # 每个会话缓存的主机连接池数量
+    'pool_connections': 10,
+    # 每个主机连接池的最大连接数，应不小于并行执行的工作线程数
+    'pool_maxsize': 32,
+    # 是否保持长连接
+    'keep_alive': True,
+    # 默认连接超时和读取超时（秒）
+    'connect_timeout': 10,
+    'read_timeout': 60,
+    # 执行前预热过的主机名的DNS缓存时间（秒）
+    'dns_cache_ttl': 300,
+}
+
+
+class _RejectAllCookiePolicy(cookiejar.DefaultCookiePolicy):
+    """不保存也不发送任何Cookie，保证复用会话时用例之间不会互相携带Cookie"""
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+def create_cookie_jar():
+    """创建不保存Cookie的CookieJar，供异步客户端使用"""
+    return cookiejar.CookieJar(policy=_RejectAllCookiePolicy())
+
+
+def get_pool_config():
+    """获取合并后的连接池配置"""
+    config = dict(DEFAULT_POOL_CONFIG)
+    config.update(getattr(settings, 'TEST_HTTP_POOL', {}) or {})
+    return config
+
+
+def get_environment_timeout(environment=None, case_timeout=None):
+    """
+    获取请求超时 (连接超时, 读取超时)
+
+    环境的 time_out 单位为秒；数值不小于1000时按毫秒处理（兼容以毫秒填写的配置），
+    为0或未配置时使用默认超时。case_timeout（执行配置中的用例默认超时，秒）优先于环境配置。
+    """
+    config = get_pool_config()
+    connect_timeout = config['connect_timeout']
+    read_timeout = config['read_timeout']
+
+    time_out = getattr(environment, 'time_out', None) or 0
+    if time_out > 0:
+        read_timeout = time_out / 1000 if time_out >= 1000 else time_out
+        connect_timeout = min(connect_timeout, read_timeout)
+    if case_timeout and float(case_timeout) > 0:
+        read_timeout = float(case_timeout)
+        connect_timeout = min(connect_timeout, read_timeout)
+    return connect_timeout, read_timeout
+
+
+def environment_base_url(environment):
+    """执行环境的基础地址：优先取 base_url，其次按 protocol://host:port 组装，未配置时返回None"""
+    if environment is None:
+        return None
+    base_url = (getattr(environment, 'base_url', '') or '').strip()
+    if base_url.startswith(('http://', 'https://')):
+        return base_url
+    host = (getattr(environment, 'host', '') or '').strip()
+    if not host:
+        return None
+    if host.startswith(('http://', 'https://')):
+        return host
+    protocol = (getattr(environment, 'protocol', '') or 'http').split('://')[0].lower()
+    port = getattr(environment, 'port', None)
+    return f"{protocol}://{host}:{port}" if port else f"{protocol}://{host}"
+
+
+def resolve_url(environment, url):
+    """相对路径按环境的基础地址补全，绝对URL或环境未配置地址时原样返回"""
+    if not isinstance(url, str) or url.startswith(('http://', 'https://')):
+        return url
+    base_url = environment_base_url(environment)
+    if not base_url:
+        return url
+    return f"{base_url.rstrip('/')}/{url.lstrip('/')}"
+
+
+class SessionPool:
+    """按环境划分的会话池，进程内共享，线程安全"""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(environment):
+        return getattr(environment, 'environment_id', None) or 'default'
+
+    @staticmethod
+    def _create_session():
+        config = get_pool_config()
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=config['pool_connections'],
+            pool_maxsize=config['pool_maxsize'],
+            max_retries=0
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.cookies.set_policy(_RejectAllCookiePolicy())
+        if not config['keep_alive']:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def get_session(self, environment=None):
+        """获取环境对应的会话，不存在时创建"""
+        key = self._key(environment)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = self._create_session()
+                    self._sessions[key] = session
+        return session
+
+    def close(self, environment=None):
+        """关闭并移除指定环境的会话"""
+        with self._lock:
+            session = self._sessions.pop(self._key(environment), None)
+        if session is not None:
+            session.close()
+
+    def close_all(self):
+        """关闭全部会话"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+# 进程级共享的会话池
+session_pool = SessionPool()
+
+
+class HttpClient:
+    """绑定了会话和超时设置的HTTP客户端，供执行核心发送请求"""
+
+    def __init__(self, environment=None, case_timeout=None):
+        self.environment = environment
+        self.session = session_pool.get_session(environment)
+        self.timeout = get_environment_timeout(environment, case_timeout)
+        self.limiter = TrafficLimiter(environment)
+
+    def request(self, method, url, **kwargs):
+        """发送请求并以流式读取响应体，返回 capture.CapturedResponse"""
+        kwargs.setdefault('timeout', self.timeout)
+        url = resolve_url(self.environment, url)
+        chunk_size = get_capture_config()['chunk_size']
+        capture = ResponseCapture()
+        # 受目标主机的并发数和请求速率限制
+        with self.limiter.slot(url):
+            with self.session.request(method, url, stream=True, **kwargs) as response:
+                for chunk in response.iter_content(chunk_size):
+                    capture.feed(chunk)
+                return capture.finish(response.status_code, response.headers)
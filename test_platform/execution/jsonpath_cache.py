@@ -0,0 +1,44 @@
+"""
+JSONPath 表达式的编译缓存
+
+变量提取器和断言中的 JSONPath 表达式每次执行都要重新解析语法，而同一套件、同一计划反复执行时
+表达式几乎不变。compile_jsonpath 按表达式文本在进程内缓存解析结果（LRU，最多 JSONPATH_CACHE_SIZE 条），
+所有使用 JSONPath 的地方共用同一份缓存；解析失败的表达式不缓存，异常照常抛出。
+编译结果只读，可在多个线程中同时使用。
+
+cache_stats 返回缓存的命中/未命中次数，随套件执行的 suite_completed 追踪事件记录。
+"""
+from functools import lru_cache
+
+
+# 缓存的编译表达式数量
+JSONPATH_CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=JSONPATH_CACHE_SIZE)
+def compile_jsonpath(expression):
+    """解析 JSONPath 表达式（带缓存），语法错误时抛出 jsonpath_ng 的解析异常"""
+    import jsonpath_ng.ext as jsonpath
+    return jsonpath.parse(expression)
+
+
+def find_values(expression, data):
+    """返回表达式在数据中匹配到的全部值"""
+    return [match.value for match in compile_jsonpath(expression).find(data)]
+
+
+def cache_stats():
+    """缓存统计 {'hits', 'misses', 'size', 'max_size', 'hit_rate'}"""
+    info = compile_jsonpath.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'max_size': info.maxsize,
+        'hit_rate': round(info.hits / lookups, 4) if lookups else 0
+    }
+
+
+def clear_cache():
+    compile_jsonpath.cache_clear()
@@ -0,0 +1,236 @@
+"""
+套件压测模式
+
+复用套件中的用例定义，以 concurrency 个虚拟用户共执行 iterations 轮套件：
+每一轮按套件顺序串行执行全部用例，并使用独立的变量上下文（与普通执行的变量替换规则一致）；
+虚拟用户在 ramp_up 秒内逐个启动。每个用例的延迟记录在对数分桶的直方图中，
+结束后只写入一条 TestSuiteLoadResult（p50/p90/p99、最大值、吞吐量、错误率），
+不再为每个请求写入执行日志。
+"""
+import json
+import math
+import threading
+import time
+
+from django.db import connections
+from django.utils import timezone
+
+from test_platform.models import TestSuiteLoadResult
+from test_platform.execution.config import resolve_execution_config
+from test_platform.execution.core import execute_case
+from test_platform.execution.deadline import Deadline
+from test_platform.execution.http_pool import HttpClient
+from test_platform.execution.suite_runner import load_suite_cases, prepare_suite_case
+
+
+# 直方图相邻分桶上界之比，百分位的相对误差不超过该值
+HISTOGRAM_GROWTH = 1.05
+
+# 压测参数上限，防止误操作压垮被测环境
+MAX_ITERATIONS = 100000
+MAX_CONCURRENCY = 200
+
+PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram:
+    """按对数分桶统计延迟（毫秒），存储大小与请求数无关"""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, duration_ms, success=True):
+        bucket = int(math.log(max(duration_ms, 1.0), HISTOGRAM_GROWTH))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += duration_ms
+        self.max = max(self.max, duration_ms)
+        if not success:
+            self.errors += 1
+
+    def merge(self, other):
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.errors += other.errors
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent):
+        """返回百分位延迟（所在分桶的上界，不超过最大值）"""
+        if not self.count:
+            return 0.0
+        threshold = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= threshold:
+                return min(self.max, HISTOGRAM_GROWTH ** (bucket + 1))
+        return self.max
+
+    def summary(self, elapsed):
+        """统计摘要，elapsed 为压测总耗时（秒），用于计算吞吐量"""
+        data = {
+            'count': self.count,
+            'errors': self.errors,
+            'error_rate': round(self.errors / self.count * 100, 2) if self.count else 0,
+            'mean': round(self.total / self.count, 2) if self.count else 0,
+            'max': round(self.max, 2),
+            'throughput': round(self.count / elapsed, 2) if elapsed > 0 else 0,
+        }
+        for percent in PERCENTILES:
+            data[f'p{percent}'] = round(self.percentile(percent), 2)
+        # 分桶上界(毫秒) -> 请求数，供报告绘制延迟分布图
+        data['histogram'] = [
+            [round(HISTOGRAM_GROWTH ** (bucket + 1), 2), self.buckets[bucket]] for bucket in sorted(self.buckets)
+        ]
+        return data
+
+
+def parse_load_options(options):
+    """
+    解析压测参数
+
+    返回:
+        (iterations, concurrency, ramp_up)
+
+    异常:
+        ValueError: 参数无效
+    """
+    options = options or {}
+    try:
+        iterations = int(options.get('iterations') or 1)
+        concurrency = int(options.get('concurrency') or 1)
+        ramp_up = float(options.get('ramp_up') or 0)
+    except (TypeError, ValueError):
+        raise ValueError('iterations、concurrency必须为整数，ramp_up必须为数字')
+    if not 1 <= iterations <= MAX_ITERATIONS:
+        raise ValueError(f'iterations必须在1到{MAX_ITERATIONS}之间')
+    if not 1 <= concurrency <= MAX_CONCURRENCY:
+        raise ValueError(f'concurrency必须在1到{MAX_CONCURRENCY}之间')
+    if ramp_up < 0:
+        raise ValueError('ramp_up不能为负数')
+    return iterations, min(concurrency, iterations), ramp_up
+
+
+def run_load_test(load_result, overrides=None):
+    """
+    执行压测并更新压测结果记录
+
+    参数:
+        load_result: 状态为 running 的 TestSuiteLoadResult，包含压测参数
+        overrides: 执行配置覆盖项（如 case_timeout、suite_timeout，后者作为整个压测的时间预算）
+    """
+    test_suite = load_result.suite
+    suite_cases, test_cases = load_suite_cases(test_suite)
+    if not suite_cases:
+        raise ValueError('测试套件中没有测试用例')
+
+    execution_config = resolve_execution_config(test_suite.execution_config, overrides)
+    total_cases = len(suite_cases)
+    prepared = [
+        prepare_suite_case(index, suite_case, total_cases, test_cases)
+        for index, suite_case in enumerate(suite_cases)
+    ]
+    cases = [
+        (suite_case.original_case_id, case_data.get('title', '') if isinstance(case_data, dict) else '', spec)
+        for suite_case, (case_data, spec, error_entry) in zip(suite_cases, prepared)
+        if error_entry is None
+    ]
+    if not cases:
+        raise ValueError('测试套件中没有可执行的测试用例')
+
+    client = HttpClient(load_result.environment, execution_config.get('case_timeout'))
+    deadline = Deadline(execution_config.get('suite_timeout'))
+    iterations, concurrency, ramp_up = load_result.iterations, load_result.concurrency, load_result.ramp_up
+
+    next_iteration = [0]
+    lock = threading.Lock()
+    # 每个虚拟用户单独统计，结束后合并，避免记录延迟时争用锁
+    worker_histograms = [[LatencyHistogram() for _ in cases] for _ in range(concurrency)]
+    # 时间预算用尽后未执行的用例数和被中断的轮次数，不作为延迟样本计入直方图
+    worker_skipped = [0] * concurrency
+    worker_interrupted = [0] * concurrency
+
+    def take_iteration():
+        with lock:
+            if next_iteration[0] >= iterations or deadline.expired():
+                return False
+            next_iteration[0] += 1
+            return True
+
+    def virtual_user(worker_index):
+        try:
+            if ramp_up and concurrency > 1:
+                time.sleep(ramp_up * worker_index / concurrency)
+            histograms = worker_histograms[worker_index]
+            while take_iteration():
+                context = {}
+                for case_index, (_, _, spec) in enumerate(cases):
+                    result = execute_case(spec, context, client=client, deadline=deadline)
+                    if result.error_kind == 'deadline':
+                        # 未发出请求，耗时为0，记录为延迟样本会拉低百分位并虚增吞吐量
+                        worker_skipped[worker_index] += len(cases) - case_index
+                        worker_interrupted[worker_index] += 1
+                        break
+                    histograms[case_index].record(result.duration * 1000, result.success)
+                    context.update(result.extracted_variables or {})
+        finally:
+            connections.close_all()
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=virtual_user, args=(index,), daemon=True) for index in range(concurrency)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    overall = LatencyHistogram()
+    case_stats = []
+    for case_index, (case_id, title, spec) in enumerate(cases):
+        histogram = LatencyHistogram()
+        for histograms in worker_histograms:
+            histogram.merge(histograms[case_index])
+        overall.merge(histogram)
+        case_stats.append({
+            'case_id': case_id,
+            'title': title,
+            'method': spec.method,
+            'api_path': spec.url,
+            **histogram.summary(elapsed)
+        })
+
+    summary = overall.summary(elapsed)
+    load_result.status = 'completed'
+    load_result.duration = round(elapsed, 3)
+    load_result.total_requests = overall.count
+    load_result.error_requests = overall.errors
+    load_result.throughput = summary['throughput']
+    load_result.result_data = json.dumps({
+        'completed_iterations': next_iteration[0] - sum(worker_interrupted),
+        'interrupted_iterations': sum(worker_interrupted),
+        'deadline_skipped_cases': sum(worker_skipped),
+        'summary': summary,
+        'cases': case_stats
+    }, ensure_ascii=False)
+    load_result.save()
+    return load_result
+
+
+def create_load_result(test_suite, environment, options, user=None):
+    """校验压测参数并创建状态为 running 的压测结果记录"""
+    iterations, concurrency, ramp_up = parse_load_options(options)
+    return TestSuiteLoadResult.objects.create(
+        suite=test_suite,
+        environment=environment,
+        iterations=iterations,
+        concurrency=concurrency,
+        ramp_up=ramp_up,
+        execution_time=timezone.now(),
+        creator=user if getattr(user, 'is_authenticated', False) else None
+    )
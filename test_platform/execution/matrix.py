@@ -0,0 +1,191 @@
+"""
+多环境矩阵执行
+
+同一个套件在多个执行环境（如 staging、预发、灰度）上同时执行：每个环境一个线程，各自独立的变量上下文、
+连接池和执行结果(TestSuiteResult)，总耗时取决于最慢的环境而不是各环境耗时之和。
+执行完成后按用例对齐各环境的结果，生成并排对比，标出各环境状态不一致的用例。
+矩阵执行由 Celery 任务(execute_suite_matrix)完成，运行状态和各环境的执行结果ID写入 run_status。
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+
+from test_platform.models import TestEnvironment, TestSuite, TestSuiteResult
+from test_platform.execution.cassette import get_cassette_mode
+from test_platform.execution.config import resolve_execution_config
+from test_platform.execution.rerun import load_result_entries
+from test_platform.execution.suite_runner import run_suite
+
+
+# 一次矩阵执行最多的环境数
+MAX_MATRIX_ENVIRONMENTS = 10
+
+# 对比结果中错误信息的最大长度
+COMPARE_ERROR_LENGTH = 200
+
+
+def load_matrix_environments(environment_ids):
+    """
+    按传入顺序加载矩阵执行的环境
+
+    返回:
+        (TestEnvironment列表, 错误信息或None)
+    """
+    if not isinstance(environment_ids, (list, tuple)) or not environment_ids:
+        return [], '请提供执行环境ID列表 environment_ids'
+    try:
+        environment_ids = list(dict.fromkeys(int(environment_id) for environment_id in environment_ids))
+    except (TypeError, ValueError):
+        return [], '执行环境ID无效'
+    if len(environment_ids) > MAX_MATRIX_ENVIRONMENTS:
+        return [], f'一次最多在{MAX_MATRIX_ENVIRONMENTS}个环境上执行'
+    environments = TestEnvironment.objects.in_bulk(environment_ids)
+    missing = [environment_id for environment_id in environment_ids if environment_id not in environments]
+    if missing:
+        return [], f'执行环境不存在: {missing}'
+    return [environments[environment_id] for environment_id in environment_ids], None
+
+
+def check_matrix_config(test_suite, overrides=None):
+    """
+    检查执行配置是否支持矩阵执行
+
+    异常:
+        ValueError: 执行配置为录制模式（各环境会同时写入同一个套件录制文件）
+    """
+    if get_cassette_mode(resolve_execution_config(test_suite.execution_config, overrides)) == 'record':
+        raise ValueError('多环境执行不支持录制(cassette=record)，请在单个环境上录制')
+
+
+def _run_environment(suite_id, environment, user, overrides, on_case_done):
+    """在工作线程中执行一个环境，使用独立的套件对象和数据库连接"""
+    try:
+        test_suite = TestSuite.objects.get(suite_id=suite_id)
+        return run_suite(test_suite, environment, user=user, overrides=overrides, on_case_done=on_case_done)
+    finally:
+        connection.close()
+
+
+def environment_label(environment):
+    return {'key': str(environment.environment_id), 'environment_id': environment.environment_id,
+            'env_name': environment.env_name}
+
+
+def run_suite_matrix(test_suite, environments, user=None, overrides=None, on_case_done=None):
+    """
+    在多个环境上同时执行套件
+
+    参数:
+        environments: TestEnvironment 列表（见 load_matrix_environments）
+        overrides: 各环境共用的执行配置覆盖项
+        on_case_done: 每个用例完成后的回调 on_case_done(用例执行结果字典)，在各环境的执行线程中调用
+
+    返回:
+        包含各环境执行摘要和并排对比(comparison)的字典；某个环境执行失败时只记录其错误
+
+    异常:
+        ValueError: 执行配置不支持矩阵执行（见 check_matrix_config）
+    """
+    check_matrix_config(test_suite, overrides)
+    with ThreadPoolExecutor(max_workers=len(environments)) as executor:
+        futures = [
+            executor.submit(_run_environment, test_suite.suite_id, environment, user, overrides, on_case_done)
+            for environment in environments
+        ]
+
+    runs = []
+    for environment, future in zip(environments, futures):
+        run = environment_label(environment)
+        try:
+            summary = future.result()
+        except Exception as e:
+            run.update(status='error', error=str(e), results=[])
+        else:
+            run.update(summary)
+        runs.append(run)
+
+    return {
+        'suite_id': test_suite.suite_id,
+        'name': test_suite.name,
+        # 环境并行执行，矩阵的耗时即最慢环境的耗时
+        'duration': max((run.get('duration') or 0 for run in runs), default=0),
+        'environments': [{key: value for key, value in run.items() if key != 'results'} for run in runs],
+        'comparison': compare_environment_results(runs)
+    }
+
+
+def compare_environment_results(runs):
+    """
+    按用例在套件中的顺序对齐各环境的结果
+
+    参数:
+        runs: [{'key': 列标识, 'results': 用例结果列表, ...}, ...]
+
+    返回:
+        {'total_cases', 'consistent_cases', 'inconsistent_cases', 'cases': [...]}，
+        每个用例的 environments 以各次执行的 key 为键；所有执行都有结果且状态相同时 consistent 为True
+    """
+    rows = {}
+    for run in runs:
+        key = run['key']
+        for entry in run.get('results') or []:
+            index = entry.get('index', 0)
+            row = rows.setdefault(index, {
+                'index': index,
+                'case_id': entry.get('case_id'),
+                'title': entry.get('title', ''),
+                'method': entry.get('method', ''),
+                'environments': {}
+            })
+            response = entry.get('response') if isinstance(entry.get('response'), dict) else {}
+            error = entry.get('error')
+            row['environments'][key] = {
+                'status': entry.get('status'),
+                'duration': entry.get('duration'),
+                'status_code': response.get('status_code'),
+                'api_path': entry.get('api_path', ''),
+                'error': str(error)[:COMPARE_ERROR_LENGTH] if error else None
+            }
+
+    cases = [rows[index] for index in sorted(rows)]
+    for row in cases:
+        statuses = {result['status'] for result in row['environments'].values()}
+        row['consistent'] = len(row['environments']) == len(runs) and len(statuses) == 1
+    consistent_cases = sum(1 for row in cases if row['consistent'])
+    return {
+        'total_cases': len(cases),
+        'consistent_cases': consistent_cases,
+        'inconsistent_cases': len(cases) - consistent_cases,
+        'cases': cases
+    }
+
+
+def compare_suite_results(suite_id, result_ids):
+    """
+    对比已保存的多次执行结果（如之前的矩阵执行），按传入顺序排列，以执行结果ID为列标识
+
+    异常:
+        ValueError: 执行结果不存在或不属于该套件
+    """
+    results = TestSuiteResult.objects.select_related('environment').in_bulk(result_ids)
+    runs = []
+    for result_id in result_ids:
+        suite_result = results.get(result_id)
+        if suite_result is None or suite_result.suite_id != suite_id:
+            raise ValueError(f'执行结果 {result_id} 不存在或不属于该测试套件')
+        environment = suite_result.environment
+        runs.append({
+            'key': str(result_id),
+            'environment_id': environment.environment_id if environment else None,
+            'env_name': environment.env_name if environment else None,
+            'result_id': result_id,
+            'status': suite_result.status,
+            'pass_rate': suite_result.pass_rate,
+            'duration': suite_result.duration,
+            'results': load_result_entries(suite_result)
+        })
+    return {
+        'suite_id': suite_id,
+        'environments': [{key: value for key, value in run.items() if key != 'results'} for run in runs],
+        'comparison': compare_environment_results(runs)
+    }
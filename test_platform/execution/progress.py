@@ -0,0 +1,134 @@
+"""
+执行进度发布
+
+套件和测试计划执行过程中通过 Redis 发布/订阅推送进度事件，SSE 接口订阅对应频道转发给前端。
+事件由后台线程批量发布，执行线程只负责入队，不会因等待 Redis 往返而变慢；
+Redis 不可用时丢弃事件，不影响执行本身。
+
+频道:
+    suite:{suite_id}  某个套件的执行进度（同步执行、异步执行和计划中的执行都会发布）
+    plan:{plan_id}    某个测试计划的执行进度（包含计划内各套件的用例事件）
+    run:{run_id}      某次异步执行的进度
+
+事件（JSON，event 字段为事件类型）:
+    plan_started / suite_started / case_completed / suite_completed / suite_failed / plan_completed
+"""
+import json
+import logging
+import queue
+import threading
+import time
+
+import redis
+from django.conf import settings
+
+from test_platform.execution.run_status import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+CHANNEL_PREFIX = 'test_platform:progress:'
+
+# 订阅各类频道时表示执行结束的事件
+SUITE_TERMINAL_EVENTS = ('suite_completed', 'suite_failed')
+PLAN_TERMINAL_EVENTS = ('plan_completed',)
+
+# 单次批量发布的最大事件数
+PUBLISH_BATCH_SIZE = 100
+
+
+def suite_channel(suite_id):
+    return f'{CHANNEL_PREFIX}suite:{suite_id}'
+
+
+def plan_channel(plan_id):
+    return f'{CHANNEL_PREFIX}plan:{plan_id}'
+
+
+def run_channel(run_id):
+    return f'{CHANNEL_PREFIX}run:{run_id}'
+
+
+class _PublishQueue:
+    """后台发布线程，按入队顺序将事件发布到各自的频道"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def put(self, channels, message):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, daemon=True)
+                    self._thread.start()
+        self._queue.put((channels, message))
+
+    def close(self, timeout=5):
+        """发布完已入队的事件后结束后台线程"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while item is not None and len(batch) < PUBLISH_BATCH_SIZE:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            events = [entry for entry in batch if entry is not None]
+            if events:
+                try:
+                    pipe = get_redis().pipeline(transaction=False)
+                    for channels, message in events:
+                        for channel in channels:
+                            pipe.publish(channel, message)
+                    pipe.execute()
+                except redis.RedisError as e:
+                    logger.warning("发布执行进度失败: %s", e)
+
+            if len(events) < len(batch):
+                return
+
+
+class ProgressPublisher:
+    """
+    进度事件发布器
+
+    参数:
+        channels: 事件发布到的频道列表
+        context: 附加到每个事件中的字段，如 plan_id、run_id
+    """
+
+    def __init__(self, channels=(), **context):
+        self.channels = tuple(channel for channel in channels if channel)
+        self.context = context
+        self._sink = _PublishQueue()
+        self._owns_sink = True
+
+    def child(self, channels=(), **context):
+        """创建共享同一发布线程的子发布器，追加频道和上下文字段（如计划内的某个套件）"""
+        publisher = ProgressPublisher(self.channels + tuple(channels), **{**self.context, **context})
+        publisher._sink = self._sink
+        publisher._owns_sink = False
+        return publisher
+
+    def publish(self, event, **data):
+        if not settings.TEST_PROGRESS_ENABLED or not self.channels:
+            return
+        message = json.dumps(
+            {'event': event, **self.context, **data, 'timestamp': time.time()},
+            ensure_ascii=False, default=str
+        )
+        self._sink.put(self.channels, message)
+
+    def close(self):
+        """发布剩余事件并停止发布线程；子发布器不负责关闭共享的发布线程"""
+        if self._owns_sink:
+            self._sink.close()
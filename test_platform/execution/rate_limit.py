@@ -0,0 +1,216 @@
+"""
+目标主机的流量限制
+
+多个测试计划、套件和单用例执行可能同时请求同一个被测环境，这里按目标主机限制
+最大并发请求数（max_concurrency）和每秒请求数（rate_limit）。限制状态保存在 Redis 中，
+所有 Celery worker 和 Web 进程共享同一份配额：
+- 每秒请求数使用令牌桶，桶容量等于每秒请求数，允许短时突发
+- 并发数使用带租约的信号量，进程异常退出时名额在租约到期后自动释放
+
+限制值优先取执行环境(TestEnvironment)上的配置，其次取 settings.TEST_TRAFFIC_LIMITS 中按主机配置的值。
+Redis 不可用时不做限制，避免影响执行本身。
+"""
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlsplit
+
+import redis
+from django.conf import settings
+
+from test_platform.execution.run_status import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+KEY_PREFIX = 'test_platform:traffic:'
+
+# 令牌桶：返回0表示已取得令牌，否则返回需要等待的毫秒数
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = redis.call('TIME')
+now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated_at) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return wait
+"""
+
+# 并发信号量：有空闲名额时登记租约并返回1，否则返回0
+SEMAPHORE_ACQUIRE_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local lease_ms = tonumber(ARGV[2])
+local now = redis.call('TIME')
+now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) < limit then
+    redis.call('ZADD', KEYS[1], now + lease_ms, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], lease_ms)
+    return 1
+end
+return 0
+"""
+
+# 等待并发名额时的轮询间隔（秒）
+SEMAPHORE_POLL_INTERVAL = 0.05
+
+DEFAULT_LIMIT_CONFIG = {
+    # 等待限流名额的最长时间（秒），超出后用例记为超时
+    'max_wait': 60,
+    # 并发名额的租约时长（秒），应大于请求的最长耗时
+    'lease': 300,
+}
+
+
+class TrafficLimitTimeout(Exception):
+    """等待目标主机的限流名额超时"""
+
+
+def get_limit_config():
+    config = dict(DEFAULT_LIMIT_CONFIG)
+    config.update(getattr(settings, 'TEST_TRAFFIC_LIMIT', {}) or {})
+    return config
+
+
+def _positive(value, cast):
+    try:
+        value = cast(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def resolve_host_limits(environment, host):
+    """
+    确定目标主机的 (最大并发数, 每秒请求数)，未配置的项为None
+
+    参数:
+        environment: 执行环境，环境上的配置优先
+        host: 请求URL中的主机（含端口）
+    """
+    host_limits = (getattr(settings, 'TEST_TRAFFIC_LIMITS', {}) or {}).get(host) or {}
+    max_concurrency = _positive(getattr(environment, 'max_concurrency', None), int) \
+        or _positive(host_limits.get('max_concurrency'), int)
+    rate_limit = _positive(getattr(environment, 'rate_limit', None), float) \
+        or _positive(host_limits.get('rate_limit'), float)
+    return max_concurrency, rate_limit
+
+
+class TrafficLimiter:
+    """
+    按目标主机限制并发数和请求速率
+
+    参数:
+        environment: 执行环境，提供环境级的限制配置
+    """
+
+    def __init__(self, environment=None):
+        self.environment = environment
+        self._token_bucket = None
+        self._semaphore = None
+
+    def _scripts(self):
+        if self._token_bucket is None:
+            client = get_redis()
+            self._token_bucket = client.register_script(TOKEN_BUCKET_SCRIPT)
+            self._semaphore = client.register_script(SEMAPHORE_ACQUIRE_SCRIPT)
+        return self._token_bucket, self._semaphore
+
+    def _try_acquire(self, host, max_concurrency, rate_limit, lease_id, holding):
+        """
+        尝试占用一次请求名额：先占用并发名额，再从令牌桶取令牌
+
+        参数:
+            holding: 之前的尝试中是否已占用并发名额
+
+        返回:
+            (需要等待的秒数，0表示已全部占用, 是否已占用并发名额)
+        """
+        token_bucket, semaphore = self._scripts()
+        if max_concurrency and not holding:
+            lease_ms = int(get_limit_config()['lease'] * 1000)
+            if not semaphore(keys=[f'{KEY_PREFIX}concurrency:{host}'], args=[max_concurrency, lease_ms, lease_id]):
+                return SEMAPHORE_POLL_INTERVAL, False
+            holding = True
+        if rate_limit:
+            wait_ms = token_bucket(keys=[f'{KEY_PREFIX}rate:{host}'], args=[rate_limit, max(1.0, rate_limit)])
+            if wait_ms:
+                return int(wait_ms) / 1000, holding
+        return 0, holding
+
+    def _release(self, host, lease_id):
+        try:
+            get_redis().zrem(f'{KEY_PREFIX}concurrency:{host}', lease_id)
+        except redis.RedisError as e:
+            logger.warning("释放并发名额失败: %s", e)
+
+    def _prepare(self, url):
+        host = urlsplit(url).netloc
+        max_concurrency, rate_limit = resolve_host_limits(self.environment, host)
+        return host, max_concurrency, rate_limit, uuid.uuid4().hex
+
+    @contextmanager
+    def slot(self, url):
+        """占用目标主机的请求名额，等待超过 max_wait 时抛出 TrafficLimitTimeout"""
+        host, max_concurrency, rate_limit, lease_id = self._prepare(url)
+        if not max_concurrency and not rate_limit:
+            yield
+            return
+
+        give_up_at = time.monotonic() + get_limit_config()['max_wait']
+        holding = False
+        try:
+            try:
+                while True:
+                    wait, holding = self._try_acquire(host, max_concurrency, rate_limit, lease_id, holding)
+                    if not wait:
+                        break
+                    if time.monotonic() + wait > give_up_at:
+                        raise TrafficLimitTimeout(f'等待目标主机 {host} 的限流名额超时')
+                    time.sleep(wait)
+            except redis.RedisError as e:
+                logger.warning("目标主机限流不可用，跳过限制: %s", e)
+            yield
+        finally:
+            if holding:
+                self._release(host, lease_id)
+
+    @asynccontextmanager
+    async def slot_async(self, url):
+        """slot 的异步版本，Redis 访问在线程中执行，不阻塞事件循环"""
+        host, max_concurrency, rate_limit, lease_id = self._prepare(url)
+        if not max_concurrency and not rate_limit:
+            yield
+            return
+
+        give_up_at = time.monotonic() + get_limit_config()['max_wait']
+        holding = False
+        try:
+            try:
+                while True:
+                    wait, holding = await asyncio.to_thread(
+                        self._try_acquire, host, max_concurrency, rate_limit, lease_id, holding
+                    )
+                    if not wait:
+                        break
+                    if time.monotonic() + wait > give_up_at:
+                        raise TrafficLimitTimeout(f'等待目标主机 {host} 的限流名额超时')
+                    await asyncio.sleep(wait)
+            except redis.RedisError as e:
+                logger.warning("目标主机限流不可用，跳过限制: %s", e)
+            yield
+        finally:
+            if holding:
+                await asyncio.to_thread(self._release, host, lease_id)
@@ -0,0 +1,147 @@
+"""
+失败用例重跑
+
+根据一次套件执行结果(TestSuiteResult)中失败/错误/超时的用例，只重新执行这些用例，
+以及它们（直接或间接）引用的变量的产出用例（如登录用例），而不是整个套件。
+重跑生成新的 TestSuiteResult，通过 rerun_of 关联到被重跑的结果；
+合并视图按用例在套件中的顺序，以最近一次执行的结果覆盖之前的结果。
+"""
+import json
+import logging
+
+from django.utils import timezone
+
+from test_platform.execution.blob_store import unpack
+from test_platform.execution.dag import with_variable_producers
+from test_platform.execution.suite_plan import suite_plan_cache
+from test_platform.execution.suite_runner import (
+    FAILURE_STATUSES, resolve_suite_environment, run_suite, summarize_case_results
+)
+
+logger = logging.getLogger(__name__)
+
+
+# 合并视图最多追溯的重跑层数
+MAX_RERUN_CHAIN = 50
+
+
+def load_result_entries(suite_result):
+    """取出执行结果中的用例结果列表"""
+    try:
+        result_data = json.loads(suite_result.result_data) if suite_result.result_data else {}
+    except json.JSONDecodeError:
+        return []
+    results = result_data.get('results') if isinstance(result_data, dict) else None
+    return [entry for entry in results if isinstance(entry, dict)] if isinstance(results, list) else []
+
+
+def failed_case_indexes(suite_result, plan, include_skipped=False):
+    """
+    找出执行结果中未通过的用例在当前执行计划中的下标
+
+    优先按结果中的执行顺序(index)匹配，套件用例调整过顺序时按原始用例ID匹配。
+
+    返回:
+        (用例下标集合, 在当前套件中已找不到的原始用例ID列表)
+    """
+    statuses = FAILURE_STATUSES + ('SKIP',) if include_skipped else FAILURE_STATUSES
+    positions_by_case_id = {}
+    for position, suite_case in enumerate(plan.cases):
+        positions_by_case_id.setdefault(suite_case.original_case_id, []).append(position)
+
+    indexes = set()
+    missing = []
+    for entry in load_result_entries(suite_result):
+        if entry.get('status') not in statuses:
+            continue
+        case_id = entry.get('case_id')
+        position = (entry.get('index') or 0) - 1
+        if 0 <= position < len(plan.cases) and plan.cases[position].original_case_id == case_id:
+            indexes.add(position)
+        elif positions_by_case_id.get(case_id):
+            indexes.add(positions_by_case_id[case_id][0])
+        else:
+            missing.append(case_id)
+    return indexes, missing
+
+
+def rerun_failed_cases(suite_result, user=None, overrides=None, include_skipped=False):
+    """
+    重跑执行结果中未通过的用例及其依赖的变量产出用例
+
+    参数:
+        suite_result: 被重跑的 TestSuiteResult
+        overrides: 执行配置覆盖项
+        include_skipped: 是否同时重跑状态为SKIP的用例（如因 stop_on_failure 被跳过的用例）
+
+    返回:
+        执行结果摘要字典（包含新的 result_id、rerun_of 及重跑的用例数）
+
+    异常:
+        ValueError: 没有需要重跑的用例或找不到执行环境
+    """
+    test_suite = suite_result.suite
+    plan = suite_plan_cache.get_plan(test_suite)
+    targets, missing = failed_case_indexes(suite_result, plan, include_skipped)
+    if not targets:
+        raise ValueError('执行结果中没有可重跑的失败用例')
+
+    case_indexes = with_variable_producers([suite_case.case_data for suite_case in plan.cases], targets)
+
+    environment = suite_result.environment
+    if environment is None:
+        environment, env_error = resolve_suite_environment(test_suite)
+        if env_error:
+            raise ValueError(env_error)
+
+    logger.info("重跑测试套件 %s 的执行结果 %s: 失败用例 %s 个，连同依赖共执行 %s 个",
+                test_suite.suite_id, suite_result.result_id, len(targets), len(case_indexes))
+    summary = run_suite(
+        test_suite, environment, user=user, overrides=overrides, case_indexes=case_indexes, rerun_of=suite_result
+    )
+    summary['rerun_of'] = suite_result.result_id
+    summary['failed_cases_rerun'] = len(targets)
+    summary['dependency_cases'] = len(case_indexes) - len(targets)
+    summary['missing_case_ids'] = missing
+    return summary
+
+
+def rerun_chain(suite_result):
+    """从最初的完整执行到 suite_result 的执行结果链"""
+    chain = [suite_result]
+    while chain[-1].rerun_of_id and len(chain) < MAX_RERUN_CHAIN:
+        chain.append(chain[-1].rerun_of)
+    chain.reverse()
+    return chain
+
+
+def merge_rerun_results(suite_result):
+    """
+    合并视图：以最初的完整执行为基础，依次用各次重跑的用例结果覆盖
+
+    返回:
+        包含统计数据、合并后的用例结果（result_id 标明结果来自哪次执行）及执行链的字典
+    """
+    chain = rerun_chain(suite_result)
+    merged = {}
+    for item in chain:
+        for entry in load_result_entries(item):
+            merged[entry.get('index', 0)] = {**entry, 'result_id': item.result_id}
+    results = unpack([merged[index] for index in sorted(merged)])
+
+    return {
+        'suite_id': suite_result.suite_id,
+        'result_id': suite_result.result_id,
+        'original_result_id': chain[0].result_id,
+        'chain': [
+            {
+                'result_id': item.result_id,
+                'status': item.status,
+                'total_cases': item.total_cases,
+                'execution_time': timezone.localtime(item.execution_time).strftime('%Y-%m-%d %H:%M:%S')
+            }
+            for item in chain
+        ],
+        **summarize_case_results(results),
+        'results': results
+    }
@@ -0,0 +1,143 @@
+"""
+用例失败重试策略
+
+连接被重置、网关返回502等瞬时故障时，对单个用例按指数退避（带随机抖动）重试，
+而不是整套件重新执行。重试策略来自执行配置（retry_* 配置项），用例数据中的 retry 字段可覆盖；
+一次套件执行内的全部重试共享一个重试预算，环境整体不可用时很快停止重试。
+每次尝试的结果记录在 CaseResult.retries 中，随用例执行结果一起保存。
+"""
+import random
+import threading
+
+from test_platform.execution.deadline import MIN_REQUEST_BUDGET
+
+
+# 可重试的请求错误类型（对应 CaseResult.error_kind）
+RETRYABLE_ERROR_KINDS = ('connection', 'timeout')
+
+
+def _as_int_list(value):
+    if value is None:
+        return []
+    if isinstance(value, (int, str)):
+        value = [value]
+    result = []
+    for item in value:
+        try:
+            result.append(int(item))
+        except (TypeError, ValueError):
+            continue
+    return result
+
+
+class RetryPolicy:
+    """
+    单个用例的重试策略
+
+    参数:
+        max_attempts: 最大尝试次数（包含第一次），1表示不重试
+        backoff: 第一次重试前的等待秒数，之后每次翻倍
+        backoff_max: 单次等待的最大秒数
+        jitter: 是否在 [0, 退避时间] 内随机等待，避免大量用例同时重试
+        status_codes: 需要重试的HTTP状态码
+        error_kinds: 需要重试的请求错误类型，取值 connection / timeout
+    """
+
+    def __init__(self, max_attempts=1, backoff=0.5, backoff_max=10, jitter=True,
+                 status_codes=(), error_kinds=RETRYABLE_ERROR_KINDS):
+        self.max_attempts = max(1, int(max_attempts or 1))
+        self.backoff = max(0.0, float(backoff or 0))
+        self.backoff_max = max(0.0, float(backoff_max or 0))
+        self.jitter = bool(jitter)
+        self.status_codes = set(_as_int_list(status_codes))
+        self.error_kinds = set(error_kinds or ())
+
+    @classmethod
+    def from_config(cls, execution_config, case_retry=None):
+        """
+        根据执行配置构建重试策略
+
+        参数:
+            execution_config: 合并后的执行配置
+            case_retry: 用例数据中的 retry 配置，如 {"max_attempts": 3, "status_codes": [502]}
+        """
+        options = {
+            'max_attempts': execution_config.get('retry_max_attempts'),
+            'backoff': execution_config.get('retry_backoff'),
+            'backoff_max': execution_config.get('retry_backoff_max'),
+            'jitter': execution_config.get('retry_jitter', True),
+            'status_codes': execution_config.get('retry_status_codes'),
+            'error_kinds': execution_config.get('retry_on_errors', RETRYABLE_ERROR_KINDS),
+        }
+        if isinstance(case_retry, dict):
+            options.update({key: value for key, value in case_retry.items() if key in options and value is not None})
+        return cls(**options)
+
+    @property
+    def enabled(self):
+        return self.max_attempts > 1
+
+    def should_retry(self, result, attempt):
+        """第 attempt 次尝试（从1开始）得到 result 后是否需要重试"""
+        if attempt >= self.max_attempts or result.success:
+            return False
+        if result.error is not None:
+            return result.error_kind in self.error_kinds
+        return result.status_code in self.status_codes
+
+    def delay(self, attempt):
+        """第 attempt 次尝试失败后、下一次尝试前的等待秒数"""
+        delay = min(self.backoff_max, self.backoff * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class RetryBudget:
+    """
+    一次执行内共享的重试次数预算（线程安全）
+
+    参数:
+        limit: 最多允许的重试次数，None表示不限制
+    """
+
+    def __init__(self, limit=None):
+        self.limit = int(limit) if limit is not None else None
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """占用一次重试名额，预算用尽时返回False"""
+        with self._lock:
+            if self.limit is not None and self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+
+def retry_entry(attempt, result, delay):
+    """记录一次失败尝试，保存在 CaseResult.retries 中"""
+    return {
+        'attempt': attempt,
+        'status': result.status,
+        'status_code': result.status_code or None,
+        'error': result.error or result.failure_message,
+        'duration': round(result.duration, 3),
+        'delay': round(delay, 3)
+    }
+
+
+def next_retry_delay(policy, budget, result, attempt, deadline=None):
+    """
+    判断是否重试并返回等待秒数，不重试时返回None
+
+    剩余时间预算不足以等待并再次发送请求时不重试；重试预算在最后一步占用，避免无谓消耗。
+    """
+    if policy is None or not policy.should_retry(result, attempt):
+        return None
+    delay = policy.delay(attempt)
+    if deadline is not None:
+        remaining = deadline.remaining()
+        if remaining is not None and remaining - delay < MIN_REQUEST_BUDGET:
+            return None
+    if budget is not None and not budget.acquire():
+        return None
+    return delay
@@ -0,0 +1,162 @@
+"""
+套件异步执行的运行状态
+
+异步执行的套件在 Redis 中以哈希保存运行状态（排队/执行中/已完成/失败）和进度计数，
+状态查询接口只读 Redis，不访问数据库，也不阻塞 Web 进程。
+Redis 不可用时只记录日志，不影响套件本身的执行。
+"""
+import json
+import logging
+import threading
+import uuid
+
+import redis
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+RUN_STATUS_KEY = 'test_platform:suite_run:{run_id}'
+
+# 以整数保存的字段
+INT_FIELDS = (
+    'suite_id', 'total_cases', 'completed_cases', 'passed_cases', 'failed_cases',
+    'error_cases', 'skipped_cases', 'timeout_cases', 'result_id'
+)
+FLOAT_FIELDS = ('pass_rate', 'duration')
+# 以JSON文本保存的字段
+JSON_FIELDS = ('environments',)
+
+# 用例状态对应的计数字段
+CASE_STATUS_COUNTERS = {
+    'PASS': 'passed_cases',
+    'FAIL': 'failed_cases',
+    'ERROR': 'error_cases',
+    'SKIP': 'skipped_cases',
+    'TIMEOUT': 'timeout_cases',
+}
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_redis():
+    """获取进程内共享的 Redis 客户端"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = redis.Redis.from_url(settings.TEST_EXECUTION_REDIS_URL, decode_responses=True)
+    return _client
+
+
+def new_run_id():
+    """生成异步执行的运行ID"""
+    return uuid.uuid4().hex
+
+
+def _now():
+    return timezone.localtime(timezone.now()).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _write(run_id, mapping, increments=None):
+    key = RUN_STATUS_KEY.format(run_id=run_id)
+    try:
+        pipe = get_redis().pipeline()
+        if mapping:
+            pipe.hset(key, mapping={k: '' if v is None else v for k, v in mapping.items()})
+        for field_name, amount in (increments or {}).items():
+            pipe.hincrby(key, field_name, amount)
+        pipe.expire(key, settings.TEST_RUN_STATUS_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("写入运行状态失败: run_id=%s, 错误: %s", run_id, e)
+
+
+def init_run(run_id, suite_id, total_cases, user_id=None):
+    """创建排队中的运行状态"""
+    _write(run_id, {
+        'run_id': run_id,
+        'suite_id': suite_id,
+        'status': 'queued',
+        'total_cases': total_cases,
+        'completed_cases': 0,
+        'passed_cases': 0,
+        'failed_cases': 0,
+        'error_cases': 0,
+        'skipped_cases': 0,
+        'timeout_cases': 0,
+        'user_id': user_id,
+        'queued_at': _now(),
+    })
+
+
+def mark_running(run_id, task_id=None):
+    _write(run_id, {'status': 'running', 'task_id': task_id, 'started_at': _now()})
+
+
+def record_case_done(run_id, case_status):
+    """用例执行完成后累加进度"""
+    increments = {'completed_cases': 1}
+    counter = CASE_STATUS_COUNTERS.get(case_status)
+    if counter:
+        increments[counter] = 1
+    _write(run_id, None, increments)
+
+
+def mark_completed(run_id, run_data):
+    """套件执行完成，记录结果ID和统计数据"""
+    _write(run_id, {
+        'status': 'completed',
+        'suite_status': run_data['status'],
+        'result_id': run_data['result_id'],
+        'pass_rate': run_data['pass_rate'],
+        'duration': run_data['duration'],
+        'finished_at': _now(),
+    })
+
+
+def mark_matrix_completed(run_id, matrix):
+    """多环境执行完成，记录各环境的执行结果ID和摘要（用于对比接口）"""
+    environments = matrix['environments']
+    _write(run_id, {
+        'status': 'completed',
+        'result_ids': ','.join(str(run['result_id']) for run in environments if run.get('result_id')),
+        'environments': json.dumps(environments, ensure_ascii=False, default=str),
+        'duration': matrix['duration'],
+        'finished_at': _now(),
+    })
+
+
+def mark_failed(run_id, error):
+    _write(run_id, {'status': 'failed', 'error': error, 'finished_at': _now()})
+
+
+def get_run(run_id):
+    """
+    读取运行状态
+
+    返回:
+        状态字典；不存在或已过期时返回 None
+    """
+    data = get_redis().hgetall(RUN_STATUS_KEY.format(run_id=run_id))
+    if not data:
+        return None
+    data = {k: (v if v != '' else None) for k, v in data.items()}
+    for field_name in INT_FIELDS:
+        if data.get(field_name):
+            data[field_name] = int(data[field_name])
+    for field_name in FLOAT_FIELDS:
+        if data.get(field_name):
+            data[field_name] = float(data[field_name])
+    for field_name in JSON_FIELDS:
+        if data.get(field_name):
+            try:
+                data[field_name] = json.loads(data[field_name])
+            except ValueError:
+                pass
+    total = data.get('total_cases') or 0
+    completed = data.get('completed_cases') or 0
+    data['progress'] = round(completed / total * 100, 2) if total else 0
+    return data
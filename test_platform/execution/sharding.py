@@ -0,0 +1,169 @@
+"""
+套件分片执行
+
+大型套件可以按执行配置中的 shards 拆分为多个分片，由多个 Celery worker 同时执行，
+全部分片完成后合并为一条 TestSuiteResult。分片依据与并行模式相同的变量依赖图：
+通过提取器和 ${变量} 直接或间接共享变量的用例始终位于同一分片，并在分片内按原始顺序执行。
+分片执行只支持异步提交（execute_suite_async），由 chord 回调完成合并。
+
+各分片的用例执行结果（含请求和响应内容）写入 TestSuiteShardResult，Celery 任务结果只返回记录ID和统计，
+避免大量结果数据经过 Redis 结果后端；合并完成后删除分片记录。
+"""
+from datetime import datetime
+
+from django.utils import timezone
+
+from test_platform.models import TestSuiteCase, TestSuiteShardResult
+from test_platform.execution.blob_store import pack_json, unpack_json
+from test_platform.execution.cassette import get_cassette_mode
+from test_platform.execution.config import resolve_execution_config
+from test_platform.execution.dag import split_into_shards
+from test_platform.execution.deadline import Deadline
+from test_platform.execution.history import history_durations
+from test_platform.execution.suite_plan import suite_plan_cache
+from test_platform.execution.suite_runner import load_existing_case_ids, run_suite_cases, summarize_case_results
+from test_platform.execution.trace import TraceRecorder
+from test_platform.execution.warmup import warm_up
+
+
+def get_shard_count(execution_config):
+    """执行配置中的分片数，无效值按1处理；录制和回放（cassette）时不分片"""
+    if get_cassette_mode(execution_config) != 'off':
+        return 1
+    try:
+        return max(1, int(execution_config.get('shards') or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+def plan_suite_shards(test_suite, shard_count, overrides=None):
+    """
+    划分套件的执行分片，开启 history_scheduling 时按用例历史耗时均衡各分片
+
+    返回:
+        分片列表，每个分片为 [[用例下标, TestSuiteCase.id], ...]，用例下标为在整个套件中的执行顺序
+    """
+    plan = suite_plan_cache.get_plan(test_suite)
+    durations = history_durations(plan.cases, resolve_execution_config(test_suite.execution_config, overrides))
+    return [
+        [[index, plan.cases[index].id] for index in shard]
+        for shard in split_into_shards(plan.dependencies, shard_count, durations)
+    ]
+
+
+def run_suite_shard(test_suite, environment, shard, overrides=None, on_case_done=None, trace_id=None,
+                    started_at=None):
+    """
+    执行一个分片中的用例
+
+    参数:
+        shard: plan_suite_shards 返回的某个分片
+        on_case_done: 每个用例完成后的回调 on_case_done(用例执行结果字典)，index 已换算为套件内的顺序
+        trace_id: 执行追踪ID，各分片的用例记录在同一次追踪中
+        started_at: 分片提交时间（ISO格式），套件时间预算从该时刻起算，包含分片排队等待的时间
+
+    返回:
+        执行结果列表（由 save_shard_results 保存）
+    """
+    # 各分片通常命中同一份缓存的执行计划；执行期间被修改或删除的套件用例不再执行
+    suite_case_map = {suite_case.id: suite_case for suite_case in suite_plan_cache.get_plan(test_suite).cases}
+    positions = [(index, suite_case_map[suite_case_id]) for index, suite_case_id in shard
+                 if suite_case_id in suite_case_map]
+    suite_cases = [suite_case for _, suite_case in positions]
+    test_cases = load_existing_case_ids(suite_cases)
+
+    execution_config = resolve_execution_config(test_suite.execution_config, overrides)
+    # 分片内共享变量的用例需按顺序执行，不再嵌套分片
+    execution_config['shards'] = 1
+    global_indexes = [index for index, _ in positions]
+    tracer = TraceRecorder(execution_config, trace_id)
+    # 各分片在自己的 worker 进程中预热
+    warmup = warm_up(environment, suite_cases, execution_config)
+    if warmup is not None:
+        tracer.event('warmup', shard_cases=len(suite_cases), **warmup)
+
+    def case_done(result_entry):
+        result_entry['index'] = global_indexes[result_entry['index'] - 1] + 1
+        tracer.case(result_entry)
+        if on_case_done:
+            on_case_done(result_entry)
+
+    elapsed = (timezone.now() - datetime.fromisoformat(started_at)).total_seconds() if started_at else 0
+    return run_suite_cases(
+        suite_cases, test_cases, execution_config, environment, case_done,
+        Deadline(execution_config.get('suite_timeout'), elapsed=elapsed)
+    )
+
+
+def shard_error_results(shard, error):
+    """分片整体执行失败时为其中每个用例生成错误结果，保证合并后的用例总数正确"""
+    suite_case_map = TestSuiteCase.objects.in_bulk([suite_case_id for _, suite_case_id in shard])
+    results = []
+    for index, suite_case_id in shard:
+        suite_case = suite_case_map.get(suite_case_id)
+        results.append({
+            'index': index + 1,
+            'case_id': suite_case.original_case_id if suite_case else None,
+            'title': f'用例 {suite_case.original_case_id}' if suite_case else '',
+            'status': 'ERROR',
+            'duration': 0,
+            'api_path': '',
+            'method': '',
+            'error': f'分片执行失败: {error}'
+        })
+    return results
+
+
+def save_shard_results(run_id, test_suite, shard_index, results):
+    """
+    保存分片的执行结果
+
+    返回:
+        分片摘要 {'shard_index', 'shard_result_id', 'total_cases', 'status', ...}（作为 Celery 任务结果传给合并任务）
+    """
+    shard_result, _ = TestSuiteShardResult.objects.update_or_create(
+        run_id=run_id, shard_index=shard_index,
+        defaults={'suite': test_suite, 'total_cases': len(results), 'result_data': pack_json(results)}
+    )
+    stats = summarize_case_results(results)
+    return {
+        'shard_index': shard_index,
+        'shard_result_id': shard_result.id,
+        'total_cases': stats['total_cases'],
+        'passed_cases': stats['passed_cases'],
+        'failed_cases': stats['failed_cases'],
+        'error_cases': stats['error_cases'],
+        'status': stats['status']
+    }
+
+
+def merge_shard_results(shard_summaries):
+    """
+    读取各分片保存的执行结果并合并，按用例在套件中的顺序排列
+
+    参数:
+        shard_summaries: 各分片任务返回的摘要：save_shard_results 的返回值，
+            或分片整体失败时直接携带错误结果的 {'shard_index', 'results': shard_error_results(...)}
+
+    异常:
+        ValueError: 分片结果记录不存在
+    """
+    shard_summaries = [summary for summary in shard_summaries if summary]
+    shard_result_ids = [summary['shard_result_id'] for summary in shard_summaries if 'shard_result_id' in summary]
+    shard_results = TestSuiteShardResult.objects.in_bulk(shard_result_ids)
+    missing = [shard_result_id for shard_result_id in shard_result_ids if shard_result_id not in shard_results]
+    if missing:
+        raise ValueError(f'分片执行结果不存在: {missing}')
+
+    execution_results = []
+    for summary in shard_summaries:
+        if 'shard_result_id' in summary:
+            execution_results.extend(unpack_json(shard_results[summary['shard_result_id']].result_data))
+        else:
+            execution_results.extend(summary.get('results') or [])
+    return sorted(execution_results, key=lambda entry: entry.get('index', 0))
+
+
+def delete_shard_results(run_id):
+    """合并完成后删除该次运行的分片记录"""
+    TestSuiteShardResult.objects.filter(run_id=run_id).delete()
@@ -0,0 +1,186 @@
+"""
+套件执行计划的编译与缓存
+
+套件执行前需要解析每个 TestSuiteCase.case_data、构建请求描述(CaseSpec)和变量依赖图。
+这里把这些工作编译为一个执行计划(SuitePlan)，按“套件ID + 用例最后更新时间 + 用例数”确定版本并缓存：
+- 进程内缓存：同一 worker 再次执行同一版本的套件时直接复用
+- Redis 缓存：其他 worker 命中时只需根据已解析的用例数据重建 CaseSpec，无需再读取和解析用例数据
+
+套件中的用例被修改、增加或删除后版本随之变化，旧版本的缓存自然失效。
+"""
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import redis
+from django.conf import settings
+from django.db.models import Count, Max
+
+from test_platform.models import TestSuiteCase
+from test_platform.execution.core import CaseSpec
+from test_platform.execution.dag import TEMPLATE_FIELDS, build_dependency_graph, collect_variable_refs
+from test_platform.execution.run_status import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+PLAN_CACHE_KEY = 'test_platform:suite_plan:{suite_id}:{version}'
+
+# 进程内最多缓存的执行计划数
+LOCAL_CACHE_SIZE = 64
+
+
+@dataclass
+class CompiledSuiteCase:
+    """编译后的套件用例，执行时代替 TestSuiteCase 使用"""
+    id: int
+    original_case_id: int
+    # 解析后的用例数据，解析失败时为None
+    case_data: Optional[dict]
+    spec: Optional[CaseSpec] = None
+    # 解析或构建请求描述失败时的错误信息
+    error: Optional[str] = None
+    # 请求中以 ${变量名} 引用的变量，用于判断执行前变量是否已提取
+    variable_refs: frozenset = field(default_factory=frozenset)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'original_case_id': self.original_case_id,
+            'case_data': self.case_data,
+            'error': self.error
+        }
+
+
+@dataclass
+class SuitePlan:
+    """套件执行计划：按执行顺序排列的编译后用例及其变量依赖图"""
+    suite_id: int
+    version: str
+    cases: list
+    dependencies: Any
+
+    def to_json(self):
+        return json.dumps({
+            'cases': [case.to_dict() for case in self.cases],
+            'dependencies': [sorted(deps) for deps in self.dependencies]
+        }, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, suite_id, version, raw):
+        data = json.loads(raw)
+        cases = [
+            build_compiled_case(item['id'], item['original_case_id'], item.get('case_data'), item.get('error'))
+            for item in data['cases']
+        ]
+        return cls(suite_id, version, cases, [set(deps) for deps in data['dependencies']])
+
+
+def _parse_json_field(value):
+    """把以JSON字符串保存的提取器等配置预先解析为对象，解析失败时保持原值"""
+    if isinstance(value, str) and value.strip():
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    return value
+
+
+def build_compiled_case(suite_case_id, original_case_id, case_data, error=None):
+    """根据已解析的用例数据构建 CaseSpec"""
+    spec = None
+    if error is None and isinstance(case_data, dict):
+        try:
+            spec = CaseSpec.from_suite_case_data(case_data, case_id=original_case_id)
+            spec.extractors = _parse_json_field(spec.extractors)
+        except Exception as e:
+            error = str(e)
+    elif error is None:
+        error = '用例数据格式错误'
+    variable_refs = set()
+    if isinstance(case_data, dict):
+        for field_name in TEMPLATE_FIELDS:
+            collect_variable_refs(case_data.get(field_name), variable_refs)
+    return CompiledSuiteCase(suite_case_id, original_case_id, case_data, spec, error, frozenset(variable_refs))
+
+
+def compile_suite_case(suite_case):
+    """编译单个 TestSuiteCase"""
+    try:
+        case_data = json.loads(suite_case.case_data)
+    except (TypeError, json.JSONDecodeError) as e:
+        return CompiledSuiteCase(suite_case.id, suite_case.original_case_id, None, error=f"JSON解析错误: {str(e)}")
+    return build_compiled_case(suite_case.id, suite_case.original_case_id, case_data)
+
+
+def compile_suite_plan(suite_id, version, suite_cases):
+    cases = [compile_suite_case(suite_case) for suite_case in suite_cases]
+    dependencies = build_dependency_graph([case.case_data or {} for case in cases])
+    return SuitePlan(suite_id, version, cases, dependencies)
+
+
+def get_suite_version(test_suite):
+    """套件用例的版本标识：最后更新时间和用例数，任一变化即视为新版本"""
+    stats = TestSuiteCase.objects.filter(suite=test_suite).aggregate(updated=Max('update_time'), count=Count('id'))
+    updated = stats['updated'].isoformat() if stats['updated'] else 'empty'
+    return f"{updated}:{stats['count']}"
+
+
+class SuitePlanCache:
+    """执行计划的两级缓存（进程内LRU + Redis）"""
+
+    def __init__(self, size=LOCAL_CACHE_SIZE):
+        self.size = size
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_local(self, key):
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+            return plan
+
+    def _put_local(self, key, plan):
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.size:
+                self._plans.popitem(last=False)
+
+    def get_plan(self, test_suite):
+        """获取套件当前版本的执行计划，缓存未命中时编译"""
+        suite_id = test_suite.suite_id
+        version = get_suite_version(test_suite)
+        key = PLAN_CACHE_KEY.format(suite_id=suite_id, version=version)
+
+        plan = self._get_local(key)
+        if plan is not None:
+            return plan
+
+        if settings.TEST_SUITE_PLAN_CACHE_ENABLED:
+            try:
+                raw = get_redis().get(key)
+                if raw:
+                    plan = SuitePlan.from_json(suite_id, version, raw)
+            except (redis.RedisError, ValueError, KeyError) as e:
+                logger.warning("读取套件执行计划缓存失败: suite_id=%s, 错误: %s", suite_id, e)
+
+        if plan is None:
+            suite_cases = TestSuiteCase.objects.filter(suite=test_suite).order_by('order')
+            plan = compile_suite_plan(suite_id, version, suite_cases)
+            if settings.TEST_SUITE_PLAN_CACHE_ENABLED:
+                try:
+                    get_redis().set(key, plan.to_json(), ex=settings.TEST_SUITE_PLAN_CACHE_TTL)
+                except redis.RedisError as e:
+                    logger.warning("写入套件执行计划缓存失败: suite_id=%s, 错误: %s", suite_id, e)
+
+        self._put_local(key, plan)
+        return plan
+
+
+# 进程级共享的执行计划缓存
+suite_plan_cache = SuitePlanCache()
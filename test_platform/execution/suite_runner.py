@@ -0,0 +1,744 @@
+"""
+测试套件执行
+
+负责解析套件的执行环境与执行配置、按串行或依赖图并行的方式执行用例、
+汇总统计并写入 TestSuiteResult / TestExecutionLog。
+接口视图(TestSuiteView)和测试计划任务(execute_test_plan)均直接调用 run_suite。
+执行后端(backend)可选 threads（线程池，默认）或 asyncio（单线程事件循环）。
+"""
+import asyncio
+import json
+import logging
+
+from django.utils import timezone
+
+from test_platform.models import TestCase, TestEnvironment, TestSuiteResult, TestSuiteCaseResult, TestExecutionLog
+from test_platform.execution.blob_store import pack_json
+from test_platform.execution.cassette import AsyncRecordingClient, RecordingClient, ReplayClient, open_cassette
+from test_platform.execution.config import resolve_execution_config
+from test_platform.execution.core import execute_case
+from test_platform.execution.dag import DependencyScheduler, build_dependency_graph
+from test_platform.execution.deadline import Deadline
+from test_platform.execution.history import schedule_priorities
+from test_platform.execution.http_pool import HttpClient
+from test_platform.execution.jsonpath_cache import cache_stats as jsonpath_cache_stats
+from test_platform.execution.progress import ProgressPublisher, suite_channel
+from test_platform.execution.retry import RetryBudget, RetryPolicy
+from test_platform.execution.suite_plan import suite_plan_cache
+from test_platform.execution.trace import TraceRecorder
+from test_platform.execution.warmup import warm_up
+from test_platform.execution.async_runner import (
+    AsyncDependencyScheduler, AsyncHttpClient, execute_case_async, is_available as is_async_available
+)
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_suite_environment(test_suite, environment_id=None):
+    """
+    确定套件的执行环境
+
+    参数:
+        test_suite: TestSuite对象
+        environment_id: 指定的环境ID（如测试计划中为套件配置的环境），优先使用
+
+    返回:
+        (TestEnvironment对象或None, 错误信息或None)
+    """
+    if environment_id:
+        environment = TestEnvironment.objects.filter(environment_id=environment_id).first()
+        if environment:
+            return environment, None
+
+    # 优先使用环境套关联的环境
+    if test_suite.environment_cover:
+        # 从环境套中获取第一个环境实例
+        environment = TestEnvironment.objects.filter(environment_cover=test_suite.environment_cover).first()
+        if not environment:
+            return None, f'环境套"{test_suite.environment_cover.environment_name}"下没有可用的环境配置，请先为该环境套添加环境'
+        return environment, None
+
+    # 如果没有环境套，回退到使用直接关联的环境
+    if test_suite.environment:
+        return test_suite.environment, None
+
+    return None, '测试套件未配置执行环境套或环境'
+
+
+def load_suite_cases(test_suite):
+    """
+    加载套件的执行计划（已编译的用例，优先取缓存）及仍然存在的原始用例ID，执行过程中不再逐个查询数据库
+
+    返回:
+        (按执行顺序排序的CompiledSuiteCase列表, 存在的原始用例ID集合)
+    """
+    suite_cases = list(suite_plan_cache.get_plan(test_suite).cases)
+    return suite_cases, load_existing_case_ids(suite_cases)
+
+
+def load_existing_case_ids(suite_cases):
+    """查询套件用例引用的原始用例中仍然存在的ID"""
+    return set(TestCase.objects.filter(
+        test_case_id__in={suite_case.original_case_id for suite_case in suite_cases}
+    ).values_list('test_case_id', flat=True))
+
+
+# 触发 stop_on_failure 的用例状态
+FAILURE_STATUSES = ('FAIL', 'ERROR', 'TIMEOUT')
+
+
+def suite_case_error_result(index, suite_case, case_data, error, status='ERROR'):
+    """构建用例执行异常（或被跳过，status为SKIP）时的结果记录"""
+    original_case_id = suite_case.original_case_id
+    case_data = case_data if isinstance(case_data, dict) else None
+    return {
+        'index': index + 1,
+        'case_id': original_case_id,
+        'title': case_data.get('title', '') if case_data else f'用例 {original_case_id}',
+        'status': status,
+        'duration': 0,
+        'api_path': case_data.get('api_path', '') if case_data else '',
+        'method': case_data.get('method', 'GET') if case_data else '',
+        'error': error
+    }
+
+
+class SkipPolicy:
+    """
+    按执行配置判断用例是否跳过
+
+    - stop_on_failure: 有用例失败后，之后开始执行的用例全部跳过（并行执行时已在执行中的用例不受影响）
+    - skip_missing_variables: 请求引用的 ${变量} 在执行前仍未提取到时跳过该用例
+    """
+
+    def __init__(self, execution_config):
+        self.stop_on_failure = bool(execution_config.get('stop_on_failure'))
+        self.skip_missing_variables = bool(execution_config.get('skip_missing_variables'))
+        # 触发停止的用例（原始用例ID）
+        self.failed_case_id = None
+        self.stopped = False
+
+    def skip_result(self, index, suite_case, context):
+        """需要跳过时返回状态为SKIP的结果记录，否则返回None"""
+        reason = None
+        if self.stopped:
+            reason = f'用例 ID={self.failed_case_id} 执行失败，已停止执行后续用例'
+        elif self.skip_missing_variables:
+            missing = sorted(suite_case.variable_refs - context.keys())
+            if missing:
+                reason = f"缺少变量: {', '.join(missing)}"
+        if reason is None:
+            return None
+        return suite_case_error_result(index, suite_case, suite_case.case_data, reason, status='SKIP')
+
+    def record(self, result_entry):
+        """记录用例执行结果，开启 stop_on_failure 时遇到第一个失败的用例即停止"""
+        if self.stop_on_failure and not self.stopped and result_entry.get('status') in FAILURE_STATUSES:
+            self.failed_case_id = result_entry.get('case_id')
+            self.stopped = True
+
+
+def prepare_suite_case(index, suite_case, total_cases, test_cases):
+    """
+    取出编译后的用例数据和用例描述，并检查原始用例是否存在
+
+    参数:
+        suite_case: CompiledSuiteCase 编译后的套件用例
+        test_cases: 存在的原始用例ID集合
+
+    返回:
+        (用例数据字典, CaseSpec, None) 或失败时 (用例数据字典或None, None, 错误结果字典)
+    """
+    original_case_id = suite_case.original_case_id
+    case_data = suite_case.case_data
+    if suite_case.error:
+        return case_data, None, suite_case_error_result(index, suite_case, case_data, suite_case.error)
+
+    # 原始用例已被删除时不再执行
+    if original_case_id not in test_cases:
+        return case_data, None, suite_case_error_result(
+            index, suite_case, case_data, f'找不到ID为{original_case_id}的测试用例'
+        )
+    return case_data, suite_case.spec, None
+
+
+def build_suite_case_entry(index, suite_case, case_data, spec, result, context):
+    """
+    根据用例执行结果构建套件结果中的单条记录
+
+    返回:
+        (用例执行结果字典, 本用例提取到的变量字典)
+    """
+    original_case_id = suite_case.original_case_id
+    new_vars = result.extracted_variables or {}
+
+    # 如果API返回了错误状态码(4xx或5xx)，优先使用API的错误信息
+    error_message = None
+    if result.status_code >= 400:
+        body = result.stored_body()
+        if isinstance(body, dict) and body:
+            error_message = json.dumps(body)
+        elif isinstance(body, str) and body:
+            error_message = body
+        elif result.raw_text:
+            error_message = result.stored_raw_text()
+    if not error_message:
+        error_message = result.error
+
+    # 记录实际发送的请求（变量替换后）
+    request_data = {
+        'case_id': original_case_id,
+        'api_path': result.request['url'],
+        'method': spec.method,
+        'headers': result.request['headers'],
+        'params': result.request['params'],
+        'body': result.request['body'],
+        'body_type': case_data.get('body_type', 'raw'),
+        'assertions': case_data.get('assertions', ''),
+        'tests': case_data.get('tests', []),
+        'extractors': case_data.get('extractors', []),
+        'context': dict(context)
+    }
+
+    return {
+        'index': index + 1,
+        'case_id': original_case_id,
+        'title': case_data.get('title', ''),
+        'status': result.status,
+        'duration': round(result.duration, 2),
+        'api_path': result.request['url'],
+        'method': case_data.get('method', 'GET'),
+        'request': request_data,
+        'response': result.response_dict() if result.error is None else {},
+        'response_headers': {},
+        'error': error_message,
+        'attempts': result.attempts,
+        'retries': result.retries,
+        'extractors': {
+            'extracted_variables': new_vars,
+            'context': {**context, **new_vars},
+            'error': result.extraction_error
+        }
+    }, new_vars
+
+
+def run_suite_case(index, suite_case, context, total_cases, test_cases, client=None, deadline=None,
+                   execution_config=None, retry_budget=None):
+    """
+    执行套件中的单个测试用例
+
+    参数:
+        index: 用例在套件中的下标
+        suite_case: CompiledSuiteCase 编译后的套件用例
+        context: 执行前的变量上下文（只读）
+        total_cases: 套件用例总数，仅用于日志
+        test_cases: 存在的原始用例ID集合
+        client: 执行环境对应的 HttpClient
+        deadline: 套件的执行截止时间，预算用尽后用例直接记为 TIMEOUT
+        execution_config: 执行配置，用于确定重试策略
+        retry_budget: 本次套件执行共享的重试预算
+
+    返回:
+        (用例执行结果字典, 本用例提取到的变量字典)
+    """
+    case_data, spec, error_entry = prepare_suite_case(index, suite_case, total_cases, test_cases)
+    if error_entry is not None:
+        return error_entry, {}
+
+    try:
+        result = execute_case(
+            spec, context, client=client, deadline=deadline,
+            retry_policy=RetryPolicy.from_config(execution_config or {}, spec.retry), retry_budget=retry_budget
+        )
+    except Exception as e:
+        return suite_case_error_result(index, suite_case, case_data, str(e)), {}
+    return build_suite_case_entry(index, suite_case, case_data, spec, result, context)
+
+
+def load_case_datas(suite_cases):
+    """取出全部用例数据，用于构建依赖图（解析失败的用例按空数据处理）"""
+    return [suite_case.case_data if isinstance(suite_case.case_data, dict) else {} for suite_case in suite_cases]
+
+
+def run_suite_cases_async(suite_cases, test_cases, execution_config, environment=None, on_case_done=None,
+                          deadline=None, cassette=None):
+    """
+    使用 asyncio 后端执行全部用例
+
+    串行模式下每个用例依赖前一个用例，并行模式下按变量依赖图调度；
+    数据库相关的准备工作在进入事件循环前完成，事件循环内只发送请求和处理响应。
+    cassette 为录制模式的 Cassette 时录制每次请求的响应。
+    """
+    total_cases = len(suite_cases)
+    prepared = [
+        prepare_suite_case(index, suite_case, total_cases, test_cases)
+        for index, suite_case in enumerate(suite_cases)
+    ]
+
+    priorities = None
+    if execution_config.get('mode') == 'parallel':
+        dependencies = build_dependency_graph(load_case_datas(suite_cases))
+        priorities = schedule_priorities(suite_cases, dependencies, execution_config)
+    else:
+        dependencies = [{index - 1} if index > 0 else set() for index in range(total_cases)]
+
+    context = {}
+    results_by_index = {}
+    retry_budget = RetryBudget(execution_config.get('retry_budget'))
+    skip_policy = SkipPolicy(execution_config)
+
+    async def run_all():
+        async with AsyncHttpClient(environment, execution_config) as http_client:
+            client = AsyncRecordingClient(http_client, cassette) if cassette is not None else http_client
+
+            async def run_one(index, context_snapshot):
+                skip_entry = skip_policy.skip_result(index, suite_cases[index], context_snapshot)
+                if skip_entry is not None:
+                    return skip_entry, {}
+                case_data, spec, error_entry = prepared[index]
+                if error_entry is not None:
+                    return error_entry, {}
+                result = await execute_case_async(
+                    spec, context_snapshot, client, deadline,
+                    RetryPolicy.from_config(execution_config, spec.retry), retry_budget
+                )
+                return build_suite_case_entry(
+                    index, suite_cases[index], case_data, spec, result, context_snapshot
+                )
+
+            def make_task(index):
+                # 依赖完成后固定上下文快照
+                return run_one(index, dict(context))
+
+            def on_complete(index, outcome, error):
+                if error is not None:
+                    outcome = (suite_case_error_result(index, suite_cases[index], prepared[index][0], str(error)), {})
+                result_entry, new_vars = outcome
+                results_by_index[index] = result_entry
+                context.update(new_vars)
+                skip_policy.record(result_entry)
+                if on_case_done:
+                    on_case_done(result_entry)
+
+            await AsyncDependencyScheduler(dependencies, priorities).run(make_task, on_complete)
+
+    asyncio.run(run_all())
+    return [results_by_index[index] for index in range(total_cases)]
+
+
+def run_suite_cases(suite_cases, test_cases, execution_config, environment=None, on_case_done=None,
+                    deadline=None, cassette=None):
+    """
+    按执行配置执行全部用例
+
+    参数:
+        suite_cases: CompiledSuiteCase列表（已按执行顺序排序）
+        test_cases: 存在的原始用例ID集合
+        execution_config: 执行配置字典
+        environment: 执行环境，所有用例共用该环境的连接池和超时设置
+        on_case_done: 每个用例完成后的回调 on_case_done(用例执行结果字典)，用于上报进度
+        deadline: 执行截止时间，预算用尽后剩余用例不再发送请求
+        cassette: 录制或回放的 Cassette（见 open_cassette），回放时不访问网络
+
+    返回:
+        按用例顺序排列的执行结果列表
+    """
+    total_cases = len(suite_cases)
+    replay = cassette is not None and cassette.mode == 'replay'
+
+    # 回放不发送网络请求，始终使用线程执行
+    if execution_config.get('backend') == 'asyncio' and not replay:
+        if is_async_available():
+            return run_suite_cases_async(
+                suite_cases, test_cases, execution_config, environment, on_case_done, deadline, cassette
+            )
+        logger.warning("未安装httpx，asyncio执行后端不可用，改用线程执行")
+
+    if replay:
+        client = ReplayClient(cassette, environment, execution_config.get('case_timeout'))
+    else:
+        # 同一环境复用连接池，超时取自执行配置的case_timeout或环境配置
+        client = HttpClient(environment, execution_config.get('case_timeout'))
+        if cassette is not None:
+            client = RecordingClient(client, cassette)
+    # 套件内全部用例共享重试预算
+    retry_budget = RetryBudget(execution_config.get('retry_budget'))
+    # 初始化变量上下文
+    context = {}
+    skip_policy = SkipPolicy(execution_config)
+
+    if execution_config.get('mode') == 'parallel' and total_cases > 1:
+        # 并行执行：根据提取器产出和${变量}引用构建依赖图，互不依赖的用例并发执行
+        dependencies = build_dependency_graph(load_case_datas(suite_cases))
+        scheduler = DependencyScheduler(
+            dependencies,
+            max_workers=execution_config.get('max_workers'),
+            priorities=schedule_priorities(suite_cases, dependencies, execution_config)
+        )
+        results_by_index = {}
+
+        def make_task(index):
+            # 分发时固定上下文快照，此时该用例依赖的变量均已写入上下文
+            context_snapshot = dict(context)
+            skip_entry = skip_policy.skip_result(index, suite_cases[index], context_snapshot)
+            if skip_entry is not None:
+                return lambda: (skip_entry, {})
+            return lambda: run_suite_case(
+                index, suite_cases[index], context_snapshot, total_cases, test_cases, client, deadline,
+                execution_config, retry_budget
+            )
+
+        def on_complete(index, outcome, error):
+            if error is not None:
+                outcome = (suite_case_error_result(index, suite_cases[index], None, str(error)), {})
+            result_entry, new_vars = outcome
+            results_by_index[index] = result_entry
+            context.update(new_vars)
+            skip_policy.record(result_entry)
+            if on_case_done:
+                on_case_done(result_entry)
+
+        scheduler.run(make_task, on_complete)
+        return [results_by_index[index] for index in range(total_cases)]
+
+    # 依次执行每个测试用例
+    execution_results = []
+    for index, suite_case in enumerate(suite_cases):
+        skip_entry = skip_policy.skip_result(index, suite_case, context)
+        if skip_entry is not None:
+            result_entry, new_vars = skip_entry, {}
+        else:
+            result_entry, new_vars = run_suite_case(
+                index, suite_case, context, total_cases, test_cases, client, deadline,
+                execution_config, retry_budget
+            )
+        execution_results.append(result_entry)
+        context.update(new_vars)
+        skip_policy.record(result_entry)
+        if on_case_done:
+            on_case_done(result_entry)
+    return execution_results
+
+
+def save_case_results(suite_result, execution_results):
+    """将每个用例的执行结果批量写入 TestSuiteCaseResult"""
+    rows = []
+    for position, item in enumerate(execution_results):
+        response = item.get('response') or {}
+        rows.append(TestSuiteCaseResult(
+            suite_result=suite_result,
+            suite_id=suite_result.suite_id,
+            case_id=item.get('case_id') or 0,
+            case_index=item.get('index', position + 1),
+            title=(item.get('title') or '')[:255],
+            method=(item.get('method') or '')[:20],
+            status=item.get('status', 'ERROR'),
+            duration=item.get('duration') or 0,
+            status_code=response.get('status_code') if isinstance(response, dict) else None,
+            error=item.get('error'),
+            attempts=item.get('attempts') or 1,
+            execution_time=suite_result.execution_time
+        ))
+    TestSuiteCaseResult.objects.bulk_create(rows, batch_size=500)
+
+
+def run_suite(test_suite, environment, user=None, overrides=None, on_case_done=None, publisher=None,
+              deadline=None, case_indexes=None, rerun_of=None, trace_id=None):
+    """
+    执行测试套件并保存执行结果
+
+    参数:
+        test_suite: TestSuite对象
+        environment: 执行环境 TestEnvironment 对象
+        user: 执行者
+        overrides: 本次执行的配置覆盖项，如 {'mode': 'parallel', 'max_workers': 16}
+        on_case_done: 每个用例完成后的回调 on_case_done(用例执行结果字典)
+        publisher: 上层（测试计划、异步执行）的进度发布器，进度事件会同时发布到其频道
+        deadline: 上层（测试计划）的执行截止时间，与套件自身的 suite_timeout 取较早者
+        case_indexes: 只执行套件中这些下标的用例（按原始顺序），结果中的 index 仍为在套件中的顺序
+        rerun_of: 重跑失败用例时被重跑的 TestSuiteResult，新结果会关联到它
+        trace_id: 执行追踪ID（异步执行时为 run_id），为空时自动生成
+
+    返回:
+        执行结果摘要字典（包含 result_id、trace_id）
+
+    异常:
+        ValueError: 套件中没有测试用例
+    """
+    root_publisher = publisher or ProgressPublisher()
+    suite_publisher = root_publisher.child([suite_channel(test_suite.suite_id)], suite_id=test_suite.suite_id)
+    try:
+        return _run_suite(
+            test_suite, environment, user, overrides, on_case_done, suite_publisher, deadline, case_indexes, rerun_of,
+            trace_id
+        )
+    except Exception as e:
+        suite_publisher.publish('suite_failed', error=str(e))
+        raise
+    finally:
+        if publisher is None:
+            root_publisher.close()
+
+
+def _run_suite(test_suite, environment, user, overrides, on_case_done, publisher, deadline, case_indexes=None,
+               rerun_of=None, trace_id=None):
+    """执行测试套件并保存执行结果（参数见 run_suite）"""
+    # 获取套件中的所有测试用例（按顺序排序）及其原始用例
+    suite_cases, test_cases = load_suite_cases(test_suite)
+    global_indexes = None
+    if case_indexes is not None:
+        global_indexes = sorted(index for index in set(case_indexes) if 0 <= index < len(suite_cases))
+        suite_cases = [suite_cases[index] for index in global_indexes]
+    if not suite_cases:
+        raise ValueError('测试套件中没有测试用例')
+
+    execution_config = resolve_execution_config(test_suite.execution_config, overrides)
+    cassette = open_cassette(test_suite.suite_id, execution_config)
+    total_cases = len(suite_cases)
+    publisher.publish('suite_started', suite_name=test_suite.name, total_cases=total_cases)
+    tracer = TraceRecorder(execution_config, trace_id)
+    tracer.event('suite_started', suite_id=test_suite.suite_id, suite_name=test_suite.name, total_cases=total_cases,
+                 mode=execution_config.get('mode'), backend=execution_config.get('backend'))
+
+    completed = [0]
+
+    def case_done(result_entry):
+        # 在调度线程中按完成顺序调用，无需加锁
+        if global_indexes is not None:
+            result_entry['index'] = global_indexes[result_entry['index'] - 1] + 1
+        tracer.case(result_entry)
+        completed[0] += 1
+        publisher.publish(
+            'case_completed',
+            index=result_entry.get('index'),
+            case_id=result_entry.get('case_id'),
+            title=result_entry.get('title'),
+            status=result_entry.get('status'),
+            duration=result_entry.get('duration'),
+            completed_cases=completed[0],
+            total_cases=total_cases
+        )
+        if on_case_done:
+            on_case_done(result_entry)
+
+    # 预热目标主机的DNS和连接，耗时单独记录，不计入套件执行时长
+    warmup = warm_up(environment, suite_cases, execution_config)
+    if warmup is not None:
+        publisher.publish('suite_warmup', duration=warmup['duration'], hosts=len(warmup['hosts']))
+        tracer.event('warmup', **warmup)
+
+    # 记录开始时间，套件的时间预算从此刻开始计算
+    suite_start_time = timezone.now()
+    suite_deadline = Deadline(execution_config.get('suite_timeout'), parent=deadline)
+    execution_results = run_suite_cases(
+        suite_cases, test_cases, execution_config, environment, case_done, suite_deadline, cassette
+    )
+    if cassette is not None and cassette.mode == 'record':
+        try:
+            # 只执行了部分用例时与已有录制合并
+            cassette.save(merge=case_indexes is not None)
+        except OSError as e:
+            logger.warning("保存测试套件 %s 的录制文件失败: %s", test_suite.suite_id, e)
+    summary = save_suite_run(
+        test_suite, environment, user, execution_results, suite_start_time, publisher, rerun_of, tracer.trace_id,
+        warmup, cassette.summary() if cassette is not None else None
+    )
+    tracer.event('suite_completed', result_id=summary['result_id'], status=summary['status'],
+                 duration=summary['duration'], pass_rate=summary['pass_rate'], jsonpath_cache=jsonpath_cache_stats())
+    return summary
+
+
+def summarize_case_results(execution_results):
+    """
+    统计用例执行结果并确定套件整体状态
+
+    返回:
+        包含 total_cases、passed_cases、failed_cases、error_cases、skipped_cases、timeout_cases、pass_rate、status 的字典
+    """
+    total_cases = len(execution_results)
+    passed_cases = sum(1 for item in execution_results if item['status'] == 'PASS')
+    failed_cases = sum(1 for item in execution_results if item['status'] == 'FAIL')
+    skipped_cases = sum(1 for item in execution_results if item['status'] == 'SKIP')
+    # 超时的用例计入错误数，另外单独统计
+    timeout_cases = sum(1 for item in execution_results if item['status'] == 'TIMEOUT')
+    error_cases = total_cases - passed_cases - failed_cases - skipped_cases
+
+    if failed_cases > 0 or error_cases > 0:
+        status = 'fail'
+    elif skipped_cases == total_cases:
+        status = 'skip'
+    elif passed_cases == total_cases:
+        status = 'pass'
+    else:
+        status = 'partial'
+
+    return {
+        'total_cases': total_cases,
+        'passed_cases': passed_cases,
+        'failed_cases': failed_cases,
+        'error_cases': error_cases,
+        'skipped_cases': skipped_cases,
+        'timeout_cases': timeout_cases,
+        'pass_rate': round(passed_cases / total_cases * 100, 2) if total_cases > 0 else 0,
+        'status': status
+    }
+
+
+def save_suite_run(test_suite, environment, user, execution_results, suite_start_time, publisher, rerun_of=None,
+                   trace_id=None, warmup=None, cassette=None):
+    """
+    汇总用例执行结果并保存 TestSuiteResult / TestSuiteCaseResult / TestExecutionLog，发布套件完成事件
+
+    参数:
+        execution_results: 按用例顺序排列的执行结果列表（分片执行时为合并后的结果）
+        suite_start_time: 套件开始执行的时间，用于计算总耗时
+        rerun_of: 重跑失败用例时被重跑的 TestSuiteResult
+        trace_id: 本次执行的追踪ID，保存在结果数据中
+        warmup: 执行前的预热报告（见 warm_up），不计入总耗时
+        cassette: 录制或回放的信息（见 Cassette.summary）
+
+    返回:
+        执行结果摘要字典（包含 result_id）
+    """
+    # 统计结果
+    stats = summarize_case_results(execution_results)
+    total_cases = stats['total_cases']
+    passed_cases = stats['passed_cases']
+    failed_cases = stats['failed_cases']
+    error_cases = stats['error_cases']
+    skipped_cases = stats['skipped_cases']
+    timeout_cases = stats['timeout_cases']
+    pass_rate = stats['pass_rate']
+    suite_status = stats['status']
+    # 发生过重试的用例数和总重试次数
+    retried_cases = sum(1 for item in execution_results if (item.get('attempts') or 1) > 1)
+    retry_count = sum((item.get('attempts') or 1) - 1 for item in execution_results)
+
+    # 计算总耗时
+    suite_end_time = timezone.now()
+    total_duration_seconds = (suite_end_time - suite_start_time).total_seconds()
+
+    # 更新测试套件状态
+    test_suite.last_executed_at = suite_start_time
+    test_suite.last_execution_status = suite_status
+    test_suite.save()
+
+    # 准备结果数据
+    result_data = {
+        'execution_time': suite_start_time.strftime('%Y-%m-%d %H:%M:%S'),
+        'duration': round(total_duration_seconds, 2),
+        'total_cases': total_cases,
+        'passed_cases': passed_cases,
+        'failed_cases': failed_cases,
+        'error_cases': error_cases,
+        'skipped_cases': skipped_cases,
+        'timeout_cases': timeout_cases,
+        'retried_cases': retried_cases,
+        'retry_count': retry_count,
+        'pass_rate': pass_rate,
+        'rerun_of': rerun_of.result_id if rerun_of else None,
+        'trace_id': trace_id,
+        'warmup': warmup,
+        'cassette': cassette,
+        'results': execution_results
+    }
+
+    # 创建测试套件执行结果记录
+    suite_result = TestSuiteResult.objects.create(
+        suite=test_suite,
+        execution_time=suite_start_time,
+        status=suite_status,
+        duration=total_duration_seconds,
+        total_cases=total_cases,
+        passed_cases=passed_cases,
+        failed_cases=failed_cases,
+        error_cases=error_cases,
+        skipped_cases=skipped_cases,
+        pass_rate=pass_rate,
+        # 较大的响应体存入内容寻址存储，结果数据中只保留引用
+        result_data=pack_json(result_data),
+        environment=environment,
+        creator=user if getattr(user, 'is_authenticated', False) else None,
+        rerun_of=rerun_of
+    )
+    save_case_results(suite_result, execution_results)
+
+    # 创建一条总的执行日志记录
+    try:
+        # 构建请求和响应的汇总信息
+        summary_request = {
+            'total_cases': total_cases,
+            'execution_info': f"测试套件 '{test_suite.name}' 共执行了 {total_cases} 个测试用例"
+        }
+
+        summary_response = {
+            'passed': passed_cases,
+            'failed': failed_cases,
+            'error': error_cases,
+            'skipped': skipped_cases,
+            'timeout': timeout_cases,
+            'pass_rate': f"{pass_rate}%"
+        }
+
+        log = TestExecutionLog.objects.create(
+            suite=test_suite,
+            suite_result=suite_result,
+            status=suite_status,
+            duration=total_duration_seconds,
+            executor=None,  # 避免AnonymousUser的问题
+            request_url=f"测试套件执行: {test_suite.name}",
+            request_method="SUITE",
+            request_headers=json.dumps(summary_request),
+            request_body=json.dumps({'suite_id': test_suite.suite_id}),
+            response_status_code=200,
+            response_headers=json.dumps(summary_response),
+            response_body=pack_json(execution_results),
+            log_detail=f"测试套件 {test_suite.name} 执行完成，共 {total_cases} 个用例，通过 {passed_cases} 个，失败 {failed_cases} 个，错误 {error_cases} 个，跳过 {skipped_cases} 个",
+            error_message="" if suite_status in ['pass', 'partial'] else f"测试套件执行失败，通过率: {pass_rate}%",
+            environment=environment
+        )
+        logger.debug("已创建测试套件执行总日志: ID=%s", log.log_id)
+    except Exception:
+        logger.exception("创建测试套件执行总日志失败: suite_id=%s", test_suite.suite_id)
+
+    # 查询所有尚未关联到suite_result的执行日志并更新
+    TestExecutionLog.objects.filter(
+        suite=test_suite,
+        suite_result__isnull=True,
+        execution_time__gte=suite_start_time
+    ).update(suite_result=suite_result)
+
+    publisher.publish(
+        'suite_completed',
+        result_id=suite_result.result_id,
+        status=suite_status,
+        duration=round(total_duration_seconds, 2),
+        total_cases=total_cases,
+        passed_cases=passed_cases,
+        failed_cases=failed_cases,
+        error_cases=error_cases,
+        skipped_cases=skipped_cases,
+        timeout_cases=timeout_cases,
+        pass_rate=pass_rate
+    )
+
+    return {
+        'result_id': suite_result.result_id,
+        'suite_id': test_suite.suite_id,
+        'name': test_suite.name,
+        'status': suite_status,
+        'execution_time': suite_start_time.strftime('%Y-%m-%d %H:%M:%S'),
+        'duration': round(total_duration_seconds, 2),
+        'total_cases': total_cases,
+        'passed_cases': passed_cases,
+        'failed_cases': failed_cases,
+        'error_cases': error_cases,
+        'skipped_cases': skipped_cases,
+        'timeout_cases': timeout_cases,
+        'retried_cases': retried_cases,
+        'retry_count': retry_count,
+        'pass_rate': pass_rate,
+        'trace_id': trace_id,
+        'warmup_duration': warmup['duration'] if warmup else 0,
+        'results': execution_results
+    }
@@ -0,0 +1,88 @@
+"""
+请求模板的 ${变量名} 替换
+
+每个字符串模板只在第一次使用时切分为“文本片段 / 变量名”交替的序列，编译结果按模板文本缓存，
+之后每次渲染只需一次拼接，不再对每个变量做一遍 str.replace。
+上下文中不存在的变量保持 ${变量名} 原样，与原先的替换规则一致。
+
+preserve_types 为True时，整个值恰好是一个 ${变量名} 且变量存在时直接返回变量的原始值，
+数字、布尔、null、对象和数组在JSON请求体中保持原类型；否则变量值按 str() 拼接进字符串。
+"""
+import re
+from functools import lru_cache
+
+
+VARIABLE_PATTERN = re.compile(r'\${([^}]+)}')
+
+# 缓存的编译模板数量
+TEMPLATE_CACHE_SIZE = 4096
+
+
+class CompiledTemplate:
+    """
+    编译后的字符串模板
+
+    parts 为文本片段与变量名交替的元组：偶数位置是文本片段，奇数位置是变量名，长度始终为奇数。
+    """
+
+    __slots__ = ('source', 'parts', 'names', 'single')
+
+    def __init__(self, source):
+        self.source = source
+        parts = VARIABLE_PATTERN.split(source)
+        self.parts = tuple(parts)
+        self.names = tuple(parts[1::2])
+        # 整个模板恰好是一个占位符时记录其变量名
+        self.single = parts[1] if len(parts) == 3 and not parts[0] and not parts[2] else None
+
+    def render(self, context, preserve_types=False):
+        if not self.names:
+            return self.source
+        if self.single is not None and preserve_types and self.single in context:
+            return context[self.single]
+        pieces = list(self.parts)
+        for position in range(1, len(pieces), 2):
+            name = pieces[position]
+            pieces[position] = str(context[name]) if name in context else f'${{{name}}}'
+        return ''.join(pieces)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(source):
+    """编译字符串模板（带缓存）"""
+    return CompiledTemplate(source)
+
+
+def render(data, context, preserve_types=False):
+    """
+    递归替换数据(字典、列表、字符串)中的 ${变量名}，返回新数据，不修改原数据；字典的键不做替换
+
+    参数:
+        preserve_types: 值恰好是一个占位符时是否保留变量的原始类型
+    """
+    if isinstance(data, str):
+        # 不含占位符的字符串不进入缓存
+        if '${' not in data:
+            return data
+        return compile_template(data).render(context, preserve_types)
+    if isinstance(data, dict):
+        return {key: render(value, context, preserve_types) for key, value in data.items()}
+    if isinstance(data, list):
+        return [render(item, context, preserve_types) for item in data]
+    return data
+
+
+def template_variables(data, refs=None):
+    """递归收集数据中引用的变量名（与 render 的替换范围一致）"""
+    if refs is None:
+        refs = set()
+    if isinstance(data, str):
+        if '${' in data:
+            refs.update(compile_template(data).names)
+    elif isinstance(data, dict):
+        for value in data.values():
+            template_variables(value, refs)
+    elif isinstance(data, list):
+        for item in data:
+            template_variables(item, refs)
+    return refs
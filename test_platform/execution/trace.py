@@ -0,0 +1,222 @@
+"""
+执行追踪
+
+替代执行路径中逐个用例 print 请求、响应和变量上下文的调试输出：
+- 级别(trace_level): off 不记录 / summary 只记录用例状态、耗时、URL等摘要 / full 同时记录请求、响应和变量上下文
+- 采样: summary 级别下按 trace_sample_rate 随机记录完整信息；
+  trace_full_on_failure 开启时失败的用例始终记录完整信息
+- 追踪事件经 logging 的 QueueHandler 放入内存队列，由后台线程(QueueListener)写入 Redis，
+  执行线程不做任何 I/O；队列已满时直接丢弃事件，不阻塞执行
+- 每次执行对应一个 trace_id（异步执行时即 run_id），通过 /api/trace/<trace_id> 查询
+
+追踪级别和采样率来自执行配置，存储相关的配置（事件上限、过期时间、队列长度）来自 settings.TEST_EXECUTION_TRACE。
+"""
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+
+import redis
+from django.conf import settings
+
+from test_platform.execution.run_status import get_redis
+
+
+TRACE_KEY = 'test_platform:trace:{trace_id}'
+
+TRACE_LEVELS = ('off', 'summary', 'full')
+
+# 失败的用例状态，开启 trace_full_on_failure 时记录完整信息
+TRACE_FAILURE_STATUSES = ('FAIL', 'ERROR', 'TIMEOUT')
+
+# 摘要级别记录的用例字段
+SUMMARY_FIELDS = ('index', 'case_id', 'title', 'method', 'api_path', 'status', 'duration', 'attempts')
+# 完整级别额外记录的用例字段
+FULL_FIELDS = ('request', 'response', 'retries', 'extractors')
+
+# 摘要中错误信息的最大长度（4xx响应的错误信息可能是整个响应体）
+SUMMARY_ERROR_LENGTH = 500
+
+DEFAULT_TRACE_STORE = {
+    # 单次执行最多保存的事件数，超出后丢弃之后的事件
+    'max_events': 5000,
+    # 追踪数据的保存时间（秒）
+    'ttl': 86400,
+    # 内存队列长度
+    'queue_size': 10000,
+}
+
+trace_logger = logging.getLogger('test_platform.trace')
+
+_listener = None
+_listener_pid = None
+_listener_lock = threading.Lock()
+
+
+def get_trace_store_config():
+    config = dict(DEFAULT_TRACE_STORE)
+    config.update(getattr(settings, 'TEST_EXECUTION_TRACE', {}) or {})
+    return config
+
+
+class DroppingQueueHandler(QueueHandler):
+    """队列已满时丢弃事件；事件数据保存在 record.trace 中，入队前不做格式化"""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+    def prepare(self, record):
+        return record
+
+
+class RedisTraceHandler(logging.Handler):
+    """在后台线程中把追踪事件追加到 Redis 列表"""
+
+    def __init__(self, config):
+        super().__init__()
+        self.max_events = int(config['max_events'])
+        self.ttl = int(config['ttl'])
+
+    def emit(self, record):
+        event = getattr(record, 'trace', None)
+        if not event:
+            return
+        key = TRACE_KEY.format(trace_id=event['trace_id'])
+        try:
+            pipe = get_redis().pipeline()
+            pipe.rpush(key, json.dumps(event, ensure_ascii=False, default=str))
+            pipe.ltrim(key, 0, self.max_events - 1)
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+        except (redis.RedisError, TypeError, ValueError):
+            # 追踪只是尽力而为，写入失败不影响执行
+            pass
+
+
+def _ensure_listener():
+    """在当前进程中启动后台写入线程（Celery prefork 子进程中会重新启动）"""
+    global _listener, _listener_pid
+    if _listener is not None and _listener_pid == os.getpid():
+        return
+    with _listener_lock:
+        if _listener is not None and _listener_pid == os.getpid():
+            return
+        for handler in list(trace_logger.handlers):
+            if isinstance(handler, DroppingQueueHandler):
+                trace_logger.removeHandler(handler)
+        config = get_trace_store_config()
+        event_queue = queue.Queue(maxsize=int(config['queue_size']))
+        trace_logger.addHandler(DroppingQueueHandler(event_queue))
+        trace_logger.setLevel(logging.INFO)
+        trace_logger.propagate = False
+        _listener = QueueListener(event_queue, RedisTraceHandler(config))
+        _listener.start()
+        _listener_pid = os.getpid()
+        atexit.register(_listener.stop)
+
+
+class TraceRecorder:
+    """
+    一次执行（套件执行或单用例执行）的追踪记录器，可在多个线程中使用
+
+    参数:
+        execution_config: 执行配置，提供 trace_level / trace_sample_rate / trace_full_on_failure
+        trace_id: 追踪ID，为空时自动生成
+    """
+
+    def __init__(self, execution_config=None, trace_id=None):
+        config = execution_config or {}
+        level = config.get('trace_level') or 'summary'
+        self.level = level if level in TRACE_LEVELS else 'summary'
+        try:
+            self.sample_rate = float(config.get('trace_sample_rate') or 0)
+        except (TypeError, ValueError):
+            self.sample_rate = 0.0
+        self.full_on_failure = bool(config.get('trace_full_on_failure', True))
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self._sequence = itertools.count(1)
+
+    @property
+    def enabled(self):
+        return self.level != 'off'
+
+    def event(self, name, **data):
+        """记录一个执行事件（如套件开始、结束）"""
+        if self.enabled:
+            self._emit({'event': name, **data})
+
+    def case(self, entry):
+        """
+        记录一个用例的执行结果
+
+        参数:
+            entry: 与套件结果中的用例记录结构相同的字典
+        """
+        if not self.enabled:
+            return
+        data = {field: entry.get(field) for field in SUMMARY_FIELDS if field in entry}
+        error = entry.get('error')
+        if error:
+            data['error'] = str(error)[:SUMMARY_ERROR_LENGTH]
+
+        failed = entry.get('status') in TRACE_FAILURE_STATUSES
+        if self.level == 'full' or (failed and self.full_on_failure) or \
+                (self.sample_rate and random.random() < self.sample_rate):
+            data.update({field: entry[field] for field in FULL_FIELDS if field in entry})
+            data['error'] = error
+            data['full'] = True
+        self._emit({'event': 'case', **data})
+
+    def _emit(self, data):
+        _ensure_listener()
+        data.update(trace_id=self.trace_id, seq=next(self._sequence), ts=round(time.time(), 3))
+        trace_logger.info(data['event'], extra={'trace': data})
+
+
+def result_trace_entry(spec, result, title='', context=None):
+    """把单用例执行结果(CaseResult)转换为用例记录结构，供 TraceRecorder.case 使用"""
+    return {
+        'case_id': spec.case_id,
+        'title': title,
+        'method': spec.method,
+        'api_path': result.request.get('url', spec.url) if result.request else spec.url,
+        'status': result.status,
+        'duration': round(result.duration, 3),
+        'attempts': result.attempts,
+        'error': result.error or result.failure_message or result.extraction_error,
+        'request': {**(result.request or {}), 'context': dict(context or {})},
+        'response': result.response_dict() if result.error is None else {},
+        'retries': result.retries,
+        'extractors': {
+            'extracted_variables': result.extracted_variables,
+            'error': result.extraction_error
+        }
+    }
+
+
+def get_trace(trace_id, offset=0, limit=None):
+    """
+    读取一次执行的追踪事件
+
+    返回:
+        按记录顺序排列的事件列表，追踪不存在或已过期时返回空列表
+    """
+    end = -1 if limit is None else offset + limit - 1
+    raw_events = get_redis().lrange(TRACE_KEY.format(trace_id=trace_id), offset, end)
+    events = []
+    for raw in raw_events:
+        try:
+            events.append(json.loads(raw))
+        except (TypeError, ValueError):
+            continue
+    return events
@@ -0,0 +1,187 @@
+"""
+执行前的连接预热
+
+套件开始执行前，对执行环境和用例请求中出现的目标主机：
+- 解析并缓存DNS：被预热过的主机名此后的解析结果在进程内缓存 dns_cache_ttl 秒，
+  线程池后端(requests)和 asyncio 后端(httpx)的解析都会命中缓存
+- 在环境的连接池中预先建立若干个连接（含TLS握手），第一个用例不再承担建连耗时
+
+预热耗时单独记录在套件结果的 warmup 中，不计入用例耗时和套件执行时长。
+预热失败只记录错误，不影响执行。asyncio 后端的连接由 httpx 在首次请求时建立，只预热DNS；
+关闭长连接(keep_alive)时同样只预热DNS。
+"""
+import ipaddress
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.util.connection import allowed_gai_family
+
+from test_platform.execution.http_pool import (
+    environment_base_url, get_environment_timeout, get_pool_config, session_pool
+)
+
+
+# 单次预热最多处理的目标主机数
+MAX_WARMUP_ORIGINS = 10
+
+# 并发建立连接的最大线程数
+MAX_CONNECT_WORKERS = 8
+
+
+class DnsCache:
+    """
+    进程内的DNS缓存
+
+    只缓存预热过的主机名：替换 socket.getaddrinfo，对其他主机（如数据库、Redis）直接调用原函数。
+    """
+
+    def __init__(self):
+        self._hosts = set()
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._original = None
+
+    def install(self):
+        with self._lock:
+            if self._original is None:
+                self._original = socket.getaddrinfo
+                socket.getaddrinfo = self._getaddrinfo
+
+    def _getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        name = host.lower() if isinstance(host, str) else None
+        if name not in self._hosts:
+            return self._original(host, port, family, type, proto, flags)
+        key = (name, port, family, type, proto, flags)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        result = self._original(host, port, family, type, proto, flags)
+        self._entries[key] = (now + float(get_pool_config()['dns_cache_ttl']), result)
+        return result
+
+    def resolve(self, host, port):
+        """登记主机名并按 urllib3 建立连接时的参数解析，返回解析到的地址列表"""
+        self.install()
+        self._hosts.add(host.lower())
+        infos = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+        return sorted({info[4][0] for info in infos})
+
+
+# 进程级共享的DNS缓存
+dns_cache = DnsCache()
+
+
+def _is_ip_address(host):
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+def collect_origins(environment, suite_cases):
+    """收集需要预热的目标地址：执行环境的基础地址和用例中的绝对URL（主机部分不含变量）"""
+    candidates = [environment_base_url(environment)]
+    for suite_case in suite_cases:
+        case_data = suite_case.case_data if isinstance(suite_case.case_data, dict) else {}
+        candidates.append(case_data.get('api_path'))
+
+    origins = []
+    for url in candidates:
+        if not isinstance(url, str) or not url.startswith(('http://', 'https://')):
+            continue
+        parts = urlsplit(url)
+        if not parts.hostname or '${' in parts.netloc:
+            continue
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if origin not in origins:
+            origins.append(origin)
+        if len(origins) >= MAX_WARMUP_ORIGINS:
+            break
+    return origins
+
+
+def _connection_pool(session, url):
+    """取得 requests 发送到该地址时实际使用的 urllib3 连接池"""
+    adapter = session.get_adapter(url)
+    if hasattr(adapter, 'get_connection_with_tls_context'):
+        return adapter.get_connection_with_tls_context(requests.Request('GET', url).prepare(), session.verify)
+    return adapter.get_connection(url)
+
+
+def open_connections(session, origin, count, timeout):
+    """在连接池中预先建立 count 个连接，返回新建立的连接数"""
+    pool = _connection_pool(session, origin)
+    connections = [pool._get_conn(timeout=timeout) for _ in range(count)]
+    idle = [conn for conn in connections if conn.sock is None]
+    try:
+        for conn in idle:
+            conn.timeout = timeout
+        with ThreadPoolExecutor(max_workers=min(MAX_CONNECT_WORKERS, len(idle) or 1)) as executor:
+            list(executor.map(lambda conn: conn.connect(), idle))
+    finally:
+        for conn in connections:
+            pool._put_conn(conn)
+    return len(idle)
+
+
+def warmup_connection_count(execution_config):
+    """每个目标地址预先建立的连接数：未配置时串行执行为1，线程池并行执行为工作线程数，不超过连接池大小"""
+    count = execution_config.get('warmup_connections')
+    if count is None:
+        count = execution_config.get('max_workers') if execution_config.get('mode') == 'parallel' else 1
+    try:
+        count = int(count or 0)
+    except (TypeError, ValueError):
+        count = 1
+    return max(0, min(count, int(get_pool_config()['pool_maxsize'])))
+
+
+def warm_up(environment, suite_cases, execution_config):
+    """
+    预热执行环境和用例中的目标地址
+
+    返回:
+        预热报告 {'duration': 总耗时(秒), 'hosts': [{origin, addresses, dns_time, connect_time, connections, error}]}，
+        未开启 warmup 时返回None
+    """
+    # 回放录制时不访问网络
+    if not execution_config.get('warmup') or execution_config.get('cassette') == 'replay':
+        return None
+
+    start = time.perf_counter()
+    connect_timeout = get_environment_timeout(environment)[0]
+    # asyncio 后端使用 httpx 的连接池；不保持长连接时预先建立的连接在第一个请求后即关闭
+    pool_connections = execution_config.get('backend') != 'asyncio' and get_pool_config()['keep_alive']
+    connection_count = warmup_connection_count(execution_config) if pool_connections else 0
+    session = session_pool.get_session(environment) if connection_count else None
+
+    hosts = []
+    for origin in collect_origins(environment, suite_cases):
+        parts = urlsplit(origin)
+        report = {'origin': origin, 'addresses': [], 'dns_time': 0, 'connect_time': 0, 'connections': 0,
+                  'error': None}
+        try:
+            step = time.perf_counter()
+            if _is_ip_address(parts.hostname):
+                report['addresses'] = [parts.hostname]
+            else:
+                report['addresses'] = dns_cache.resolve(
+                    parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80)
+                )
+            report['dns_time'] = round(time.perf_counter() - step, 4)
+
+            if connection_count:
+                step = time.perf_counter()
+                report['connections'] = open_connections(session, origin, connection_count, connect_timeout)
+                report['connect_time'] = round(time.perf_counter() - step, 4)
+        except Exception as e:
+            report['error'] = str(e)
+        hosts.append(report)
+
+    return {'duration': round(time.perf_counter() - start, 4), 'hosts': hosts}
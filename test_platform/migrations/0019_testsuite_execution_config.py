@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_platform', '0018_testmindmap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testsuite',
+            name='execution_config',
+            field=models.TextField(blank=True, help_text='JSON格式的执行配置，如执行模式、并发数等', null=True, verbose_name='执行配置'),
+        ),
+    ]
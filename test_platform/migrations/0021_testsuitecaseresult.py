@@ -0,0 +1,37 @@
+# Generated by Django 4.2.20 on 2026-10-17 10:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_platform', '0020_testplan_execution_config'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestSuiteCaseResult',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('case_id', models.IntegerField(verbose_name='原始用例ID')),
+                ('case_index', models.IntegerField(default=0, verbose_name='执行顺序')),
+                ('title', models.CharField(blank=True, default='', max_length=255, verbose_name='用例标题')),
+                ('method', models.CharField(blank=True, default='', max_length=20, verbose_name='请求方法')),
+                ('status', models.CharField(choices=[('PASS', '通过'), ('FAIL', '失败'), ('ERROR', '错误'), ('SKIP', '跳过')], max_length=20, verbose_name='执行状态')),
+                ('duration', models.FloatField(default=0, help_text='单位：秒', verbose_name='执行时长')),
+                ('status_code', models.IntegerField(blank=True, null=True, verbose_name='响应状态码')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='错误信息')),
+                ('execution_time', models.DateTimeField(help_text='所属套件的开始执行时间', verbose_name='执行时间')),
+                ('suite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='case_results', to='test_platform.testsuite', verbose_name='测试套件')),
+                ('suite_result', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='case_results', to='test_platform.testsuiteresult', verbose_name='套件执行结果')),
+            ],
+            options={
+                'verbose_name': '用例执行结果',
+                'verbose_name_plural': '用例执行结果',
+                'ordering': ['suite_result', 'case_index'],
+                'indexes': [models.Index(fields=['case_id', 'execution_time'], name='case_result_case_time_idx'), models.Index(fields=['suite', 'execution_time'], name='case_result_suite_time_idx'), models.Index(fields=['status', 'execution_time'], name='case_result_status_time_idx')],
+            },
+        ),
+    ]
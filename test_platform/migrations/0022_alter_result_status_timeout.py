@@ -0,0 +1,23 @@
+# Generated by Django 4.2.20 on 2026-10-17 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_platform', '0021_testsuitecaseresult'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='testresult',
+            name='status',
+            field=models.CharField(choices=[('PASS', '通过'), ('FAIL', '失败'), ('ERROR', '错误'), ('SKIP', '跳过'), ('TIMEOUT', '超时')], max_length=20, verbose_name='执行状态'),
+        ),
+        migrations.AlterField(
+            model_name='testsuitecaseresult',
+            name='status',
+            field=models.CharField(choices=[('PASS', '通过'), ('FAIL', '失败'), ('ERROR', '错误'), ('SKIP', '跳过'), ('TIMEOUT', '超时')], max_length=20, verbose_name='执行状态'),
+        ),
+    ]
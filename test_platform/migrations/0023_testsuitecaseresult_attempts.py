@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-17 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_platform', '0022_alter_result_status_timeout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testsuitecaseresult',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=1, help_text='大于1表示发生过重试', verbose_name='尝试次数'),
+        ),
+    ]
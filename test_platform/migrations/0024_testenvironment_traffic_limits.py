@@ -0,0 +1,23 @@
+# Generated by Django 4.2.20 on 2026-10-17 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_platform', '0023_testsuitecaseresult_attempts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testenvironment',
+            name='max_concurrency',
+            field=models.IntegerField(blank=True, null=True, verbose_name='最大并发请求数'),
+        ),
+        migrations.AddField(
+            model_name='testenvironment',
+            name='rate_limit',
+            field=models.FloatField(blank=True, null=True, verbose_name='每秒请求数上限'),
+        ),
+    ]
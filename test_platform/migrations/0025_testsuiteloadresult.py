@@ -0,0 +1,42 @@
+# Generated by Django 4.2.20 on 2026-10-17 13:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('test_platform', '0024_testenvironment_traffic_limits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestSuiteLoadResult',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('running', '执行中'), ('completed', '已完成'), ('failed', '失败')], default='running', max_length=20, verbose_name='执行状态')),
+                ('iterations', models.IntegerField(default=1, verbose_name='迭代次数')),
+                ('concurrency', models.IntegerField(default=1, verbose_name='并发数')),
+                ('ramp_up', models.FloatField(default=0, help_text='单位：秒', verbose_name='加压时间')),
+                ('execution_time', models.DateTimeField(verbose_name='开始时间')),
+                ('duration', models.FloatField(default=0, help_text='单位：秒', verbose_name='执行时长')),
+                ('total_requests', models.IntegerField(default=0, verbose_name='请求总数')),
+                ('error_requests', models.IntegerField(default=0, verbose_name='失败请求数')),
+                ('throughput', models.FloatField(default=0, help_text='单位：请求/秒', verbose_name='吞吐量')),
+                ('result_data', models.TextField(blank=True, default='', help_text='JSON格式的各用例延迟统计', verbose_name='结果数据')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='错误信息')),
+                ('create_time', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('creator', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='load_results', to=settings.AUTH_USER_MODEL, verbose_name='执行者')),
+                ('environment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='load_results', to='test_platform.testenvironment', verbose_name='执行环境')),
+                ('suite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='load_results', to='test_platform.testsuite', verbose_name='测试套件')),
+            ],
+            options={
+                'verbose_name': '压测结果',
+                'verbose_name_plural': '压测结果',
+                'ordering': ['-execution_time'],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.20 on 2026-10-17 15:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_platform', '0025_testsuiteloadresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testsuiteresult',
+            name='rerun_of',
+            field=models.ForeignKey(blank=True, help_text='失败用例重跑时指向被重跑的执行结果', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reruns', to='test_platform.testsuiteresult', verbose_name='重跑来源'),
+        ),
+    ]
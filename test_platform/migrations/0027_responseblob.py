@@ -0,0 +1,26 @@
+# Generated by Django 4.2.20 on 2026-10-17 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_platform', '0026_testsuiteresult_rerun_of'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResponseBlob',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='内容摘要')),
+                ('size', models.IntegerField(default=0, help_text='单位：字节', verbose_name='原始大小')),
+                ('data', models.BinaryField(verbose_name='压缩内容')),
+                ('create_time', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+            ],
+            options={
+                'verbose_name': '响应体存储',
+                'verbose_name_plural': '响应体存储',
+            },
+        ),
+    ]
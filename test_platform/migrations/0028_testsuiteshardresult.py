@@ -0,0 +1,31 @@
+# Generated by Django 4.2.20 on 2026-10-17 18:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_platform', '0027_responseblob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestSuiteShardResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.CharField(db_index=True, max_length=64, verbose_name='运行ID')),
+                ('shard_index', models.IntegerField(verbose_name='分片序号')),
+                ('total_cases', models.IntegerField(default=0, verbose_name='用例总数')),
+                ('result_data', models.TextField(help_text='JSON格式的分片用例执行结果列表', verbose_name='结果数据')),
+                ('create_time', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('suite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shard_results', to='test_platform.testsuite', verbose_name='测试套件')),
+            ],
+            options={
+                'verbose_name': '分片执行结果',
+                'verbose_name_plural': '分片执行结果',
+                'unique_together': {('run_id', 'shard_index')},
+            },
+        ),
+    ]
@@ -68,6 +68,9 @@ class TestEnvironment(models.Model):
     db_user = models.CharField(max_length=50, verbose_name='用户名')
     db_password = models.CharField(max_length=50, verbose_name='密码')
     time_out = models.IntegerField(verbose_name='超时时间')
+    # 测试流量限制，对该环境下的目标主机生效，为空表示不限制
+    max_concurrency = models.IntegerField(verbose_name='最大并发请求数', null=True, blank=True)
+    rate_limit = models.FloatField(verbose_name='每秒请求数上限', null=True, blank=True)
     description = models.TextField(verbose_name='环境描述')
     content_type = models.CharField(max_length=50, verbose_name='内容类型')
     charset = models.CharField(max_length=50, verbose_name='字符集')
@@ -103,7 +106,8 @@ class TestResult(models.Model):
         ('PASS', '通过'),
         ('FAIL', '失败'),
         ('ERROR', '错误'),
-        ('SKIP', '跳过')
+        ('SKIP', '跳过'),
+        ('TIMEOUT', '超时')
     ])
     result_data = models.TextField(verbose_name='结果数据')
     create_time = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
@@ -133,6 +137,8 @@ class TestSuite(models.Model):
     update_time = models.DateTimeField(auto_now=True, verbose_name='更新时间')
     last_executed_at = models.DateTimeField(null=True, blank=True, verbose_name='最后执行时间')
     last_execution_status = models.CharField(max_length=20, default='not_run', verbose_name='最后执行状态')
+    execution_config = models.TextField(null=True, blank=True, verbose_name='执行配置',
+                                        help_text='JSON格式的执行配置，如执行模式、并发数等')
 
     def __str__(self):
         return self.name
@@ -182,6 +188,8 @@ class TestSuiteResult(models.Model):
                                    related_name='suite_results', verbose_name='执行环境')
     creator = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='suite_results',
                                verbose_name='执行者')
+    rerun_of = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='reruns',
+                                 verbose_name='重跑来源', help_text='失败用例重跑时指向被重跑的执行结果')
     create_time = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
     update_time = models.DateTimeField(auto_now=True, verbose_name='更新时间')
 
@@ -189,6 +197,110 @@ class TestSuiteResult(models.Model):
         return f"{self.suite.name} - {self.execution_time}"
 
 
+class TestSuiteCaseResult(models.Model):
+    """测试套件执行中单个用例的结果，按用例维度统计时直接查询本表而无需解析result_data"""
+    id = models.AutoField(primary_key=True)
+    suite_result = models.ForeignKey(TestSuiteResult, on_delete=models.CASCADE, related_name='case_results',
+                                     verbose_name='套件执行结果')
+    suite = models.ForeignKey(TestSuite, on_delete=models.CASCADE, related_name='case_results', verbose_name='测试套件')
+    case_id = models.IntegerField(verbose_name='原始用例ID')
+    case_index = models.IntegerField(verbose_name='执行顺序', default=0)
+    title = models.CharField(max_length=255, verbose_name='用例标题', blank=True, default='')
+    method = models.CharField(max_length=20, verbose_name='请求方法', blank=True, default='')
+    status = models.CharField(max_length=20, verbose_name='执行状态', choices=[
+        ('PASS', '通过'),
+        ('FAIL', '失败'),
+        ('ERROR', '错误'),
+        ('SKIP', '跳过'),
+        ('TIMEOUT', '超时')
+    ])
+    duration = models.FloatField(verbose_name='执行时长', help_text='单位：秒', default=0)
+    status_code = models.IntegerField(verbose_name='响应状态码', null=True, blank=True)
+    error = models.TextField(verbose_name='错误信息', null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(verbose_name='尝试次数', help_text='大于1表示发生过重试', default=1)
+    execution_time = models.DateTimeField(verbose_name='执行时间', help_text='所属套件的开始执行时间')
+
+    class Meta:
+        verbose_name = '用例执行结果'
+        verbose_name_plural = '用例执行结果'
+        ordering = ['suite_result', 'case_index']
+        indexes = [
+            models.Index(fields=['case_id', 'execution_time'], name='case_result_case_time_idx'),
+            models.Index(fields=['suite', 'execution_time'], name='case_result_suite_time_idx'),
+            models.Index(fields=['status', 'execution_time'], name='case_result_status_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title or self.case_id} - {self.status}"
+
+
+class TestSuiteLoadResult(models.Model):
+    """测试套件压测结果，每次压测一条记录，延迟分布以直方图形式保存在result_data中"""
+    id = models.AutoField(primary_key=True)
+    suite = models.ForeignKey(TestSuite, on_delete=models.CASCADE, related_name='load_results', verbose_name='测试套件')
+    environment = models.ForeignKey(TestEnvironment, on_delete=models.SET_NULL, null=True, blank=True,
+                                    related_name='load_results', verbose_name='执行环境')
+    status = models.CharField(max_length=20, verbose_name='执行状态', default='running', choices=[
+        ('running', '执行中'),
+        ('completed', '已完成'),
+        ('failed', '失败')
+    ])
+    iterations = models.IntegerField(verbose_name='迭代次数', default=1)
+    concurrency = models.IntegerField(verbose_name='并发数', default=1)
+    ramp_up = models.FloatField(verbose_name='加压时间', help_text='单位：秒', default=0)
+    execution_time = models.DateTimeField(verbose_name='开始时间')
+    duration = models.FloatField(verbose_name='执行时长', help_text='单位：秒', default=0)
+    total_requests = models.IntegerField(verbose_name='请求总数', default=0)
+    error_requests = models.IntegerField(verbose_name='失败请求数', default=0)
+    throughput = models.FloatField(verbose_name='吞吐量', help_text='单位：请求/秒', default=0)
+    result_data = models.TextField(verbose_name='结果数据', help_text='JSON格式的各用例延迟统计', blank=True, default='')
+    error = models.TextField(verbose_name='错误信息', null=True, blank=True)
+    creator = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='load_results',
+                                verbose_name='执行者')
+    create_time = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+
+    class Meta:
+        verbose_name = '压测结果'
+        verbose_name_plural = '压测结果'
+        ordering = ['-execution_time']
+
+    def __str__(self):
+        return f"{self.suite.name} - 压测 - {self.execution_time}"
+
+
+class TestSuiteShardResult(models.Model):
+    """分片执行的中间结果，全部分片完成并合并为 TestSuiteResult 后删除"""
+    run_id = models.CharField(max_length=64, db_index=True, verbose_name='运行ID')
+    suite = models.ForeignKey(TestSuite, on_delete=models.CASCADE, related_name='shard_results', verbose_name='测试套件')
+    shard_index = models.IntegerField(verbose_name='分片序号')
+    total_cases = models.IntegerField(verbose_name='用例总数', default=0)
+    result_data = models.TextField(verbose_name='结果数据', help_text='JSON格式的分片用例执行结果列表')
+    create_time = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+
+    class Meta:
+        verbose_name = '分片执行结果'
+        verbose_name_plural = '分片执行结果'
+        unique_together = ('run_id', 'shard_index')
+
+    def __str__(self):
+        return f"{self.run_id} - 分片 {self.shard_index}"
+
+
+class ResponseBlob(models.Model):
+    """按内容摘要去重存储的响应体（zlib压缩），执行结果和日志中只保存摘要引用"""
+    sha256 = models.CharField(max_length=64, primary_key=True, verbose_name='内容摘要')
+    size = models.IntegerField(verbose_name='原始大小', help_text='单位：字节', default=0)
+    data = models.BinaryField(verbose_name='压缩内容')
+    create_time = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+
+    class Meta:
+        verbose_name = '响应体存储'
+        verbose_name_plural = '响应体存储'
+
+    def __str__(self):
+        return self.sha256
+
+
 class TestExecutionLog(models.Model):
     """测试执行日志模型，记录详细的执行过程"""
     log_id = models.AutoField(primary_key=True, verbose_name='日志ID')
@@ -275,6 +387,10 @@ class TestPlan(models.Model):
     ]
     notify_types = models.CharField(max_length=255, null=True, blank=True, verbose_name='通知类型')
     
+    # 执行配置，覆盖计划内各套件的执行配置
+    execution_config = models.TextField(null=True, blank=True, verbose_name='执行配置',
+                                        help_text='JSON格式的执行配置，如执行后端、执行模式、并发数等')
+    
     # 执行状态
     status = models.CharField(max_length=20, default='pending', verbose_name='执行状态',
                              choices=[
@@ -1,6 +1,10 @@
+import logging
+
 from rest_framework import serializers
 from .models import TestCase
 
+logger = logging.getLogger(__name__)
+
 
 class TestCaseSerializer(serializers.ModelSerializer):
     project_id = serializers.IntegerField(required=True)
@@ -27,14 +31,14 @@ class TestCaseSerializer(serializers.ModelSerializer):
 
     def to_internal_value(self, data):
         """数据转换前的处理"""
-        print("转换前的数据:", data)
+        logger.debug("转换前的数据: %s", data)
         ret = super().to_internal_value(data)
-        print("转换后的数据:", ret)
+        logger.debug("转换后的数据: %s", ret)
         return ret
 
     def validate(self, attrs):
         """整体验证"""
-        print("验证前的数据:", attrs)
+        logger.debug("验证前的数据: %s", attrs)
 
         # 验证 project_id
         if 'project_id' not in attrs:
@@ -52,7 +56,7 @@ class TestCaseSerializer(serializers.ModelSerializer):
         if 'case_status' not in attrs:
             attrs['case_status'] = '0'
 
-        print("验证后的数据:", attrs)
+        logger.debug("验证后的数据: %s", attrs)
         return attrs
 
     def validate_case_request_method(self, value):
@@ -64,7 +68,7 @@ class TestCaseSerializer(serializers.ModelSerializer):
 
     def validate_case_priority(self, value):
         """验证优先级"""
-        print("序列化器接收到的优先级值:", value)
+        logger.debug("序列化器接收到的优先级值: %s", value)
 
         priority_map = {
             '高': '1',
@@ -116,11 +120,11 @@ class TestCaseSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """创建实例"""
-        print("创建前的数据:", validated_data)
+        logger.debug("创建前的数据: %s", validated_data)
 
         if 'project_id' not in validated_data:
             raise serializers.ValidationError({"project_id": "This field is required."})
 
         instance = super().create(validated_data)
-        print("创建后的实例:", instance.__dict__)
+        logger.debug("创建后的实例: %s", instance.__dict__)
         return instance
@@ -9,6 +9,7 @@ import logging
 from django.urls import reverse
 from django.test import RequestFactory
 from test_platform.views.report_view import TestReportView
+from test_platform.execution.blob_store import pack_json
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -16,6 +17,9 @@ logger = logging.getLogger(__name__)
 @shared_task
 def execute_test_plan(plan_id):
     """执行指定的测试计划"""
+    # 执行进度发布到计划频道，计划内各套件的进度也会转发到该频道
+    from test_platform.execution.progress import ProgressPublisher, plan_channel
+    publisher = ProgressPublisher([plan_channel(plan_id)], plan_id=plan_id)
     try:
         # 导入需要的模型和视图（放在函数内部避免循环导入）
         from test_platform.models import TestPlan, TestPlanSuite, TestPlanResult, TestSuiteResult, TestExecutionLog
@@ -28,9 +32,13 @@ def execute_test_plan(plan_id):
         plan.save()
         
         # 获取测试计划中的所有测试套件
-        plan_suites = TestPlanSuite.objects.filter(plan=plan).order_by('order')
+        plan_suites = TestPlanSuite.objects.filter(plan=plan).select_related(
+            'suite', 'suite__environment', 'suite__environment_cover', 'environment'
+        ).order_by('order')
         total_suites = plan_suites.count()
         
+        publisher.publish('plan_started', plan_name=plan.name, total_suites=total_suites)
+        
         # 检查是否有测试套件需要执行
         logger.info(f"找到 {total_suites} 个测试套件需要执行")
         if total_suites == 0:
@@ -80,7 +88,7 @@ def execute_test_plan(plan_id):
                 error_cases=0,
                 skipped_cases=0,
                 pass_rate=0,
-                result_data=json.dumps(result_info),
+                result_data=pack_json(result_info),
                 executor=plan.creator
             )
             
@@ -90,6 +98,7 @@ def execute_test_plan(plan_id):
             plan.save()
             
             logger.info(f"测试计划执行完成(无测试套件): {plan.name} (ID: {plan.plan_id})")
+            publisher.publish('plan_completed', result_id=plan_result.result_id, status=status, total_suites=0)
             
             return {
                 'success': True,
@@ -101,35 +110,48 @@ def execute_test_plan(plan_id):
         
         start_time = timezone.now()
         
+        # 计划的执行时间预算，用尽后剩余套件中的用例直接记为超时
+        from test_platform.execution.config import resolve_execution_config
+        from test_platform.execution.deadline import Deadline
+        plan_config = resolve_execution_config(plan.execution_config)
+        plan_deadline = Deadline(plan_config.get('plan_timeout'))
+        # 有套件未通过后是否跳过剩余套件
+        stop_plan_on_failure = bool(plan_config.get('stop_plan_on_failure'))
+        
         # 初始化结果统计
         passed_suites = 0
         failed_suites = 0
         error_suites = 0
+        skipped_suites = 0
         total_cases = 0
         passed_cases = 0
         failed_cases = 0
         error_cases = 0
         skipped_cases = 0
+        # 各套件执行前的连接预热耗时
+        warmup_duration = 0.0
         
         # 用于存储详细执行结果
         execution_results = []
         
         # 依次执行测试套件
         for plan_suite in plan_suites:
+            if stop_plan_on_failure and (failed_suites or error_suites):
+                logger.info(f"已有测试套件未通过，跳过测试套件: {plan_suite.suite.name} (ID: {plan_suite.suite.suite_id})")
+                skipped_suites += 1
+                execution_results.append({
+                    'suite_id': plan_suite.suite.suite_id,
+                    'suite_name': plan_suite.suite.name,
+                    'status': 'skip',
+                    'note': '已有测试套件未通过，按 stop_plan_on_failure 配置跳过'
+                })
+                continue
+
             try:
                 logger.info(f"开始执行测试套件: {plan_suite.suite.name} (ID: {plan_suite.suite.suite_id})")
                 
-                # 调用测试套件执行方法
-                from test_platform.views.test_case_view import TestSuiteView
-                suite_view = TestSuiteView()
-                
-                # 创建模拟请求
-                class MockRequest:
-                    def __init__(self, user):
-                        self.user = user
-                        self.data = {}
-                
-                mock_request = MockRequest(plan.creator)
+                # 直接调用套件执行核心
+                from test_platform.execution.suite_runner import resolve_suite_environment, run_suite
                 suite_id = plan_suite.suite.suite_id
                 
                 # 确定环境
@@ -137,15 +159,20 @@ def execute_test_plan(plan_id):
                 if plan_suite.environment:
                     env_id = plan_suite.environment.environment_id
                     logger.info(f"使用环境 ID: {env_id} 执行测试套件")
+                environment, env_error = resolve_suite_environment(plan_suite.suite, env_id)
+                if env_error:
+                    publisher.publish('suite_failed', suite_id=suite_id, error=env_error)
+                    raise ValueError(env_error)
                 
                 # 执行测试套件
-                logger.info(f"调用 execute_suite 方法执行测试套件 {suite_id}")
-                suite_result = suite_view.execute_suite(mock_request, suite_id, environment_id=env_id)
-                
-                # 解析套件执行结果
-                suite_result_data = json.loads(suite_result.content)
-                result_id = suite_result_data.get('data', {}).get('result_id')
-                suite_status = suite_result_data.get('data', {}).get('status', '').lower()
+                logger.info(f"调用 run_suite 执行测试套件 {suite_id}")
+                suite_run = run_suite(
+                    plan_suite.suite, environment, user=plan.creator, overrides=plan.execution_config,
+                    publisher=publisher, deadline=plan_deadline
+                )
+                result_id = suite_run.get('result_id')
+                suite_status = suite_run.get('status', '').lower()
+                warmup_duration += suite_run.get('warmup_duration', 0)
                 
                 logger.info(f"测试套件执行完成: ID={suite_id}, 结果ID={result_id}, 状态={suite_status}")
                 
@@ -156,8 +183,11 @@ def execute_test_plan(plan_id):
                     logger.info(f"成功获取测试套件结果: ID={result_id}, 状态={suite_result_obj.status}")
                     
                     # 更新统计数据
-                    if suite_result_obj.status == 'pass':
+                    # 部分通过（其余用例被跳过，没有失败）计为通过，全部跳过计为跳过
+                    if suite_result_obj.status in ('pass', 'partial'):
                         passed_suites += 1
+                    elif suite_result_obj.status == 'skip':
+                        skipped_suites += 1
                     elif suite_result_obj.status == 'fail':
                         failed_suites += 1
                     else:
@@ -321,8 +351,10 @@ def execute_test_plan(plan_id):
                 except Exception as e:
                     logger.warning(f"获取套件结果详情失败: {str(e)}")
                     # 如果找不到结果记录，根据返回状态统计
-                    if suite_status == 'pass':
+                    if suite_status in ('pass', 'partial'):
                         passed_suites += 1
+                    elif suite_status == 'skip':
+                        skipped_suites += 1
                     elif suite_status == 'fail':
                         failed_suites += 1
                     else:
@@ -353,7 +385,7 @@ def execute_test_plan(plan_id):
                     'suite_name': plan_suite.suite.name,
                     'result_id': result_id,
                     'status': suite_status,
-                        'duration': suite_result_data.get('data', {}).get('duration', 0),
+                        'duration': suite_run.get('duration', 0),
                         'note': '无法获取详细结果信息',
                         'execution_logs': log_entries  # 添加执行日志记录
                     }
@@ -423,12 +455,14 @@ def execute_test_plan(plan_id):
                 'passed_suites': passed_suites,
                 'failed_suites': failed_suites,
                 'error_suites': error_suites,
+                'skipped_suites': skipped_suites,
                 'total_cases': total_cases,
                 'passed_cases': passed_cases,
                 'failed_cases': failed_cases,
                 'error_cases': error_cases,
                 'skipped_cases': skipped_cases,
-                'pass_rate': pass_rate
+                'pass_rate': pass_rate,
+                'warmup_duration': round(warmup_duration, 4)
             },
             'suite_results': execution_results
         }
@@ -459,7 +493,7 @@ def execute_test_plan(plan_id):
             error_cases=error_cases,
             skipped_cases=skipped_cases,
             pass_rate=pass_rate,
-            result_data=json.dumps(result_info),
+            result_data=pack_json(result_info),
             executor=plan.creator
         )
         
@@ -478,6 +512,17 @@ def execute_test_plan(plan_id):
         plan.save()
         
         logger.info(f"测试计划执行完成: {plan.name} (ID: {plan.plan_id}), 状态: {status}")
+        publisher.publish(
+            'plan_completed',
+            result_id=plan_result.result_id,
+            status=status,
+            duration=duration,
+            total_suites=total_suites,
+            passed_suites=passed_suites,
+            failed_suites=failed_suites,
+            error_suites=error_suites,
+            pass_rate=pass_rate
+        )
         
         # 处理通知
         if plan.notify_types:
@@ -500,11 +545,14 @@ def execute_test_plan(plan_id):
         except Exception:
             pass
         
+        publisher.publish('plan_completed', status='error', error=str(e))
         return {
             'success': False,
             'error': str(e),
             'plan_id': plan_id
         }
+    finally:
+        publisher.close()
 
 def schedule_type_requires_reset(schedule_type):
     """判断计划类型是否需要重置状态"""
@@ -673,4 +721,209 @@ def reset_stalled_plans():
             status='error',
             error_message='测试计划执行超时',
             executor=plan.creator
-        ) 
\ No newline at end of file
+        ) 
+
+@shared_task(bind=True)
+def execute_suite_async(self, run_id, suite_id, environment_id=None, user_id=None, overrides=None):
+    """
+    异步执行测试套件
+
+    与同步执行接口的语义一致（环境解析、执行配置覆盖、结果记录），
+    运行状态和进度写入 Redis，通过 run_id 查询。
+    """
+    from django.contrib.auth.models import User
+    from test_platform.models import TestSuite
+    from test_platform.execution import run_status
+    from test_platform.execution.config import resolve_execution_config
+    from test_platform.execution.progress import ProgressPublisher, run_channel
+    from test_platform.execution.sharding import get_shard_count
+    from test_platform.execution.suite_runner import resolve_suite_environment, run_suite
+
+    run_status.mark_running(run_id, self.request.id)
+    publisher = ProgressPublisher([run_channel(run_id)], run_id=run_id)
+    try:
+        test_suite = TestSuite.objects.get(suite_id=suite_id)
+        environment, env_error = resolve_suite_environment(test_suite, environment_id)
+        if env_error:
+            run_status.mark_failed(run_id, env_error)
+            publisher.publish('suite_failed', suite_id=suite_id, error=env_error)
+            return {'run_id': run_id, 'status': 'failed', 'error': env_error}
+
+        shard_count = get_shard_count(resolve_execution_config(test_suite.execution_config, overrides))
+        if shard_count > 1:
+            return dispatch_suite_shards(run_id, test_suite, environment, user_id, overrides, shard_count, publisher)
+
+        user = User.objects.filter(id=user_id).first() if user_id else None
+        logger.info(f"异步执行测试套件: suite_id={suite_id}, run_id={run_id}")
+        run_data = run_suite(
+            test_suite,
+            environment,
+            user=user,
+            overrides=overrides,
+            on_case_done=lambda entry: run_status.record_case_done(run_id, entry.get('status')),
+            publisher=publisher,
+            trace_id=run_id
+        )
+        run_status.mark_completed(run_id, run_data)
+        return {'run_id': run_id, 'status': 'completed', 'result_id': run_data['result_id']}
+    except Exception as e:
+        logger.error(f"异步执行测试套件失败: suite_id={suite_id}, run_id={run_id}, 错误: {str(e)}")
+        run_status.mark_failed(run_id, str(e))
+        if isinstance(e, TestSuite.DoesNotExist):
+            publisher.publish('suite_failed', suite_id=suite_id, error=str(e))
+        return {'run_id': run_id, 'status': 'failed', 'error': str(e)}
+    finally:
+        publisher.close()
+
+
+@shared_task(bind=True)
+def execute_suite_matrix(self, run_id, suite_id, environment_ids, user_id=None, overrides=None):
+    """在多个环境上同时执行测试套件，运行状态中记录各环境的执行结果ID"""
+    from django.contrib.auth.models import User
+    from test_platform.models import TestSuite
+    from test_platform.execution import run_status
+    from test_platform.execution.matrix import load_matrix_environments, run_suite_matrix
+
+    run_status.mark_running(run_id, self.request.id)
+    try:
+        test_suite = TestSuite.objects.get(suite_id=suite_id)
+        environments, env_error = load_matrix_environments(environment_ids)
+        if env_error:
+            raise ValueError(env_error)
+        user = User.objects.filter(id=user_id).first() if user_id else None
+        logger.info(f"多环境执行测试套件: suite_id={suite_id}, run_id={run_id}, 环境数={len(environments)}")
+        matrix = run_suite_matrix(
+            test_suite, environments, user=user, overrides=overrides,
+            on_case_done=lambda entry: run_status.record_case_done(run_id, entry.get('status'))
+        )
+        run_status.mark_matrix_completed(run_id, matrix)
+        return {'run_id': run_id, 'status': 'completed',
+                'result_ids': [run['result_id'] for run in matrix['environments'] if run.get('result_id')]}
+    except Exception as e:
+        logger.error(f"多环境执行测试套件失败: suite_id={suite_id}, run_id={run_id}, 错误: {str(e)}")
+        run_status.mark_failed(run_id, str(e))
+        return {'run_id': run_id, 'status': 'failed', 'error': str(e)}
+
+
+def dispatch_suite_shards(run_id, test_suite, environment, user_id, overrides, shard_count, publisher):
+    """把套件拆分为多个分片并以 chord 提交，全部分片完成后由 merge_suite_shards 合并结果"""
+    from celery import chord
+    from test_platform.execution.sharding import plan_suite_shards
+
+    shards = plan_suite_shards(test_suite, shard_count, overrides)
+    if not shards:
+        raise ValueError('测试套件中没有测试用例')
+
+    environment_id = environment.environment_id if environment else None
+    started_at = timezone.now().isoformat()
+    logger.info(f"分片执行测试套件: suite_id={test_suite.suite_id}, run_id={run_id}, 分片数={len(shards)}")
+    publisher.publish(
+        'suite_started',
+        suite_id=test_suite.suite_id,
+        suite_name=test_suite.name,
+        total_cases=sum(len(shard) for shard in shards),
+        shards=len(shards)
+    )
+    chord(
+        execute_suite_shard.s(run_id, test_suite.suite_id, shard_index, shard, environment_id, overrides, started_at)
+        for shard_index, shard in enumerate(shards)
+    )(merge_suite_shards.s(run_id, test_suite.suite_id, environment_id, user_id, started_at))
+    return {'run_id': run_id, 'status': 'dispatched', 'shards': len(shards)}
+
+
+@shared_task
+def execute_suite_shard(run_id, suite_id, shard_index, shard, environment_id=None, overrides=None, started_at=None):
+    """执行套件的一个分片，保存该分片的用例执行结果，返回分片摘要（不含结果数据）"""
+    from test_platform.models import TestSuite, TestEnvironment
+    from test_platform.execution import run_status
+    from test_platform.execution.progress import ProgressPublisher, run_channel, suite_channel
+    from test_platform.execution.sharding import run_suite_shard, save_shard_results, shard_error_results
+
+    publisher = ProgressPublisher(
+        [run_channel(run_id), suite_channel(suite_id)], run_id=run_id, suite_id=suite_id, shard=shard_index
+    )
+
+    def case_done(entry):
+        run_status.record_case_done(run_id, entry.get('status'))
+        publisher.publish(
+            'case_completed',
+            index=entry.get('index'),
+            case_id=entry.get('case_id'),
+            title=entry.get('title'),
+            status=entry.get('status'),
+            duration=entry.get('duration')
+        )
+
+    try:
+        test_suite = TestSuite.objects.get(suite_id=suite_id)
+        environment = TestEnvironment.objects.filter(environment_id=environment_id).first() if environment_id else None
+        logger.info(f"执行套件分片: suite_id={suite_id}, run_id={run_id}, 分片={shard_index}, 用例数={len(shard)}")
+        results = run_suite_shard(test_suite, environment, shard, overrides, case_done, trace_id=run_id,
+                                  started_at=started_at)
+        return save_shard_results(run_id, test_suite, shard_index, results)
+    except Exception as e:
+        # 分片失败不能中断 chord，否则合并任务不会执行
+        logger.error(f"执行套件分片失败: suite_id={suite_id}, run_id={run_id}, 分片={shard_index}, 错误: {str(e)}")
+        results = shard_error_results(shard, str(e))
+        for entry in results:
+            run_status.record_case_done(run_id, entry['status'])
+        # 错误结果不含请求和响应内容，直接随任务结果返回
+        return {'shard_index': shard_index, 'total_cases': len(results), 'status': 'fail', 'results': results}
+    finally:
+        publisher.close()
+
+
+@shared_task
+def merge_suite_shards(shard_results, run_id, suite_id, environment_id=None, user_id=None, started_at=None):
+    """合并各分片的执行结果，写入一条套件执行结果"""
+    from django.contrib.auth.models import User
+    from test_platform.models import TestSuite, TestEnvironment
+    from test_platform.execution import run_status
+    from test_platform.execution.progress import ProgressPublisher, run_channel, suite_channel
+    from test_platform.execution.sharding import delete_shard_results, merge_shard_results
+    from test_platform.execution.suite_runner import save_suite_run
+
+    publisher = ProgressPublisher([run_channel(run_id), suite_channel(suite_id)], run_id=run_id, suite_id=suite_id)
+    try:
+        test_suite = TestSuite.objects.get(suite_id=suite_id)
+        environment = TestEnvironment.objects.filter(environment_id=environment_id).first() if environment_id else None
+        user = User.objects.filter(id=user_id).first() if user_id else None
+        suite_start_time = datetime.datetime.fromisoformat(started_at) if started_at else timezone.now()
+
+        run_data = save_suite_run(
+            test_suite, environment, user, merge_shard_results(shard_results), suite_start_time, publisher,
+            trace_id=run_id
+        )
+        run_status.mark_completed(run_id, run_data)
+        logger.info(f"分片执行完成: suite_id={suite_id}, run_id={run_id}, 结果ID={run_data['result_id']}")
+        return {'run_id': run_id, 'status': 'completed', 'result_id': run_data['result_id']}
+    except Exception as e:
+        logger.error(f"合并分片执行结果失败: suite_id={suite_id}, run_id={run_id}, 错误: {str(e)}")
+        run_status.mark_failed(run_id, str(e))
+        publisher.publish('suite_failed', error=str(e))
+        return {'run_id': run_id, 'status': 'failed', 'error': str(e)}
+    finally:
+        try:
+            delete_shard_results(run_id)
+        except Exception as e:
+            logger.error(f"删除分片执行结果失败: run_id={run_id}, 错误: {str(e)}")
+        publisher.close()
+
+
+@shared_task
+def execute_suite_load_test(load_result_id, overrides=None):
+    """执行套件压测，结果写入 TestSuiteLoadResult"""
+    from test_platform.models import TestSuiteLoadResult
+    from test_platform.execution.load_test import run_load_test
+
+    load_result = TestSuiteLoadResult.objects.select_related('suite', 'environment').get(id=load_result_id)
+    logger.info(f"开始压测测试套件: suite_id={load_result.suite_id}, 迭代={load_result.iterations}, 并发={load_result.concurrency}")
+    try:
+        run_load_test(load_result, overrides)
+        return {'load_result_id': load_result_id, 'status': 'completed'}
+    except Exception as e:
+        logger.error(f"压测测试套件失败: suite_id={load_result.suite_id}, 错误: {str(e)}")
+        load_result.status = 'failed'
+        load_result.error = str(e)
+        load_result.save(update_fields=['status', 'error'])
+        return {'load_result_id': load_result_id, 'status': 'failed', 'error': str(e)}
@@ -0,0 +1,22 @@
+from test_platform import models
+
+
+def case_data(path='/api', extract=None, body=None):
+    """构造套件用例数据，extract 为提取器产出的变量名"""
+    data = {'api_path': path, 'method': 'GET', 'headers': {}, 'params': {}, 'body': body or {}}
+    data['extractors'] = [{'name': extract, 'expression': f'$.{extract}', 'type': 'jsonpath'}] if extract else []
+    return data
+
+
+def create_suite(name='套件'):
+    project = models.Project.objects.create(name='项目', description='')
+    return models.TestSuite.objects.create(name=name, project=project)
+
+
+def create_test_case(path='/api/users', method='GET', tests=''):
+    project = models.Project.objects.create(name='项目', description='')
+    return models.TestCase.objects.create(
+        case_name='查询用户', case_description='', case_path=path, case_request_method=method, case_params='',
+        case_precondition='', case_request_headers='{}', case_requests_body='', case_expect_result='',
+        case_assert_contents='', case_tests=tests, project=project
+    )
@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import json
+
+from django.test import SimpleTestCase
+
+from test_platform.execution.async_runner import AsyncDependencyScheduler, HostLimiter, execute_case_async
+from test_platform.execution.capture import CapturedResponse
+from test_platform.execution.core import CaseSpec
+from test_platform.execution.deadline import Deadline
+
+
+class FakeAsyncClient:
+    """按固定响应返回的异步客户端，记录收到的请求"""
+
+    timeout = (3, 10)
+
+    def __init__(self, status_code=200, body=None):
+        self.status_code = status_code
+        self.content = json.dumps(body or {}).encode()
+        self.requests = []
+
+    async def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        await asyncio.sleep(0)
+        return CapturedResponse(self.status_code, {'Content-Type': 'application/json'}, self.content,
+                                len(self.content), hashlib.sha256(self.content).hexdigest())
+
+
+class HostLimiterTests(SimpleTestCase):
+    """asyncio 后端的在途请求限制"""
+
+    def run_requests(self, limiter, urls):
+        in_flight = {'total': 0, 'peak': 0}
+        per_host = {}
+        peaks = {}
+
+        async def request(url):
+            async with limiter.slot(url):
+                in_flight['total'] += 1
+                per_host[url] = per_host.get(url, 0) + 1
+                in_flight['peak'] = max(in_flight['peak'], in_flight['total'])
+                peaks[url] = max(peaks.get(url, 0), per_host[url])
+                await asyncio.sleep(0.01)
+                in_flight['total'] -= 1
+                per_host[url] -= 1
+
+        async def run_all():
+            await asyncio.gather(*(request(url) for url in urls))
+
+        asyncio.run(run_all())
+        return in_flight['peak'], peaks
+
+    def test_per_host_limit(self):
+        peak, peaks = self.run_requests(HostLimiter(10, 2), ['http://a/x'] * 6 + ['http://b/x'] * 6)
+        self.assertEqual(peaks, {'http://a/x': 2, 'http://b/x': 2})
+        self.assertEqual(peak, 4)
+
+    def test_global_limit(self):
+        peak, _ = self.run_requests(HostLimiter(3, None), [f'http://host{index}/x' for index in range(8)])
+        self.assertEqual(peak, 3)
+
+
+class AsyncExecutionTests(SimpleTestCase):
+    """asyncio 后端的用例执行与调度"""
+
+    def test_execute_case_async(self):
+        client = FakeAsyncClient(body={'id': 1})
+        spec = CaseSpec(method='POST', url='/users/${user_id}', body={'id': '${user_id}'})
+
+        result = asyncio.run(execute_case_async(spec, {'user_id': 7}, client))
+
+        self.assertEqual(result.status, 'PASS')
+        self.assertEqual(result.body, {'id': 1})
+        method, url, kwargs = client.requests[0]
+        self.assertEqual((method, url), ('POST', '/users/7'))
+        self.assertEqual(kwargs['json'], {'id': 7})
+        self.assertEqual(kwargs['timeout'], (3, 10))
+
+    def test_failed_status_code(self):
+        result = asyncio.run(execute_case_async(CaseSpec(method='GET', url='/'), {}, FakeAsyncClient(500)))
+        self.assertEqual(result.status, 'FAIL')
+        self.assertEqual(result.failure_message, 'HTTP状态码: 500')
+
+    def test_expired_deadline_skips_request(self):
+        client = FakeAsyncClient()
+        result = asyncio.run(execute_case_async(CaseSpec(method='GET', url='/'), {}, client,
+                                                deadline=Deadline(10, elapsed=10)))
+        self.assertEqual((result.status, result.error_kind), ('TIMEOUT', 'deadline'))
+        self.assertEqual(client.requests, [])
+
+    def test_scheduler_waits_for_dependencies(self):
+        completed = []
+
+        async def task(index):
+            await asyncio.sleep(0.01 * (3 - index))
+            return index
+
+        def on_complete(index, result, error):
+            completed.append((result, error))
+
+        scheduler = AsyncDependencyScheduler([set(), {0}, {1}, set()])
+        asyncio.run(scheduler.run(task, on_complete))
+        results = [result for result, _ in completed]
+        self.assertLess(results.index(0), results.index(1))
+        self.assertLess(results.index(1), results.index(2))
+        self.assertEqual(sorted(results), [0, 1, 2, 3])
+
+    def test_scheduler_reports_errors(self):
+        outcomes = {}
+
+        async def task(index):
+            raise ValueError('boom')
+
+        asyncio.run(AsyncDependencyScheduler([set()]).run(task, lambda index, result, error: outcomes.update({index: error})))
+        self.assertIsInstance(outcomes[0], ValueError)
@@ -0,0 +1,42 @@
+from django.test import TestCase, override_settings
+
+from test_platform import models
+from test_platform.execution import blob_store
+
+
+@override_settings(TEST_BLOB_STORE={'enabled': True, 'min_size': 64})
+class BlobStoreTests(TestCase):
+    """响应体的内容寻址存储"""
+
+    def test_pack_unpack_round_trip(self):
+        body = {'items': [{'id': index, 'name': f'名称{index}'} for index in range(20)]}
+        data = {'results': [{'status': 'PASS', 'response': {'body': body, 'status_code': 200}},
+                            {'status': 'PASS', 'response': {'body': 'ok'}}]}
+        packed = blob_store.pack(data)
+
+        self.assertTrue(blob_store.is_blob_ref(packed['results'][0]['response']['body']))
+        self.assertEqual(packed['results'][1]['response']['body'], 'ok')
+        self.assertEqual(blob_store.unpack(packed), data)
+        # 不修改原结构
+        self.assertEqual(data['results'][0]['response']['body'], body)
+
+    def test_identical_bodies_are_stored_once(self):
+        body = 'x' * 200
+        first = blob_store.pack({'body': body})
+        second = blob_store.pack_value(body)
+        self.assertEqual(first['body'], second)
+        self.assertEqual(models.ResponseBlob.objects.count(), 1)
+
+    def test_pack_json_round_trip(self):
+        data = {'raw_text': 'y' * 100, 'status_code': 500}
+        self.assertEqual(blob_store.unpack_json(blob_store.pack_json(data)), data)
+
+    @override_settings(TEST_BLOB_STORE={'enabled': False})
+    def test_disabled_store_keeps_values(self):
+        data = {'body': 'z' * 5000}
+        self.assertIs(blob_store.pack(data), data)
+        self.assertEqual(models.ResponseBlob.objects.count(), 0)
+
+    def test_unknown_reference_is_kept(self):
+        ref = {'$blob': '0' * 64, 'size': 10}
+        self.assertEqual(blob_store.unpack({'body': ref}), {'body': ref})
@@ -0,0 +1,47 @@
+import hashlib
+
+from django.test import SimpleTestCase
+
+from test_platform.execution.capture import CapturedResponse, ResponseCapture, TRUNCATION_MARKER, truncate_for_storage
+
+
+class CaptureTests(SimpleTestCase):
+    """响应体的有界读取"""
+
+    def capture(self, chunks, max_parse_bytes, content_type='application/json'):
+        capture = ResponseCapture(max_parse_bytes=max_parse_bytes)
+        for chunk in chunks:
+            capture.feed(chunk)
+        return capture.finish(200, {'Content-Type': content_type})
+
+    def test_complete_response(self):
+        response = self.capture([b'{"a": ', b'1}'], 1024)
+        self.assertFalse(response.truncated)
+        self.assertEqual(response.size, 8)
+        self.assertEqual(response.sha256, hashlib.sha256(b'{"a": 1}').hexdigest())
+        self.assertEqual(response.json(), {'a': 1})
+
+    def test_truncated_response_keeps_full_digest(self):
+        response = self.capture([b'abc', b'defg'], 4, 'text/plain')
+        self.assertTrue(response.truncated)
+        self.assertEqual(response.content, b'abcd')
+        self.assertEqual(response.size, 7)
+        self.assertEqual(response.sha256, hashlib.sha256(b'abcdefg').hexdigest())
+        self.assertEqual(response.text, 'abcd' + TRUNCATION_MARKER.format(size=7))
+        with self.assertRaises(ValueError):
+            response.json()
+
+    def test_binary_response_is_not_decoded(self):
+        content = b'\x89PNG\x00\x01'
+        response = CapturedResponse(200, {'Content-Type': 'image/png'}, content, len(content),
+                                    hashlib.sha256(content).hexdigest())
+        self.assertTrue(response.is_binary)
+        self.assertIn(hashlib.sha256(content).hexdigest(), response.text)
+
+    def test_truncate_for_storage(self):
+        self.assertEqual(truncate_for_storage({'a': 1}, limit=100), ({'a': 1}, False))
+        self.assertEqual(truncate_for_storage(None, limit=1), (None, False))
+        value, truncated = truncate_for_storage('测试内容', limit=7)
+        self.assertTrue(truncated)
+        # 不在多字节字符中间截断
+        self.assertEqual(value, '测试' + TRUNCATION_MARKER.format(size=12))
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+
+from test_platform.execution.capture import CapturedResponse
+from test_platform.execution.cassette import (
+    Cassette, CassetteMiss, CassetteNotFound, RecordingClient, ReplayClient, open_cassette
+)
+from test_platform.execution.core import CaseSpec, execute_case
+
+
+def captured(content, status_code=200, content_type='application/json'):
+    return CapturedResponse(status_code, {'Content-Type': content_type}, content, len(content),
+                            hashlib.sha256(content).hexdigest())
+
+
+class SequenceClient:
+    """依次返回预设响应的 HttpClient 替身"""
+
+    timeout = (3, 10)
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    def request(self, method, url, **kwargs):
+        return self.responses.pop(0)
+
+
+class CassetteTests(SimpleTestCase):
+    """请求录制与回放"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(TEST_CASSETTE_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def record(self, requests, suite_id=1, merge=False):
+        """requests 为 [(method, url, kwargs, response), ...]，录制后保存"""
+        cassette = Cassette(suite_id, 'record')
+        client = RecordingClient(SequenceClient(*[request[3] for request in requests]), cassette)
+        for method, url, kwargs, _ in requests:
+            client.request(method, url, **kwargs)
+        cassette.save(merge=merge)
+        return cassette
+
+    def test_exact_match_before_loose_match(self):
+        self.record([
+            ('POST', '/login', {'json': {'user': 'a'}}, captured(b'{"token": "a"}')),
+            ('POST', '/login', {'json': {'user': 'b'}}, captured(b'{"token": "b"}')),
+        ])
+        cassette = Cassette.load(1)
+
+        self.assertEqual(cassette.replay('POST', '/login', {'json': {'user': 'b'}}).json(), {'token': 'b'})
+        # 请求体不同（如包含时间戳）时按 方法 + URL 匹配
+        self.assertEqual(cassette.replay('POST', '/login', {'json': {'user': 'c'}}).json(), {'token': 'a'})
+        # 请求头不参与匹配
+        response = cassette.replay('POST', '/login', {'json': {'user': 'a'}, 'headers': {'Authorization': 'x'}})
+        self.assertEqual(response.json(), {'token': 'a'})
+        self.assertEqual(response.headers['content-type'], 'application/json')
+        self.assertEqual(cassette.summary()['replayed'], 3)
+
+    def test_repeated_requests_replay_in_order(self):
+        self.record([
+            ('GET', '/jobs/1', {}, captured(b'{"state": "running"}')),
+            ('GET', '/jobs/1', {}, captured(b'{"state": "done"}')),
+        ])
+        cassette = Cassette.load(1)
+        states = [cassette.replay('GET', '/jobs/1', {}).json()['state'] for _ in range(3)]
+        self.assertEqual(states, ['running', 'done', 'done'])
+
+    def test_miss(self):
+        self.record([('GET', '/users', {'params': {'page': 1}}, captured(b'[]'))])
+        cassette = Cassette.load(1)
+        self.assertEqual(cassette.replay('GET', '/users', {'params': {'page': 2}}).json(), [])
+        with self.assertRaises(CassetteMiss):
+            cassette.replay('GET', '/orders', {})
+        self.assertEqual(cassette.summary()['misses'], 1)
+
+    def test_merge_replaces_only_recorded_requests(self):
+        self.record([
+            ('GET', '/a', {}, captured(b'{"v": 1}')),
+            ('GET', '/b', {}, captured(b'{"v": 1}')),
+        ])
+        self.record([('GET', '/b', {}, captured(b'{"v": 2}'))], merge=True)
+        cassette = Cassette.load(1)
+        self.assertEqual(cassette.replay('GET', '/a', {}).json(), {'v': 1})
+        self.assertEqual(cassette.replay('GET', '/b', {}).json(), {'v': 2})
+        # 不残留临时文件
+        self.assertEqual(os.listdir(self.directory), ['suite_1.jsonl.gz'])
+
+    def test_binary_content(self):
+        content = b'\x89PNG\x00\xff'
+        self.record([('GET', '/logo.png', {}, captured(content, content_type='image/png'))])
+        response = Cassette.load(1).replay('GET', '/logo.png', {})
+        self.assertEqual((response.content, response.size), (content, len(content)))
+
+    def test_replayed_case_execution(self):
+        self.record([('GET', '/users/7', {}, captured(b'{"id": 7}', status_code=404))])
+        cassette = open_cassette(1, {'cassette': 'replay'})
+        result = execute_case(CaseSpec(method='GET', url='/users/${id}'), {'id': 7}, client=ReplayClient(cassette))
+        self.assertEqual((result.status, result.status_code, result.body), ('FAIL', 404, {'id': 7}))
+
+        result = execute_case(CaseSpec(method='DELETE', url='/users/7'), client=ReplayClient(cassette))
+        self.assertEqual(result.status, 'ERROR')
+
+    def test_missing_cassette(self):
+        self.assertIsNone(open_cassette(2, {}))
+        with self.assertRaises(CassetteNotFound):
+            open_cassette(2, {'cassette': 'replay'})
@@ -0,0 +1,52 @@
+from django.test import SimpleTestCase
+
+from test_platform.execution.dag import DependencyScheduler, build_dependency_graph
+from test_platform.tests.factories import case_data
+
+
+class DependencyGraphTests(SimpleTestCase):
+    """用例变量依赖图与调度"""
+
+    def setUp(self):
+        self.cases = [
+            case_data('/login', extract='token'),
+            case_data('/users', body={'token': '${token}'}),
+            case_data('/health'),
+            # 重新产出 token，需等待之前读取 token 的用例
+            case_data('/refresh', extract='token'),
+            case_data('/orders/${token}'),
+        ]
+
+    def test_build_dependency_graph(self):
+        self.assertEqual(build_dependency_graph(self.cases), [set(), {0}, set(), {0, 1}, {3}])
+
+    def test_disabled_extractor_produces_nothing(self):
+        producer = case_data('/login', extract='token')
+        producer['extractors'][0]['enabled'] = False
+        self.assertEqual(build_dependency_graph([producer, case_data('/users/${token}')]), [set(), set()])
+
+    def test_scheduler_respects_dependencies(self):
+        dependencies = build_dependency_graph(self.cases)
+        completed = []
+        errors = []
+
+        def on_complete(index, result, error):
+            errors.append(error)
+            # 依赖的用例必须已经完成
+            self.assertTrue(dependencies[index] <= set(completed))
+            completed.append(index)
+
+        DependencyScheduler(dependencies, max_workers=4).run(lambda index: (lambda: index), on_complete)
+        self.assertEqual(sorted(completed), [0, 1, 2, 3, 4])
+        self.assertEqual(errors, [None] * 5)
+
+    def test_scheduler_reports_task_errors(self):
+        outcomes = {}
+
+        def make_task(index):
+            def task():
+                raise ValueError('boom')
+            return task
+
+        DependencyScheduler([set()]).run(make_task, lambda index, result, error: outcomes.update({index: error}))
+        self.assertIsInstance(outcomes[0], ValueError)
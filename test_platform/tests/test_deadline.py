@@ -0,0 +1,32 @@
+from django.test import SimpleTestCase
+
+from test_platform.execution.deadline import Deadline, resolve_request_timeout
+
+
+class DeadlineTests(SimpleTestCase):
+    """执行时间预算"""
+
+    def test_unlimited(self):
+        for deadline in (Deadline(), Deadline(0), Deadline(-1)):
+            self.assertIsNone(deadline.remaining())
+            self.assertFalse(deadline.expired())
+
+    def test_remaining(self):
+        remaining = Deadline(60).remaining()
+        self.assertTrue(59 < remaining <= 60)
+
+    def test_parent_deadline_applies(self):
+        self.assertLessEqual(Deadline(60, parent=Deadline(5)).remaining(), 5)
+        self.assertLessEqual(Deadline(None, parent=Deadline(5)).remaining(), 5)
+        self.assertTrue(Deadline(60, parent=Deadline(0.01)).expired())
+
+    def test_budget_below_minimum_is_expired(self):
+        self.assertTrue(Deadline(0.01).expired())
+
+    def test_resolve_request_timeout(self):
+        self.assertEqual(resolve_request_timeout((3, 30)), (3, 30))
+        # 用例超时覆盖读取超时，连接超时不超过读取超时
+        self.assertEqual(resolve_request_timeout((3, 30), case_timeout=2), (2, 2.0))
+        connect_timeout, read_timeout = resolve_request_timeout((3, 30), case_timeout=10, deadline=Deadline(5))
+        self.assertEqual(connect_timeout, 3)
+        self.assertTrue(4 < read_timeout <= 5)
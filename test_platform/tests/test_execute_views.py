@@ -0,0 +1,94 @@
+import hashlib
+import json
+from unittest import mock
+
+import requests
+from django.test import RequestFactory, TestCase
+
+from test_platform import models
+from test_platform.execution.capture import CapturedResponse
+from test_platform.execution.rate_limit import TrafficLimitTimeout
+from test_platform.tests.factories import create_test_case
+from test_platform.views.execute import execute_test
+
+
+class FakeClient:
+    """替代 HttpClient：返回固定响应或抛出指定异常"""
+
+    timeout = (3, 10)
+
+    def __init__(self, status_code=200, body=None, error=None):
+        self.status_code = status_code
+        self.content = json.dumps(body or {}).encode()
+        self.error = error
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url))
+        if self.error is not None:
+            raise self.error
+        return CapturedResponse(self.status_code, {'Content-Type': 'application/json'}, self.content,
+                                len(self.content), hashlib.sha256(self.content).hexdigest())
+
+
+@mock.patch('test_platform.views.execute.set_timezone')
+@mock.patch('test_platform.execution.trace.TraceRecorder._emit')
+class ExecuteTestViewTests(TestCase):
+    """单用例执行接口"""
+
+    def setUp(self):
+        self.test_case = create_test_case()
+
+    def execute(self, client):
+        with mock.patch('test_platform.execution.core.HttpClient', return_value=client):
+            request = RequestFactory().post(f'/api/testcase/execute/{self.test_case.test_case_id}')
+            response = execute_test(request, case_id=self.test_case.test_case_id)
+        return response, json.loads(response.content)
+
+    def test_successful_case(self, emit, set_timezone):
+        client = FakeClient(body={'id': 1, 'name': '张三'})
+        response, payload = self.execute(client)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.requests, [('GET', '/api/users')])
+        self.assertEqual(payload['data']['status'], 'PASS')
+        self.assertEqual(payload['data']['response']['body'], {'id': 1, 'name': '张三'})
+        result = models.TestResult.objects.get(test_result_id=payload['data']['result_id'])
+        self.assertEqual(result.status, 'PASS')
+        self.assertIsNone(result.error_message)
+        self.assertEqual(models.TestExecutionLog.objects.get(case=self.test_case).status, 'pass')
+        self.test_case.refresh_from_db()
+        self.assertEqual(self.test_case.last_execution_result, 'pass')
+
+    def test_failed_status_code(self, emit, set_timezone):
+        response, payload = self.execute(FakeClient(status_code=500))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(payload['data']['status'], 'FAIL')
+        result = models.TestResult.objects.get(test_result_id=payload['data']['result_id'])
+        self.assertEqual(result.error_message, 'HTTP状态码: 500')
+
+    def test_request_timeout(self, emit, set_timezone):
+        response, payload = self.execute(FakeClient(error=requests.ReadTimeout('Read timed out. (read timeout=10)')))
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(payload['data']['status'], 'TIMEOUT')
+        self.assertEqual(payload['data']['error'], '请求超时，服务器响应时间过长')
+        self.assertIn('Read timed out', payload['data']['technical_details'])
+        result = models.TestResult.objects.get(test_result_id=payload['data']['result_id'])
+        self.assertEqual(result.status, 'TIMEOUT')
+        self.assertEqual(result.error_message, '请求超时，服务器响应时间过长')
+
+    def test_rate_limit_timeout(self, emit, set_timezone):
+        error = TrafficLimitTimeout('等待目标主机 api.example.com 的限流名额超时')
+        response, payload = self.execute(FakeClient(error=error))
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(payload['message'], '请求执行失败: 等待目标主机 api.example.com 的限流名额超时')
+        self.assertEqual(payload['data']['status'], 'TIMEOUT')
+        result = models.TestResult.objects.get(test_result_id=payload['data']['result_id'])
+        self.assertEqual(result.error_message, '等待目标主机 api.example.com 的限流名额超时')
+
+    def test_missing_case(self, emit, set_timezone):
+        request = RequestFactory().post('/api/testcase/execute/0')
+        self.assertEqual(execute_test(request, case_id=0).status_code, 404)
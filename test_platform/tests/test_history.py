@@ -0,0 +1,53 @@
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from test_platform import models
+from test_platform.execution.dag import DependencyScheduler, critical_path_priorities
+from test_platform.execution.history import estimate_case_durations, simulate_schedule
+from test_platform.execution.suite_plan import build_compiled_case
+from test_platform.tests.factories import case_data, create_suite, create_test_case
+
+
+class CriticalPathSchedulingTests(SimpleTestCase):
+    """按历史耗时的关键路径调度"""
+
+    def test_critical_path_priorities(self):
+        dependencies = [set(), {0}, {1}, set()]
+        self.assertEqual(critical_path_priorities(dependencies, [1, 2, 3, 4]), [6, 5, 3, 4])
+
+    def test_scheduler_dispatches_by_priority(self):
+        order = []
+        scheduler = DependencyScheduler([set(), {0}, {1}, set()], max_workers=1, priorities=[6, 5, 3, 4])
+        scheduler.run(lambda index: (lambda: index), lambda index, result, error: order.append(result))
+        self.assertEqual(order, [0, 1, 3, 2])
+
+    def test_longest_first_shortens_schedule(self):
+        # 两个并发：先执行短用例时，长依赖链只能最后开始
+        dependencies = [set(), set(), set(), {2}]
+        durations = [1, 1, 3, 3]
+        self.assertEqual(simulate_schedule(dependencies, durations, workers=2), 7)
+        priorities = critical_path_priorities(dependencies, durations)
+        self.assertEqual(simulate_schedule(dependencies, durations, workers=2, priorities=priorities), 6)
+
+
+class CaseDurationTests(TestCase):
+    """用例历史耗时的估计"""
+
+    def test_estimate_case_durations(self):
+        suite = create_suite()
+        suite_result = models.TestSuiteResult.objects.create(
+            suite=suite, execution_time=timezone.now(), status='pass', total_cases=3, result_data='{}'
+        )
+        for duration, status in ((2, 'PASS'), (4, 'FAIL'), (0, 'ERROR'), (30, 'SKIP')):
+            models.TestSuiteCaseResult.objects.create(
+                suite_result=suite_result, suite=suite, case_id=11, status=status, duration=duration,
+                execution_time=timezone.now()
+            )
+        test_case = create_test_case()
+        models.TestResult.objects.create(case=test_case, execution_time=timezone.now(), status='PASS', duration=1,
+                                         result_data='{}')
+        suite_cases = [build_compiled_case(index, case_id, case_data())
+                       for index, case_id in enumerate([11, test_case.test_case_id, 999])]
+
+        # 没有历史记录的用例按已知耗时的中位数估计
+        self.assertEqual(estimate_case_durations(suite_cases), ([3.0, 1.0, 2.0], 2))
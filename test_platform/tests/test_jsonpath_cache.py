@@ -0,0 +1,42 @@
+import importlib.util
+from unittest import skipUnless
+
+from django.test import SimpleTestCase
+
+from test_platform.execution.core import handle_variable_extraction
+from test_platform.execution.jsonpath_cache import cache_stats, clear_cache, compile_jsonpath, find_values
+
+
+@skipUnless(importlib.util.find_spec('jsonpath_ng'), '未安装 jsonpath_ng')
+class JsonPathCacheTests(SimpleTestCase):
+    """JSONPath 表达式的编译缓存"""
+
+    def setUp(self):
+        clear_cache()
+        self.addCleanup(clear_cache)
+
+    def test_repeated_expressions_are_compiled_once(self):
+        data = {'data': {'items': [{'id': 1}, {'id': 2}]}}
+        self.assertEqual(find_values('$.data.items[*].id', data), [1, 2])
+        self.assertEqual(find_values('$.data.items[*].id', {'data': {'items': [{'id': 3}]}}), [3])
+        self.assertIs(compile_jsonpath('$.data.items[*].id'), compile_jsonpath('$.data.items[*].id'))
+
+        stats = cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (3, 1, 1))
+        self.assertEqual(stats['hit_rate'], 0.75)
+
+    def test_invalid_expression_is_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                compile_jsonpath('$.[')
+        self.assertEqual(cache_stats()['size'], 0)
+        self.assertEqual(cache_stats()['misses'], 2)
+
+    def test_extractors_share_the_cache(self):
+        extractors = [{'name': 'token', 'expression': '$.token'}, {'name': 'missing', 'expression': '$.none',
+                                                                   'defaultValue': 'x'}]
+        for token in ('a', 'b'):
+            variables, error = handle_variable_extraction({'token': token}, extractors)
+            self.assertEqual(variables, {'token': token, 'missing': 'x'})
+            self.assertIsNone(error)
+        self.assertEqual((cache_stats()['hits'], cache_stats()['misses']), (2, 2))
@@ -0,0 +1,84 @@
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from test_platform import models
+from test_platform.execution.core import CaseResult, timeout_result
+from test_platform.execution.load_test import (
+    HISTOGRAM_GROWTH, LatencyHistogram, create_load_result, parse_load_options, run_load_test
+)
+from test_platform.tests.factories import case_data, create_suite, create_test_case
+
+
+class LatencyHistogramTests(SimpleTestCase):
+    """压测延迟直方图"""
+
+    def test_percentiles_within_bucket_error(self):
+        histogram = LatencyHistogram()
+        for duration in range(1, 1001):
+            histogram.record(duration, success=duration % 10 != 0)
+
+        for percent, expected in ((50, 500), (90, 900), (99, 990)):
+            value = histogram.percentile(percent)
+            self.assertGreaterEqual(value, expected)
+            self.assertLessEqual(value, expected * HISTOGRAM_GROWTH)
+        self.assertEqual(histogram.percentile(100), 1000)
+
+        summary = histogram.summary(elapsed=2)
+        self.assertEqual((summary['count'], summary['errors'], summary['error_rate']), (1000, 100, 10.0))
+        self.assertEqual((summary['mean'], summary['max'], summary['throughput']), (500.5, 1000, 500.0))
+        self.assertEqual(sum(count for _, count in summary['histogram']), 1000)
+
+    def test_merge(self):
+        fast, slow = LatencyHistogram(), LatencyHistogram()
+        for _ in range(90):
+            fast.record(10)
+        for _ in range(10):
+            slow.record(2000, success=False)
+        fast.merge(slow)
+        self.assertEqual((fast.count, fast.errors, fast.max), (100, 10, 2000))
+        self.assertLessEqual(fast.percentile(90), 10 * HISTOGRAM_GROWTH)
+        self.assertEqual(fast.percentile(99), 2000)
+
+    def test_empty_histogram(self):
+        summary = LatencyHistogram().summary(elapsed=0)
+        self.assertEqual((summary['p50'], summary['throughput'], summary['error_rate']), (0, 0, 0))
+
+    def test_parse_load_options(self):
+        self.assertEqual(parse_load_options({'iterations': 2, 'concurrency': 5}), (2, 2, 0))
+        for options in ({'iterations': -1}, {'concurrency': 'x'}, {'ramp_up': -1}):
+            with self.assertRaises(ValueError):
+                parse_load_options(options)
+
+
+@override_settings(TEST_SUITE_PLAN_CACHE_ENABLED=False)
+class RunLoadTestTests(TestCase):
+    """压测执行"""
+
+    def setUp(self):
+        self.suite = create_suite()
+        test_case = create_test_case()
+        for index in range(2):
+            models.TestSuiteCase.objects.create(
+                suite=self.suite, original_case_id=test_case.test_case_id, order=index + 1,
+                case_data=json.dumps(case_data(f'/api/{index}'))
+            )
+
+    @mock.patch('test_platform.execution.load_test.HttpClient')
+    def test_deadline_results_are_not_recorded_as_samples(self, http_client):
+        passed = CaseResult(status='PASS', request={}, status_code=200, duration=0.02)
+        results = [passed, passed, passed, timeout_result({})]
+        load_result = create_load_result(self.suite, None, {'iterations': 2, 'concurrency': 1})
+
+        with mock.patch('test_platform.execution.load_test.execute_case', side_effect=results):
+            run_load_test(load_result)
+
+        load_result.refresh_from_db()
+        data = json.loads(load_result.result_data)
+        self.assertEqual(load_result.status, 'completed')
+        self.assertEqual(load_result.total_requests, 3)
+        self.assertEqual((data['completed_iterations'], data['interrupted_iterations']), (1, 1))
+        self.assertEqual(data['deadline_skipped_cases'], 1)
+        self.assertEqual([case['count'] for case in data['cases']], [2, 1])
+        self.assertGreaterEqual(data['summary']['p50'], 20)
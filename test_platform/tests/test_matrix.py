@@ -0,0 +1,63 @@
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from test_platform.execution.matrix import (
+    check_matrix_config, compare_environment_results, load_matrix_environments, run_suite_matrix
+)
+
+
+def entry(index, status, status_code=200, error=None):
+    return {'index': index, 'case_id': index * 10, 'title': f'用例{index}', 'method': 'GET', 'status': status,
+            'duration': 0.1, 'api_path': f'/api/{index}', 'response': {'status_code': status_code}, 'error': error}
+
+
+class EnvironmentComparisonTests(SimpleTestCase):
+    """多环境执行结果的对比"""
+
+    def test_compare_environment_results(self):
+        comparison = compare_environment_results([
+            {'key': 'staging', 'results': [entry(2, 'PASS'), entry(1, 'PASS'), entry(3, 'PASS')]},
+            {'key': 'prod', 'results': [entry(1, 'PASS'), entry(2, 'FAIL', 500, 'x' * 300)]},
+        ])
+
+        self.assertEqual((comparison['total_cases'], comparison['consistent_cases'],
+                          comparison['inconsistent_cases']), (3, 1, 2))
+        cases = comparison['cases']
+        self.assertEqual([(row['index'], row['consistent']) for row in cases], [(1, True), (2, False), (3, False)])
+        self.assertEqual(cases[1]['environments']['prod']['status_code'], 500)
+        self.assertEqual(len(cases[1]['environments']['prod']['error']), 200)
+        # 某个环境没有该用例的结果时视为不一致
+        self.assertEqual(list(cases[2]['environments']), ['staging'])
+
+    def test_check_matrix_config_rejects_recording(self):
+        check_matrix_config(SimpleNamespace(execution_config=None), {'cassette': 'replay'})
+        with self.assertRaises(ValueError):
+            check_matrix_config(SimpleNamespace(execution_config=json.dumps({'cassette': 'record'})))
+
+    def test_load_matrix_environments_validation(self):
+        for environment_ids in (None, [], ['x'], list(range(1, 12))):
+            environments, error = load_matrix_environments(environment_ids)
+            self.assertEqual(environments, [])
+            self.assertTrue(error)
+
+    def test_run_suite_matrix(self):
+        environments = [SimpleNamespace(environment_id=1, env_name='staging'),
+                        SimpleNamespace(environment_id=2, env_name='prod')]
+
+        def run_environment(suite_id, environment, user, overrides, on_case_done):
+            if environment.environment_id == 2:
+                raise RuntimeError('环境不可用')
+            return {'result_id': 5, 'status': 'pass', 'duration': 1.5, 'results': [entry(1, 'PASS')]}
+
+        with mock.patch('test_platform.execution.matrix._run_environment', side_effect=run_environment):
+            matrix = run_suite_matrix(SimpleNamespace(suite_id=3, name='套件', execution_config=None), environments)
+
+        self.assertEqual(matrix['duration'], 1.5)
+        self.assertEqual([(run['key'], run['status']) for run in matrix['environments']],
+                         [('1', 'pass'), ('2', 'error')])
+        self.assertEqual(matrix['environments'][1]['error'], '环境不可用')
+        self.assertNotIn('results', matrix['environments'][0])
+        self.assertEqual(matrix['comparison']['inconsistent_cases'], 1)
@@ -0,0 +1,75 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+
+import redis
+from django.test import SimpleTestCase, override_settings
+
+from test_platform.execution.rate_limit import TrafficLimiter, TrafficLimitTimeout, resolve_host_limits
+
+
+class FakeScript:
+    """按顺序返回预设结果的 Lua 脚本"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self, keys, args):
+        self.calls += 1
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+
+@override_settings(TEST_TRAFFIC_LIMITS={'api.example.com': {'max_concurrency': 2, 'rate_limit': 5}})
+class TrafficLimiterTests(SimpleTestCase):
+    """目标主机的并发数和请求速率限制"""
+
+    url = 'http://api.example.com/users'
+
+    def limiter(self, semaphore, token_bucket):
+        limiter = TrafficLimiter()
+        limiter._scripts = lambda: (token_bucket, semaphore)
+        return limiter
+
+    def test_resolve_host_limits(self):
+        self.assertEqual(resolve_host_limits(None, 'api.example.com'), (2, 5.0))
+        environment = SimpleNamespace(max_concurrency=4, rate_limit=None)
+        self.assertEqual(resolve_host_limits(environment, 'api.example.com'), (4, 5.0))
+        self.assertEqual(resolve_host_limits(None, 'other.example.com'), (None, None))
+
+    @mock.patch('test_platform.execution.rate_limit.get_redis')
+    def test_unlimited_host_skips_redis(self, get_redis):
+        with TrafficLimiter().slot('http://other.example.com/'):
+            pass
+        get_redis.assert_not_called()
+
+    @mock.patch('test_platform.execution.rate_limit.get_redis')
+    def test_waits_for_concurrency_and_rate(self, get_redis):
+        semaphore, token_bucket = FakeScript(0, 1), FakeScript(20, 0)
+        with self.limiter(semaphore, token_bucket).slot(self.url):
+            self.assertEqual((semaphore.calls, token_bucket.calls), (2, 2))
+        # 退出时释放并发名额
+        get_redis.return_value.zrem.assert_called_once()
+
+    @override_settings(TEST_TRAFFIC_LIMIT={'max_wait': 0})
+    @mock.patch('test_platform.execution.rate_limit.get_redis')
+    def test_wait_timeout(self, get_redis):
+        with self.assertRaisesMessage(TrafficLimitTimeout, 'api.example.com'):
+            with self.limiter(FakeScript(0), FakeScript(0)).slot(self.url):
+                pass
+        get_redis.return_value.zrem.assert_not_called()
+
+    @mock.patch('test_platform.execution.rate_limit.get_redis')
+    def test_redis_unavailable_fails_open(self, get_redis):
+        get_redis.return_value.register_script.side_effect = redis.ConnectionError('connection refused')
+        entered = []
+        with TrafficLimiter().slot(self.url):
+            entered.append(True)
+        self.assertEqual(entered, [True])
+
+        async def run_async():
+            async with TrafficLimiter().slot_async(self.url):
+                entered.append(True)
+
+        asyncio.run(run_async())
+        self.assertEqual(entered, [True, True])
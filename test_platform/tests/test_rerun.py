@@ -0,0 +1,87 @@
+import json
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from test_platform import models
+from test_platform.execution.dag import with_variable_producers
+from test_platform.execution.rerun import failed_case_indexes, merge_rerun_results
+from test_platform.execution.suite_plan import build_compiled_case
+from test_platform.tests.factories import case_data, create_suite
+
+
+class FailedCaseSelectionTests(SimpleTestCase):
+    """重跑用例的选择"""
+
+    def test_with_variable_producers(self):
+        cases = [
+            case_data('/login', extract='token'),
+            case_data('/users', body={'token': '${token}'}),
+            case_data('/health'),
+            case_data('/refresh', extract='token'),
+            case_data('/orders/${token}'),
+        ]
+        self.assertEqual(with_variable_producers(cases, {4}), [3, 4])
+        self.assertEqual(with_variable_producers(cases, {1, 2}), [0, 1, 2])
+
+    def test_failed_case_indexes(self):
+        # 套件用例调整过顺序：原始用例 13 从第3位移到了第1位，用例 14 已被删除
+        plan = SimpleNamespace(cases=[
+            build_compiled_case(1, 13, case_data('/c')),
+            build_compiled_case(2, 11, case_data('/a')),
+            build_compiled_case(3, 12, case_data('/b')),
+        ])
+        suite_result = SimpleNamespace(result_data=json.dumps({'results': [
+            {'index': 2, 'case_id': 11, 'status': 'FAIL'},
+            {'index': 3, 'case_id': 12, 'status': 'PASS'},
+            {'index': 3, 'case_id': 13, 'status': 'TIMEOUT'},
+            {'index': 4, 'case_id': 14, 'status': 'ERROR'},
+            {'index': 5, 'case_id': 12, 'status': 'SKIP'},
+        ]}))
+
+        self.assertEqual(failed_case_indexes(suite_result, plan), ({0, 1}, [14]))
+        self.assertEqual(failed_case_indexes(suite_result, plan, include_skipped=True), ({0, 1, 2}, [14]))
+
+
+class RerunMergeTests(TestCase):
+    """失败用例重跑的合并视图"""
+
+    def create_result(self, suite, entries, rerun_of=None):
+        return models.TestSuiteResult.objects.create(
+            suite=suite, execution_time=timezone.now(), status='fail', total_cases=len(entries),
+            result_data=json.dumps({'results': entries}), rerun_of=rerun_of
+        )
+
+    def test_merge_rerun_results(self):
+        suite = create_suite()
+        original = self.create_result(suite, [
+            {'index': 1, 'case_id': 11, 'status': 'FAIL'},
+            {'index': 2, 'case_id': 12, 'status': 'PASS'},
+            {'index': 3, 'case_id': 13, 'status': 'ERROR'},
+        ])
+        first_rerun = self.create_result(suite, [
+            {'index': 1, 'case_id': 11, 'status': 'PASS'},
+            {'index': 3, 'case_id': 13, 'status': 'TIMEOUT'},
+        ], rerun_of=original)
+        second_rerun = self.create_result(suite, [{'index': 3, 'case_id': 13, 'status': 'PASS'}], rerun_of=first_rerun)
+
+        merged = merge_rerun_results(second_rerun)
+
+        self.assertEqual(merged['original_result_id'], original.result_id)
+        self.assertEqual([item['result_id'] for item in merged['chain']],
+                         [original.result_id, first_rerun.result_id, second_rerun.result_id])
+        self.assertEqual([(entry['index'], entry['status'], entry['result_id']) for entry in merged['results']], [
+            (1, 'PASS', first_rerun.result_id),
+            (2, 'PASS', original.result_id),
+            (3, 'PASS', second_rerun.result_id),
+        ])
+        self.assertEqual(merged['status'], 'pass')
+        self.assertEqual(merged['total_cases'], 3)
+
+    def test_merge_without_reruns(self):
+        suite = create_suite()
+        result = self.create_result(suite, [{'index': 1, 'case_id': 11, 'status': 'FAIL'}])
+        merged = merge_rerun_results(result)
+        self.assertEqual(merged['status'], 'fail')
+        self.assertEqual(len(merged['chain']), 1)
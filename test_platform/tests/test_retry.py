@@ -0,0 +1,69 @@
+import requests
+from django.test import SimpleTestCase
+
+from test_platform.execution.capture import CapturedResponse
+from test_platform.execution.core import CaseResult, CaseSpec, execute_case
+from test_platform.execution.deadline import Deadline
+from test_platform.execution.retry import RetryBudget, RetryPolicy, next_retry_delay
+
+
+class RetryTests(SimpleTestCase):
+    """用例失败重试"""
+
+    def error_result(self, error_kind='connection'):
+        return CaseResult(status='ERROR', request={}, error='连接失败', error_kind=error_kind)
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_attempts=3, status_codes=[502])
+        self.assertTrue(policy.should_retry(self.error_result(), 1))
+        self.assertFalse(policy.should_retry(self.error_result(), 3))
+        self.assertFalse(policy.should_retry(self.error_result('request'), 1))
+        self.assertTrue(policy.should_retry(CaseResult(status='FAIL', request={}, status_code=502), 1))
+        self.assertFalse(policy.should_retry(CaseResult(status='FAIL', request={}, status_code=500), 1))
+        self.assertFalse(policy.should_retry(CaseResult(status='PASS', request={}, status_code=200), 1))
+
+    def test_from_config_applies_case_override(self):
+        policy = RetryPolicy.from_config({'retry_max_attempts': 2, 'retry_status_codes': [503]},
+                                         {'max_attempts': 4, 'status_codes': None})
+        self.assertEqual(policy.max_attempts, 4)
+        self.assertEqual(policy.status_codes, {503})
+
+    def test_backoff_without_jitter(self):
+        policy = RetryPolicy(max_attempts=5, backoff=0.5, backoff_max=1.5, jitter=False)
+        self.assertEqual([policy.delay(attempt) for attempt in (1, 2, 3)], [0.5, 1.0, 1.5])
+
+    def test_next_retry_delay_uses_budget(self):
+        policy = RetryPolicy(max_attempts=3, backoff=0.5, jitter=False)
+        budget = RetryBudget(limit=1)
+        self.assertEqual(next_retry_delay(policy, budget, self.error_result(), 1), 0.5)
+        self.assertIsNone(next_retry_delay(policy, budget, self.error_result(), 1))
+        self.assertEqual(budget.used, 1)
+
+    def test_next_retry_delay_respects_deadline(self):
+        policy = RetryPolicy(max_attempts=3, backoff=0.5, jitter=False)
+        budget = RetryBudget(limit=5)
+        self.assertIsNone(next_retry_delay(policy, budget, self.error_result(), 1, Deadline(0.3)))
+        # 时间预算不足时不占用重试预算
+        self.assertEqual(budget.used, 0)
+        self.assertEqual(next_retry_delay(policy, budget, self.error_result(), 1, Deadline(60)), 0.5)
+
+    def test_next_retry_delay_without_policy(self):
+        self.assertIsNone(next_retry_delay(None, None, self.error_result(), 1))
+
+    def test_execute_case_retries_connection_errors(self):
+        class FlakyClient:
+            timeout = (3, 10)
+            calls = 0
+
+            def request(self, method, url, **kwargs):
+                self.calls += 1
+                if self.calls == 1:
+                    raise requests.ConnectionError('Connection reset by peer')
+                return CapturedResponse(200, {'Content-Type': 'application/json'}, b'{}', 2, None)
+
+        client = FlakyClient()
+        result = execute_case(CaseSpec(method='GET', url='/'), client=client,
+                              retry_policy=RetryPolicy(max_attempts=3, backoff=0), retry_budget=RetryBudget(limit=5))
+        self.assertEqual(result.status, 'PASS')
+        self.assertEqual((client.calls, result.attempts), (2, 2))
+        self.assertEqual(result.retries[0]['status'], 'ERROR')
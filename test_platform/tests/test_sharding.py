@@ -0,0 +1,86 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from test_platform import models
+from test_platform.execution.dag import build_dependency_graph, split_into_shards
+from test_platform.execution.deadline import Deadline
+from test_platform.execution.sharding import (
+    delete_shard_results, get_shard_count, merge_shard_results, plan_suite_shards, run_suite_shard,
+    save_shard_results, shard_error_results
+)
+from test_platform.tests.factories import case_data, create_suite
+
+
+class ShardSplitTests(SimpleTestCase):
+    """分片划分与分片时间预算"""
+
+    def test_split_into_shards_keeps_dependent_cases_together(self):
+        cases = [
+            case_data('/login', extract='token'),
+            case_data('/users', body={'token': '${token}'}),
+            case_data('/health'),
+            case_data('/refresh', extract='token'),
+            case_data('/orders/${token}'),
+        ]
+        shards = split_into_shards(build_dependency_graph(cases), 3)
+        self.assertEqual(shards, [[0, 1, 3, 4], [2]])
+
+    def test_split_into_shards_balances_durations(self):
+        shards = split_into_shards([set(), set(), set(), set()], 2, durations=[10, 1, 2, 8])
+        self.assertEqual(sorted(shards), [[0, 1], [2, 3]])
+
+    def test_get_shard_count(self):
+        self.assertEqual(get_shard_count({'shards': 4}), 4)
+        self.assertEqual(get_shard_count({'shards': 'x'}), 1)
+        self.assertEqual(get_shard_count({'shards': 4, 'cassette': 'replay'}), 1)
+
+    def test_deadline_counts_elapsed_time(self):
+        self.assertTrue(Deadline(60, elapsed=70).expired())
+        self.assertLessEqual(Deadline(60, elapsed=20).remaining(), 40)
+
+
+@override_settings(TEST_SUITE_PLAN_CACHE_ENABLED=False)
+class ShardResultTests(TestCase):
+    """分片结果的保存与合并"""
+
+    def setUp(self):
+        self.suite = create_suite()
+        self.suite_cases = [
+            models.TestSuiteCase.objects.create(
+                suite=self.suite, original_case_id=index + 1, order=index + 1,
+                case_data=json.dumps(case_data(f'/api/{index}'))
+            )
+            for index in range(3)
+        ]
+
+    def test_save_and_merge_shard_results(self):
+        first = save_shard_results('run-1', self.suite, 0, [
+            {'index': 3, 'case_id': 3, 'status': 'PASS'},
+            {'index': 1, 'case_id': 1, 'status': 'FAIL'},
+        ])
+        failed_shard = {'shard_index': 1, 'results': shard_error_results([[1, self.suite_cases[1].id]], 'worker lost')}
+
+        self.assertEqual((first['total_cases'], first['passed_cases'], first['failed_cases']), (2, 1, 1))
+        merged = merge_shard_results([first, failed_shard, None])
+        self.assertEqual([(entry['index'], entry['status']) for entry in merged], [(1, 'FAIL'), (2, 'ERROR'), (3, 'PASS')])
+        self.assertEqual(merged[1]['error'], '分片执行失败: worker lost')
+
+        delete_shard_results('run-1')
+        self.assertFalse(models.TestSuiteShardResult.objects.exists())
+        with self.assertRaises(ValueError):
+            merge_shard_results([first])
+
+    def test_shard_deadline_includes_queue_time(self):
+        shard = plan_suite_shards(self.suite, 1)[0]
+        started_at = (timezone.now() - timedelta(seconds=50)).isoformat()
+        with mock.patch('test_platform.execution.sharding.run_suite_cases', return_value=[]) as run_suite_cases, \
+                mock.patch('test_platform.execution.sharding.warm_up', return_value=None):
+            run_suite_shard(self.suite, None, shard, overrides={'suite_timeout': 60}, started_at=started_at)
+
+        deadline = run_suite_cases.call_args[0][5]
+        self.assertLessEqual(deadline.remaining(), 10)
+        self.assertEqual(len(run_suite_cases.call_args[0][0]), 3)
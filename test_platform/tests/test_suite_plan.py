@@ -0,0 +1,57 @@
+import json
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from test_platform import models
+from test_platform.execution.suite_plan import SuitePlan, SuitePlanCache
+from test_platform.tests.factories import case_data, create_suite
+
+
+@override_settings(TEST_SUITE_PLAN_CACHE_ENABLED=False)
+class SuitePlanCacheTests(TestCase):
+    """套件执行计划缓存的失效"""
+
+    def setUp(self):
+        self.suite = create_suite()
+        self.suite_case = models.TestSuiteCase.objects.create(
+            suite=self.suite, original_case_id=1, order=1, case_data=json.dumps(case_data('/login', extract='token'))
+        )
+        self.cache = SuitePlanCache()
+
+    def test_unchanged_suite_reuses_plan(self):
+        self.assertIs(self.cache.get_plan(self.suite), self.cache.get_plan(self.suite))
+
+    def test_added_case_invalidates_plan(self):
+        plan = self.cache.get_plan(self.suite)
+        models.TestSuiteCase.objects.create(
+            suite=self.suite, original_case_id=2, order=2, case_data=json.dumps(case_data('/users/${token}'))
+        )
+        new_plan = self.cache.get_plan(self.suite)
+        self.assertIsNot(new_plan, plan)
+        self.assertEqual(new_plan.dependencies, [set(), {0}])
+
+    def test_edited_case_invalidates_plan(self):
+        plan = self.cache.get_plan(self.suite)
+        self.suite_case.case_data = json.dumps(case_data('/logout'))
+        self.suite_case.update_time = timezone.now() + timedelta(seconds=1)
+        models.TestSuiteCase.objects.bulk_update([self.suite_case], ['case_data', 'update_time'])
+        new_plan = self.cache.get_plan(self.suite)
+        self.assertNotEqual(new_plan.version, plan.version)
+        self.assertEqual(new_plan.cases[0].case_data['api_path'], '/logout')
+
+    def test_invalid_case_data_is_compiled_as_error(self):
+        models.TestSuiteCase.objects.filter(id=self.suite_case.id).update(
+            case_data='{invalid', update_time=timezone.now() + timedelta(seconds=1)
+        )
+        plan = self.cache.get_plan(self.suite)
+        self.assertIsNone(plan.cases[0].spec)
+        self.assertIn('JSON解析错误', plan.cases[0].error)
+
+    def test_plan_json_round_trip(self):
+        plan = self.cache.get_plan(self.suite)
+        restored = SuitePlan.from_json(plan.suite_id, plan.version, plan.to_json())
+        self.assertEqual(restored.dependencies, plan.dependencies)
+        self.assertEqual(restored.cases[0].spec, plan.cases[0].spec)
+        self.assertEqual(restored.cases[0].original_case_id, 1)
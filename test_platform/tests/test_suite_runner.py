@@ -0,0 +1,82 @@
+import hashlib
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from test_platform.execution.capture import CapturedResponse
+from test_platform.execution.suite_plan import build_compiled_case
+from test_platform.execution.suite_runner import SkipPolicy, run_suite_cases
+from test_platform.tests.factories import case_data
+
+
+class PathStatusClient:
+    """按请求路径返回状态码的 HttpClient 替身"""
+
+    timeout = (3, 10)
+
+    def __init__(self, status_codes):
+        self.status_codes = status_codes
+        self.urls = []
+
+    def request(self, method, url, **kwargs):
+        self.urls.append(url)
+        return CapturedResponse(self.status_codes.get(url, 200), {'Content-Type': 'application/json'}, b'{}', 2,
+                                hashlib.sha256(b'{}').hexdigest())
+
+
+def compiled_cases(*datas):
+    return [build_compiled_case(index + 1, index + 1, data) for index, data in enumerate(datas)]
+
+
+class SkipPolicyTests(SimpleTestCase):
+    """失败即停止与缺少变量时跳过"""
+
+    def test_stop_on_failure(self):
+        policy = SkipPolicy({'stop_on_failure': True})
+        suite_case = compiled_cases(case_data('/users'))[0]
+        policy.record({'case_id': 1, 'status': 'PASS'})
+        policy.record({'case_id': 2, 'status': 'SKIP'})
+        self.assertIsNone(policy.skip_result(0, suite_case, {}))
+
+        policy.record({'case_id': 3, 'status': 'TIMEOUT'})
+        policy.record({'case_id': 4, 'status': 'FAIL'})
+        skipped = policy.skip_result(4, suite_case, {})
+        self.assertEqual((skipped['index'], skipped['status']), (5, 'SKIP'))
+        self.assertEqual(skipped['error'], '用例 ID=3 执行失败，已停止执行后续用例')
+
+    def test_failures_ignored_without_stop_on_failure(self):
+        policy = SkipPolicy({})
+        policy.record({'case_id': 1, 'status': 'ERROR'})
+        self.assertIsNone(policy.skip_result(0, compiled_cases(case_data('/users/${token}'))[0], {}))
+
+    def test_skip_missing_variables(self):
+        policy = SkipPolicy({'skip_missing_variables': True})
+        suite_case = compiled_cases(case_data('/users/${user_id}', body={'token': '${token}'}))[0]
+        self.assertEqual(policy.skip_result(0, suite_case, {'user_id': 1})['error'], '缺少变量: token')
+        self.assertIsNone(policy.skip_result(0, suite_case, {'user_id': 1, 'token': 'abc'}))
+
+
+class RunSuiteCasesTests(SimpleTestCase):
+    """套件用例执行中的跳过规则"""
+
+    def run_cases(self, suite_cases, execution_config, status_codes=None):
+        client = PathStatusClient(status_codes or {})
+        with mock.patch('test_platform.execution.suite_runner.HttpClient', return_value=client):
+            results = run_suite_cases(suite_cases, {case.original_case_id for case in suite_cases}, execution_config)
+        return [result['status'] for result in results], client.urls
+
+    def test_stop_on_failure_skips_remaining_cases(self):
+        suite_cases = compiled_cases(case_data('/a'), case_data('/b'), case_data('/c'))
+        statuses, urls = self.run_cases(suite_cases, {'stop_on_failure': True}, {'/b': 500})
+        self.assertEqual(statuses, ['PASS', 'FAIL', 'SKIP'])
+        self.assertEqual(urls, ['/a', '/b'])
+
+        statuses, urls = self.run_cases(suite_cases, {}, {'/b': 500})
+        self.assertEqual(statuses, ['PASS', 'FAIL', 'PASS'])
+
+    def test_missing_variables_skip_without_request(self):
+        suite_cases = compiled_cases(case_data('/a'), case_data('/orders/${order_id}'))
+        for mode in ('sequential', 'parallel'):
+            statuses, urls = self.run_cases(suite_cases, {'skip_missing_variables': True, 'mode': mode})
+            self.assertEqual(statuses, ['PASS', 'SKIP'])
+            self.assertEqual(urls, ['/a'])
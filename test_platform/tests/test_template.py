@@ -0,0 +1,51 @@
+from django.test import SimpleTestCase
+
+from test_platform.execution.core import CaseSpec, render_request
+from test_platform.execution.template import compile_template, render, template_variables
+
+
+class TemplateTests(SimpleTestCase):
+    """${变量} 模板渲染"""
+
+    def test_single_placeholder_preserves_type(self):
+        context = {'count': 5, 'flag': False, 'items': [1, 2]}
+        self.assertEqual(render('${count}', context, preserve_types=True), 5)
+        self.assertIs(render('${flag}', context, preserve_types=True), False)
+        self.assertEqual(render({'items': '${items}'}, context, preserve_types=True), {'items': [1, 2]})
+        self.assertEqual(render('${count}', context), '5')
+
+    def test_embedded_placeholders_are_stringified(self):
+        self.assertEqual(render('/users/${id}?page=${page}', {'id': 7, 'page': 2}, preserve_types=True),
+                         '/users/7?page=2')
+
+    def test_missing_variable_is_kept(self):
+        self.assertEqual(render('${missing}', {}, preserve_types=True), '${missing}')
+        self.assertEqual(render('a-${missing}-${id}', {'id': 1}), 'a-${missing}-1')
+
+    def test_render_does_not_modify_input(self):
+        data = {'body': ['${id}'], '${id}': 'key'}
+        self.assertEqual(render(data, {'id': 1}), {'body': ['1'], '${id}': 'key'})
+        self.assertEqual(data, {'body': ['${id}'], '${id}': 'key'})
+
+    def test_compiled_templates_are_cached(self):
+        compile_template.cache_clear()
+        render('token=${token}', {'token': 'a'})
+        render('token=${token}', {'token': 'b'})
+        info = compile_template.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+        # 不含占位符的字符串不进入缓存
+        render('plain', {})
+        self.assertEqual(compile_template.cache_info().currsize, 1)
+
+    def test_template_variables(self):
+        self.assertEqual(template_variables({'a': '${x}', 'b': ['${y}-${x}'], 'c': 1}), {'x', 'y'})
+
+
+    def test_render_request(self):
+        spec = CaseSpec(method='POST', url='/users/${id}', headers={'Authorization': 'Bearer ${token}'},
+                        params={'page': '${page}'}, body={'ids': '${ids}', 'note': 'id=${id}'})
+        request = render_request(spec, {'id': 7, 'token': 'abc', 'page': 2, 'ids': [1, 2]})
+        self.assertEqual(request['url'], '/users/7')
+        self.assertEqual(request['headers'], {'Authorization': 'Bearer abc'})
+        self.assertEqual(request['params'], {'page': 2})
+        self.assertEqual(request['body'], {'ids': [1, 2], 'note': 'id=7'})
@@ -0,0 +1,83 @@
+import json
+import logging
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from test_platform.execution.trace import RedisTraceHandler, TraceRecorder, get_trace
+
+
+def case_entry(status='PASS'):
+    return {
+        'index': 1, 'case_id': 11, 'status': status, 'duration': 0.1, 'error': 'x' * 1000 if status != 'PASS' else None,
+        'request': {'url': '/users'}, 'response': {'status_code': 200}
+    }
+
+
+@mock.patch('test_platform.execution.trace._ensure_listener')
+class TraceRecorderTests(SimpleTestCase):
+    """执行追踪的级别与采样"""
+
+    def record_cases(self, execution_config, *entries):
+        recorder = TraceRecorder(execution_config, trace_id='trace-1')
+        with self.assertLogs('test_platform.trace', level='INFO') as logs:
+            recorder.event('suite_started', total_cases=len(entries))
+            for entry in entries:
+                recorder.case(entry)
+        return [record.trace for record in logs.records][1:]
+
+    def test_summary_level_omits_details(self, ensure_listener):
+        event, = self.record_cases({'trace_level': 'summary'}, case_entry())
+        self.assertEqual((event['event'], event['trace_id'], event['seq']), ('case', 'trace-1', 2))
+        self.assertEqual(event['status'], 'PASS')
+        self.assertNotIn('request', event)
+        self.assertNotIn('full', event)
+
+    def test_failures_are_recorded_in_full(self, ensure_listener):
+        event, = self.record_cases({}, case_entry('FAIL'))
+        self.assertTrue(event['full'])
+        self.assertEqual(event['request'], {'url': '/users'})
+        self.assertEqual(len(event['error']), 1000)
+
+        event, = self.record_cases({'trace_full_on_failure': False}, case_entry('FAIL'))
+        self.assertNotIn('full', event)
+        self.assertEqual(len(event['error']), 500)
+
+    def test_sampling(self, ensure_listener):
+        with mock.patch('test_platform.execution.trace.random.random', side_effect=[0.05, 0.5]):
+            sampled, skipped = self.record_cases({'trace_sample_rate': 0.1}, case_entry(), case_entry())
+        self.assertTrue(sampled['full'])
+        self.assertNotIn('full', skipped)
+
+    def test_full_level(self, ensure_listener):
+        event, = self.record_cases({'trace_level': 'full'}, case_entry())
+        self.assertTrue(event['full'])
+
+    def test_off_level_records_nothing(self, ensure_listener):
+        recorder = TraceRecorder({'trace_level': 'off'})
+        with mock.patch.object(TraceRecorder, '_emit') as emit:
+            recorder.event('suite_started')
+            recorder.case(case_entry('FAIL'))
+        emit.assert_not_called()
+
+
+class TraceStoreTests(SimpleTestCase):
+    """追踪事件的 Redis 存储"""
+
+    @mock.patch('test_platform.execution.trace.get_redis')
+    def test_handler_appends_and_trims(self, get_redis):
+        pipe = get_redis.return_value.pipeline.return_value
+        handler = RedisTraceHandler({'max_events': 10, 'ttl': 60})
+        record = logging.makeLogRecord({'trace': {'trace_id': 'trace-1', 'event': 'case', 'seq': 1}})
+        handler.emit(record)
+
+        key = 'test_platform:trace:trace-1'
+        pipe.rpush.assert_called_once_with(key, json.dumps({'trace_id': 'trace-1', 'event': 'case', 'seq': 1}))
+        pipe.ltrim.assert_called_once_with(key, 0, 9)
+        pipe.expire.assert_called_once_with(key, 60)
+
+    @mock.patch('test_platform.execution.trace.get_redis')
+    def test_get_trace_skips_invalid_events(self, get_redis):
+        get_redis.return_value.lrange.return_value = ['{"seq": 1}', 'invalid', '{"seq": 2}']
+        self.assertEqual(get_trace('trace-1', offset=0, limit=3), [{'seq': 1}, {'seq': 2}])
+        get_redis.return_value.lrange.assert_called_once_with('test_platform:trace:trace-1', 0, 2)
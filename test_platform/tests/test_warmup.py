@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from test_platform.execution.warmup import DnsCache, collect_origins, warm_up
+
+
+class FakeResolver:
+    """替代 socket.getaddrinfo，记录实际解析的主机"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, host, port, family=0, type=0, proto=0, flags=0):
+        self.calls.append(host)
+        return [(2, 1, 6, '', (f'10.0.0.{len(self.calls)}', port))]
+
+
+class DnsCacheTests(SimpleTestCase):
+    """预热主机的DNS缓存"""
+
+    def setUp(self):
+        self.resolver = FakeResolver()
+        self.cache = DnsCache()
+        self.cache._original = self.resolver
+        self.cache._hosts.add('api.example.com')
+
+    def test_registered_host_is_cached(self):
+        first = self.cache._getaddrinfo('api.example.com', 443)
+        self.assertEqual(self.cache._getaddrinfo('API.example.com', 443), first)
+        self.assertEqual(self.resolver.calls, ['api.example.com'])
+        # 端口不同时分别缓存
+        self.cache._getaddrinfo('api.example.com', 80)
+        self.assertEqual(len(self.resolver.calls), 2)
+
+    def test_other_hosts_are_not_cached(self):
+        self.cache._getaddrinfo('db.internal', 3306)
+        self.cache._getaddrinfo('db.internal', 3306)
+        self.assertEqual(self.resolver.calls, ['db.internal', 'db.internal'])
+
+    @override_settings(TEST_HTTP_POOL={'dns_cache_ttl': 0})
+    def test_expired_entry_is_resolved_again(self):
+        self.cache._getaddrinfo('api.example.com', 443)
+        self.cache._getaddrinfo('api.example.com', 443)
+        self.assertEqual(len(self.resolver.calls), 2)
+
+
+class WarmupTests(SimpleTestCase):
+    """执行前的预热"""
+
+    def suite_cases(self, *paths):
+        return [SimpleNamespace(case_data={'api_path': path}) for path in paths]
+
+    def test_collect_origins(self):
+        suite_cases = self.suite_cases(
+            'https://api.example.com/users', '/relative', 'https://api.example.com/orders',
+            'http://${host}/x', 'http://10.0.0.1:8080/health'
+        )
+        self.assertEqual(collect_origins(None, suite_cases), ['https://api.example.com', 'http://10.0.0.1:8080'])
+
+    def test_disabled_or_replay(self):
+        suite_cases = self.suite_cases('https://api.example.com/users')
+        self.assertIsNone(warm_up(None, suite_cases, {}))
+        self.assertIsNone(warm_up(None, suite_cases, {'warmup': True, 'cassette': 'replay'}))
+
+    @mock.patch('test_platform.execution.warmup.dns_cache')
+    def test_dns_only_warmup_for_asyncio(self, dns_cache):
+        dns_cache.resolve.return_value = ['10.0.0.5']
+        report = warm_up(None, self.suite_cases('https://api.example.com/users', 'http://10.0.0.1/x'),
+                         {'warmup': True, 'backend': 'asyncio'})
+
+        dns_cache.resolve.assert_called_once_with('api.example.com', 443)
+        self.assertEqual([(host['origin'], host['addresses'], host['connections']) for host in report['hosts']], [
+            ('https://api.example.com', ['10.0.0.5'], 0),
+            ('http://10.0.0.1', ['10.0.0.1'], 0),
+        ])
@@ -2,11 +2,12 @@ from django.urls import path
 from test_platform.views.login_views import LoginView, RegisterView, UserInfoView
 from test_platform.views.project_view import ProjectView, get_project_list, ProjectEditView, ProjectDeleteView
 from test_platform.views.test_case_view import TestCaseView, TestEnvironmentView, TestCaseImportView, \
-    TestEnvironmentCoverView, TestSuiteView, EnvironmentSwitchView
+    TestEnvironmentCoverView, TestSuiteView, EnvironmentSwitchView, SuiteRunStatusView, SuiteRerunView, \
+    SuitePredictView, SuiteMatrixView
 from test_platform.views import execute
-from test_platform.views.report_view import TestReportView
+from test_platform.views.report_view import TestReportView, CaseResultStatsView, LoadTestReportView
 from test_platform.views.statistics_view import TestTrendView
-from test_platform.views.log_view import ExecutionLogView
+from test_platform.views.log_view import ExecutionLogView, ExecutionTraceView
 from test_platform.views.test_plan_view import TestPlanView
 from test_platform.views.mindmap_view import MindMapView
 from test_platform.views.rag_view import (
@@ -16,6 +17,7 @@ from test_platform.views.rag_view import (
 )
 from test_platform.views.agent_view import file_parse, save_deepseek_config, get_deepseek_config, create_test_case, export_test_cases, edit_test_case, batch_edit_test_cases, save_analysis_result, get_analysis_results, get_analysis_result_detail
 from test_platform.views.assistant_view import chat_stream
+from test_platform.views.progress_view import progress_stream
 from django.http import JsonResponse
 
 urlpatterns = [
@@ -68,6 +70,11 @@ urlpatterns = [
     path('api/suite/delete/<int:suite_id>', TestSuiteView.as_view(), name='suite_delete'),
     path('api/suite', TestSuiteView.as_view(), name='suite_list_all'),
     path('api/suite/execute/<int:suite_id>', TestSuiteView.as_view(), name='suite_execute'),
+    path('api/suite/run/<str:run_id>', SuiteRunStatusView.as_view(), name='suite_run_status'),
+    path('api/suite/rerun/<int:result_id>', SuiteRerunView.as_view(), name='suite_rerun'),
+    path('api/suite/predict/<int:suite_id>', SuitePredictView.as_view(), name='suite_predict'),
+    path('api/suite/matrix/<int:suite_id>', SuiteMatrixView.as_view(), name='suite_matrix'),
+    path('api/progress/stream', progress_stream, name='progress_stream'),
     path('api/suite/detail/<int:suite_id>', execute.get_suite_detail, name='suite_detail_view'),
     
     # 测试报告相关路由
@@ -76,6 +83,9 @@ urlpatterns = [
     path('api/report/detail/<int:result_id>', TestReportView.as_view(), name='report_detail'),
     path('api/report/delete/<int:result_id>', TestReportView.as_view(), name='report_delete'),
     path('api/report/response/<int:result_id>', execute.get_suite_result_response, name='suite_result_response'),
+    path('api/report/case-stats', CaseResultStatsView.as_view(), name='report_case_stats'),
+    path('api/report/load/<int:load_id>', LoadTestReportView.as_view(), name='report_load_detail'),
+    path('api/report/load/list/<int:suite_id>', LoadTestReportView.as_view(), name='report_load_list'),
     
     # 测试脑图相关路由
     path('api/mindmap/save', MindMapView.as_view(), name='mindmap_save'),
@@ -89,6 +99,9 @@ urlpatterns = [
     # 执行日志相关路由
     path('api/log', ExecutionLogView.as_view(), name='execution_log_list'),
     path('api/log/<int:result_id>', ExecutionLogView.as_view(), name='execution_log_detail'),
+
+    # 执行追踪路由
+    path('api/trace/<str:trace_id>', ExecutionTraceView.as_view(), name='execution_trace'),
     
     # 测试计划相关路由
     path('api/test-plan/', TestPlanView.as_view(), name='test_plan_create'),
@@ -2,12 +2,20 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 import json
-import requests
-from test_platform.models import TestCase, TestResult, TestSuite, TestSuiteCase, TestSuiteResult, TestExecutionLog
+import logging
+from test_platform.models import TestCase, TestResult, TestSuite, TestSuiteCase, TestSuiteResult, TestExecutionLog, TestEnvironment
 from django.utils import timezone
 from django.db import connection
 import pytz
-import time
+from test_platform.execution.core import BODY_METHODS, CaseSpec, execute_case
+from test_platform.execution.blob_store import pack, pack_value, unpack_json
+from test_platform.execution.capture import truncate_for_storage
+from test_platform.execution.config import resolve_execution_config
+from test_platform.execution.http_pool import HttpClient
+from test_platform.execution.retry import RetryBudget, RetryPolicy
+from test_platform.execution.trace import TraceRecorder, result_trace_entry
+
+logger = logging.getLogger(__name__)
 
 
 @csrf_exempt
@@ -29,7 +37,7 @@ def get_suite_result_response(request, result_id):
 
         # 解析结果数据
         try:
-            result_data = json.loads(suite_result.result_data) if suite_result.result_data else {}
+            result_data = unpack_json(suite_result.result_data) if suite_result.result_data else {}
         except json.JSONDecodeError:
             result_data = {}
 
@@ -104,7 +112,9 @@ def get_suite_detail(request, suite_id):
     try:
         # 获取测试套件
         try:
-            test_suite = TestSuite.objects.get(suite_id=suite_id)
+            test_suite = TestSuite.objects.select_related(
+                'environment', 'project', 'creator'
+            ).get(suite_id=suite_id)
         except TestSuite.DoesNotExist:
             return JsonResponse({
                 'code': 404,
@@ -113,17 +123,25 @@ def get_suite_detail(request, suite_id):
             }, status=404, charset='utf-8')
 
         # 获取套件关联的测试用例
-        suite_cases = test_suite.suite_cases.all().order_by('order')
+        suite_cases = list(test_suite.suite_cases.all().order_by('order'))
 
-        # 准备用例数据
-        case_list = []
+        # 解析套件中保存的用例数据，缺少数据的用例一次性从原始用例表加载
+        parsed_case_datas = []
         for suite_case in suite_cases:
-            # 获取用例数据，优先使用套件中的case_data
             try:
-                case_data = json.loads(suite_case.case_data) if suite_case.case_data else {}
+                parsed_case_datas.append(json.loads(suite_case.case_data) if suite_case.case_data else {})
             except json.JSONDecodeError:
-                case_data = {}
+                parsed_case_datas.append({})
+        original_cases = TestCase.objects.in_bulk([
+            suite_case.original_case_id
+            for suite_case, case_data in zip(suite_cases, parsed_case_datas) if not case_data
+        ])
+        backfilled_suite_cases = []
 
+        # 准备用例数据
+        case_list = []
+        for suite_case, case_data in zip(suite_cases, parsed_case_datas):
+            # 获取用例数据，优先使用套件中的case_data
             if case_data:
                 # 如果套件中有数据，直接使用
                 case_list.append({
@@ -142,9 +160,8 @@ def get_suite_detail(request, suite_id):
                 })
             else:
                 # 如果套件中没有数据，尝试从原始测试用例获取
-                try:
-                    case = TestCase.objects.get(test_case_id=suite_case.original_case_id)
-
+                case = original_cases.get(suite_case.original_case_id)
+                if case is not None:
                     # 解析 JSON 字段
                     try:
                         headers = json.loads(case.case_request_headers) if case.case_request_headers else {}
@@ -189,7 +206,9 @@ def get_suite_detail(request, suite_id):
 
                     # 将数据保存到测试套件中，便于下次使用
                     suite_case.case_data = json.dumps(case_data)
-                    suite_case.save()
+                    # bulk_update 不会触发 auto_now，手动更新时间使执行计划缓存（按 update_time 区分版本）失效
+                    suite_case.update_time = timezone.now()
+                    backfilled_suite_cases.append(suite_case)
 
                     case_list.append({
                         'case_id': case.test_case_id,
@@ -208,9 +227,9 @@ def get_suite_detail(request, suite_id):
                         'expected': case.case_expect_result,
                         'case_assert_contents': assert_contents,
                         'extractors': extractors,
-                        'environment_cover_id': case.environment_cover_id
+                        'environment_cover_id': test_suite.environment_cover_id
                     })
-                except TestCase.DoesNotExist:
+                else:
                     # 如果原始用例不存在，使用最小数据集
                     case_list.append({
                         'case_id': suite_case.original_case_id,
@@ -228,6 +247,9 @@ def get_suite_detail(request, suite_id):
                         'is_missing': True  # 标记原始用例不存在
                     })
 
+        if backfilled_suite_cases:
+            TestSuiteCase.objects.bulk_update(backfilled_suite_cases, ['case_data', 'update_time'])
+
         # 准备环境信息
         env_info = None
         if test_suite.environment:
@@ -388,7 +410,7 @@ def try_json_dumps(data, default_message='无法序列化数据'):
         return json.dumps(data, ensure_ascii=False)
     except Exception as e:
         # 处理所有可能的编码错误
-        print(f"JSON序列化错误: {str(e)}")
+        logger.warning("JSON序列化错误: %s", e)
 
         # 尝试将包含问题字符的值转换为字符串表示
         if isinstance(data, dict):
@@ -424,137 +446,63 @@ def set_timezone():
         with connection.cursor() as cursor:
             cursor.execute("SET time_zone = '+08:00'")
     except:
-        print("设置时区失败，使用默认时区")
+        logger.warning("设置时区失败，使用默认时区")
 
 
-def replace_variables(data, context):
+def format_response_body(result):
     """
-    递归替换数据中的${变量名}为上下文中的实际值
+    按内容类型格式化响应体，用于单用例执行结果的展示
 
     参数:
-        data: 要处理的数据(可以是字典、列表、字符串)
-        context: 变量上下文字典
+        result: CaseResult 执行结果
 
     返回:
-        替换变量后的数据
+        JSON响应返回解析后的对象，其他类型返回带类型标记的文本内容
     """
-    if isinstance(data, dict):
-        result = {}
-        for key, value in data.items():
-            result[key] = replace_variables(value, context)
-        return result
-    elif isinstance(data, list):
-        return [replace_variables(item, context) for item in data]
-    elif isinstance(data, str):
-        # 替换字符串中的${变量名}
-        import re
-        variable_pattern = r'\${([^}]+)}'
-        matches = re.findall(variable_pattern, data)
-
-        replaced_data = data
-        for var_name in matches:
-            if var_name in context:
-                # 替换为实际值
-                replaced_data = replaced_data.replace(f'${{{var_name}}}', str(context[var_name]))
-        return replaced_data
-    else:
-        return data
-
-
-def handle_variable_extraction(response_data, extractors):
+    content_type = result.content_type
+    if 'application/json' in content_type:
+        return result.stored_body()
+    content = truncate_for_storage(result.raw_text.strip())[0]
+    if 'text/html' in content_type:
+        # 对 HTML 内容进行格式化
+        return {
+            'type': 'html',
+            'content': content,
+            'formatted': True
+        }
+    if 'text/plain' in content_type:
+        return {
+            'type': 'text',
+            'content': content
+        }
+    return {
+        'type': content_type,
+        'content': content
+    }
+
+
+def single_case_retry(case_retry=None):
     """
-    从响应中提取变量
+    单用例执行的重试策略和重试预算（取自默认执行配置）
 
     参数:
-        response_data: 响应数据，可以是响应体或完整的响应信息对象
-        extractors: 提取器配置列表
-
-    返回:
-        提取的变量字典 {变量名: 变量值} 和错误信息
+        case_retry: 请求中指定的重试配置，覆盖默认配置
     """
-    extracted_vars = {}
-    error_message = None
+    execution_config = resolve_execution_config()
+    return (
+        RetryPolicy.from_config(execution_config, case_retry if isinstance(case_retry, dict) else None),
+        RetryBudget(execution_config.get('retry_budget'))
+    )
 
-    # 如果extractors不是合法的格式，直接返回空结果
-    if not extractors:
-        return extracted_vars, None
 
-    # 尝试解析extractors为JSON
-    if isinstance(extractors, str):
-        try:
-            extractors = json.loads(extractors)
-        except json.JSONDecodeError:
-            error_message = "提取器格式错误：不是有效的JSON格式"
-            return extracted_vars, error_message
-
-    if not isinstance(extractors, list):
-        error_message = "提取器格式错误：不是有效的列表格式"
-        return extracted_vars, error_message
-
-    # 确定响应体
-    if isinstance(response_data, dict) and 'body' in response_data:
-        # 如果传入的是完整的响应信息对象
-        response_body = response_data.get('body', {})
-    else:
-        # 如果直接传入的是响应体
-        response_body = response_data
-
-    # 如果响应体不是一个可提取的格式，直接返回错误
-    if not (isinstance(response_body, dict) or isinstance(response_body, list) or isinstance(response_body, str)):
-        error_message = "响应体格式不支持变量提取"
-        return extracted_vars, error_message
-
-    for extractor in extractors:
-        if not isinstance(extractor, dict):
-            continue
-
-        # 检查提取器是否启用
-        if not extractor.get('enabled', True):
-            continue
-
-        name = extractor.get('name')
-        expression = extractor.get('expression')
-        extractor_type = extractor.get('type', 'jsonpath')
-        default_value = extractor.get('defaultValue', '')
-
-        if name and expression:
-            # 根据提取器类型提取变量
-            if extractor_type == 'jsonpath':
-                import jsonpath_ng.ext as jsonpath
-                try:
-                    if isinstance(response_body, dict) or isinstance(response_body, list):
-                        json_expr = jsonpath.parse(expression)
-                        matches = [match.value for match in json_expr.find(response_body)]
-                        if matches:
-                            # 存储提取的变量
-                            extracted_vars[name] = matches[0]
-                            print(f"成功提取变量 {name} = {matches[0]}")
-                        else:
-                            # 使用默认值
-                            extracted_vars[name] = default_value
-                            print(f"未找到匹配值，使用默认值 {name} = {default_value}")
-                    else:
-                        # 如果响应体不是JSON格式，使用默认值
-                        extracted_vars[name] = default_value
-                        print(f"响应体不是JSON格式，使用默认值 {name} = {default_value}")
-                except Exception as e:
-                    error_msg = f"提取器'{name}'执行失败: {str(e)}"
-                    print(error_msg)
-                    extracted_vars[name] = default_value
-                    if not error_message:
-                        error_message = error_msg
-
-            # 可以添加其他类型的提取器支持，如正则表达式等
-
-    return extracted_vars, error_message
-
-
-def get_suite_case_data(suite_case):
+def get_suite_case_data(suite_case, original_cases=None):
     """
     从测试套件用例中获取执行所需的所有数据，优先使用套件中的case_data
 
     参数:
         suite_case: TestSuiteCase对象
+        original_cases: 预先批量加载的原始用例字典 {test_case_id: TestCase}，
+                        处理整个套件时传入，避免逐个查询原始用例
 
     返回:
         包含完整测试用例数据的字典
@@ -568,9 +516,12 @@ def get_suite_case_data(suite_case):
     # 设置必要的默认值
     if not case_data:
         # 如果没有套件数据，尝试从原始用例中获取数据
-        try:
-            original_case = TestCase.objects.get(test_case_id=suite_case.original_case_id)
+        if original_cases is not None:
+            original_case = original_cases.get(suite_case.original_case_id)
+        else:
+            original_case = TestCase.objects.filter(test_case_id=suite_case.original_case_id).first()
 
+        if original_case is not None:
             # 解析 JSON 字段
             try:
                 headers = json.loads(original_case.case_request_headers) if original_case.case_request_headers else {}
@@ -606,7 +557,7 @@ def get_suite_case_data(suite_case):
                 'extractors': extractors,
                 'original_case_id': suite_case.original_case_id
             }
-        except TestCase.DoesNotExist:
+        else:
             # 如果原始用例也不存在，则提供最小默认值
             case_data = {
                 'title': f'未知用例 {suite_case.original_case_id}',
@@ -643,297 +594,32 @@ def execute_test(request, case_id):
                 'message': '测试用例不存在'
             }, status=404, charset='utf-8')
 
-        # 执行接口请求
-        try:
-            # 准备请求数据
-            url = test_case.case_path
-            method = test_case.case_request_method
-
-            # 安全解析 headers
-            try:
-                headers = json.loads(test_case.case_request_headers) if test_case.case_request_headers else {}
-            except json.JSONDecodeError:
-                headers = {}
-
-            # 安全解析 body
-            try:
-                body = json.loads(test_case.case_requests_body) if test_case.case_requests_body else None
-            except json.JSONDecodeError:
-                body = test_case.case_requests_body
-
-            # 安全解析 params
-            try:
-                params = json.loads(test_case.case_params) if test_case.case_params else None
-            except json.JSONDecodeError:
-                params = test_case.case_params
-
-            # 打印请求详情，便于调试
-            print("===== 测试用例执行 =====")
-            print(f"用例ID: {case_id}")
-            print(f"用例名称: {test_case.case_name}")
-            print(f"请求方法: {method}")
-            print(f"请求URL: {url}")
-            print(f"请求参数: {params}")
-            print(f"请求头: {headers}")
-            if method in ['POST', 'PUT', 'PATCH']:
-                print(f"请求体: {body}")
-
-            # 发送请求
-            start_time = timezone.localtime(timezone.now())  # 使用本地时间(北京时间)
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=body if method in ['POST', 'PUT', 'PATCH'] else None,
-                params=params if method == 'GET' else None
-            )
-            response.encoding = 'utf-8'
-            end_time = timezone.localtime(timezone.now())  # 使用本地时间(北京时间)
-            duration = (end_time - start_time).total_seconds()
-
-            # 首先根据HTTP状态码判断响应状态
-            is_http_success = 200 <= response.status_code < 300
-
-            # 获取响应内容
-            content_type = response.headers.get('Content-Type', '')
+        # 准备请求数据
+        spec = CaseSpec.from_test_case(test_case)
+        url = spec.url
+        method = spec.method
+        headers = spec.headers
+        params = spec.params
+        body = spec.body
+
+        # 执行接口请求，瞬时故障按默认重试策略重试
+        retry_policy, retry_budget = single_case_retry()
+        result = execute_case(spec, retry_policy=retry_policy, retry_budget=retry_budget)
+        # 请求详情记录在执行追踪中，通过 /api/trace/<trace_id> 查看
+        tracer = TraceRecorder(resolve_execution_config())
+        tracer.case(result_trace_entry(spec, result, test_case.case_name))
+
+        if result.error is None:
+            start_time = result.started_at
+            duration = result.duration
+            content_type = result.content_type
 
             # 处理响应体
-            try:
-                if 'application/json' in content_type:
-                    response_body = response.json()
-                elif 'text/html' in content_type:
-                    # 对 HTML 内容进行格式化
-                    response_body = {
-                        'type': 'html',
-                        'content': response.text.strip(),
-                        'formatted': True
-                    }
-                elif 'text/plain' in content_type:
-                    response_body = {
-                        'type': 'text',
-                        'content': response.text.strip()
-                    }
-                else:
-                    response_body = {
-                        'type': content_type,
-                        'content': response.text.strip()
-                    }
-            except Exception as e:
-                response_body = {
-                    'type': 'error',
-                    'content': str(e),
-                    'raw_content': response.text
-                }
-
-            # 处理测试断言
-            assertion_results = []
-            has_assertions = False
-            assertions_passed = True
-            assertion_error = None
-
-            # 检查是否有测试断言 - 直接从测试用例中获取
-            try:
-                # 判断case_tests字段是否有值
-                has_assertions = bool(test_case.case_tests and test_case.case_tests.strip())
-
-                # 如果有断言表达式，则执行断言判断
-                if has_assertions:
-                    print(f"发现测试断言表达式: {test_case.case_tests}")
+            response_body = format_response_body(result)
 
-                    # 解析断言表达式
-                    test_assertions = []
-                    try:
-                        # 尝试解析JSON格式断言
-                        test_assertions = json.loads(test_case.case_tests)
-                        if not isinstance(test_assertions, list):
-                            test_assertions = [test_assertions]
-                    except json.JSONDecodeError:
-                        # 如果不是JSON格式，尝试解析简单表达式
-                        simple_assertion = test_case.case_tests.strip()
-
-                        # 处理简单断言表达式
-                        if simple_assertion.startswith("=="):
-                            # 状态码等于断言
-                            expected_value = simple_assertion[2:].strip()
-                            test_assertions = [{
-                                "type": "status_code",
-                                "expect": expected_value,
-                                "actual": "status_code"
-                            }]
-                        elif simple_assertion.startswith("contains"):
-                            # 包含断言
-                            expected_value = simple_assertion[8:].strip()
-                            test_assertions = [{
-                                "type": "contains",
-                                "expect": expected_value,
-                                "actual": ""
-                            }]
-                        elif "$." in simple_assertion:
-                            # JSONPath断言
-                            parts = simple_assertion.split("==")
-                            if len(parts) == 2:
-                                jsonpath = parts[0].strip()
-                                expected = parts[1].strip()
-                                test_assertions = [{
-                                    "type": "jsonpath",
-                                    "expect": expected,
-                                    "actual": jsonpath
-                                }]
-
-                    # 导入jsonpath模块用于解析JSON数据
-                    import jsonpath_ng.ext as jsonpath
-                    import re
-
-                    # 逐个执行断言
-                    for assertion in test_assertions:
-                        assertion_type = assertion.get('type', '')
-                        expect = assertion.get('expect', '')
-                        actual = assertion.get('actual', '')
-
-                        # 不同类型的断言处理
-                        if assertion_type == 'jsonpath':
-                            # 使用jsonpath提取实际值
-                            try:
-                                json_expr = jsonpath.parse(actual)
-                                matches = [match.value for match in json_expr.find(response_body)]
-                                actual_value = matches[0] if matches else None
-
-                                # 比较预期值和实际值
-                                if actual_value is not None:
-                                    # 尝试将字符串转换为相应类型进行比较
-                                    try:
-                                        if isinstance(actual_value, (int, float)):
-                                            expect_value = float(expect)
-                                        elif isinstance(actual_value, bool):
-                                            expect_value = expect.lower() == 'true'
-                                        else:
-                                            expect_value = expect
-
-                                        assertion_pass = actual_value == expect_value
-                                    except:
-                                        # 如果转换失败，直接比较字符串
-                                        assertion_pass = str(actual_value) == expect
-                                else:
-                                    assertion_pass = False
-
-                                assertion_results.append({
-                                    'type': assertion_type,
-                                    'expect': expect,
-                                    'actual': actual,
-                                    'actual_value': actual_value,
-                                    'success': assertion_pass,
-                                    'message': '断言通过' if assertion_pass else f'断言失败: 期望值 {expect}, 实际值 {actual_value}'
-                                })
-
-                                if not assertion_pass:
-                                    assertions_passed = False
-                                    assertion_error = f'JsonPath断言失败: {actual} 的值 {actual_value} 不等于期望值 {expect}'
-                            except Exception as e:
-                                assertions_passed = False
-                                error_msg = f'JsonPath断言执行异常: {str(e)}'
-                                assertion_results.append({
-                                    'type': assertion_type,
-                                    'expect': expect,
-                                    'actual': actual,
-                                    'success': False,
-                                    'message': error_msg
-                                })
-                                assertion_error = error_msg
-
-                        elif assertion_type == 'status_code':
-                            # 校验HTTP状态码
-                            actual_status = response.status_code
-                            expected_status = int(expect)
-                            assertion_pass = actual_status == expected_status
-
-                            assertion_results.append({
-                                'type': assertion_type,
-                                'expect': expected_status,
-                                'actual': actual_status,
-                                'success': assertion_pass,
-                                'message': '断言通过' if assertion_pass else f'断言失败: 期望状态码 {expected_status}, 实际状态码 {actual_status}'
-                            })
-
-                            if not assertion_pass:
-                                assertions_passed = False
-                                assertion_error = f'状态码断言失败: 期望 {expected_status}, 实际 {actual_status}'
-
-                        elif assertion_type == 'contains':
-                            # 检查响应文本是否包含指定内容
-                            response_text = response.text
-                            assertion_pass = expect in response_text
-
-                            assertion_results.append({
-                                'type': assertion_type,
-                                'expect': expect,
-                                'actual': '响应文本',
-                                'success': assertion_pass,
-                                'message': '断言通过' if assertion_pass else f'断言失败: 响应文本不包含 {expect}'
-                            })
-
-                            if not assertion_pass:
-                                assertions_passed = False
-                                assertion_error = f'包含断言失败: 响应文本不包含 {expect}'
-
-                        elif assertion_type == 'regex':
-                            # 正则表达式匹配
-                            response_text = response.text
-                            try:
-                                pattern = re.compile(expect)
-                                assertion_pass = bool(pattern.search(response_text))
-
-                                assertion_results.append({
-                                    'type': assertion_type,
-                                    'expect': expect,
-                                    'actual': '响应文本',
-                                    'success': assertion_pass,
-                                    'message': '断言通过' if assertion_pass else f'断言失败: 响应文本不匹配正则表达式 {expect}'
-                                })
-
-                                if not assertion_pass:
-                                    assertions_passed = False
-                                    assertion_error = f'正则断言失败: 响应文本不匹配 {expect}'
-                            except re.error as e:
-                                assertions_passed = False
-                                error_msg = f'正则表达式错误: {str(e)}'
-                                assertion_results.append({
-                                    'type': assertion_type,
-                                    'expect': expect,
-                                    'actual': '响应文本',
-                                    'success': False,
-                                    'message': error_msg
-                                })
-                                assertion_error = error_msg
-
-                        # 修复：如果有断言定义但没有执行任何断言（结果为空），则使用HTTP状态码判断
-                        if has_assertions and not assertion_results:
-                            assertions_passed = is_http_success
-                            if not is_http_success:
-                                assertion_error = f'HTTP状态码: {response.status_code} 不在成功范围内'
-
-                            # 添加一个默认的HTTP状态码断言结果
-                            assertion_results.append({
-                                'type': 'status_code',
-                                'expect': '200-299',
-                                'actual': response.status_code,
-                                'success': is_http_success,
-                                'message': '断言通过' if is_http_success else f'断言失败: HTTP状态码 {response.status_code} 不在成功范围内'
-                            })
-
-            except Exception as e:
-                print(f"断言处理发生异常: {str(e)}")
-                # 断言处理异常，不影响原有逻辑，仍然根据HTTP状态码判断
-                has_assertions = False
-
-            # 根据是否有断言和断言结果判断最终状态
-            if has_assertions:
-                # 使用断言结果判断
-                status = 'PASS' if assertions_passed else 'FAIL'
-                is_success = assertions_passed
-            else:
-                # 没有断言，使用HTTP状态码判断
-                status = 'PASS' if is_http_success else 'FAIL'
-                is_success = is_http_success
+            status = result.status
+            assertions = result.assertions
+            error_message = result.failure_message
 
             # 记录测试结果
             result_data = {
@@ -945,18 +631,15 @@ def execute_test(request, case_id):
                     'body': body
                 },
                 'response': {
-                    'status_code': response.status_code,
-                    'headers': dict(response.headers),
+                    'status_code': result.status_code,
+                    'headers': result.headers,
                     'content_type': content_type,
                     'body': response_body,
                     'response_time': duration
                 },
-                'assertions': {
-                    'has_assertions': has_assertions,
-                    'all_passed': assertions_passed,
-                    'results': assertion_results,
-                    'error': assertion_error
-                }
+                'assertions': assertions,
+                'attempts': result.attempts,
+                'retries': result.retries
             }
 
             # 创建测试结果记录
@@ -965,11 +648,8 @@ def execute_test(request, case_id):
                 execution_time=start_time,
                 status=status,
                 duration=duration,
-                result_data=try_json_dumps(result_data),
-                error_message=None if is_success else (
-                    assertion_error if has_assertions and not assertions_passed
-                    else f'HTTP状态码: {response.status_code}'
-                )
+                result_data=try_json_dumps(pack(result_data)),
+                error_message=error_message
             )
 
             # 获取test_result_id用于后续使用
@@ -993,9 +673,6 @@ def execute_test(request, case_id):
                 if not is_automation and hasattr(request, 'GET'):
                     is_automation = request.GET.get('is_automation') == 'true'
 
-                # 打印检测结果
-                print(f"自动化检测结果: is_automation={is_automation}")
-
                 # 只有在单接口执行时才创建日志（自动化接口执行时不创建单独的日志）
                 if not is_automation:
                     # 创建日志记录
@@ -1008,59 +685,43 @@ def execute_test(request, case_id):
                         request_method=method,
                         request_headers=try_json_dumps(headers),
                         request_body=try_json_dumps(body),
-                        response_status_code=response.status_code,
-                        response_headers=try_json_dumps(dict(response.headers)),
-                        response_body=try_json_dumps(response_body),
+                        response_status_code=result.status_code,
+                        response_headers=try_json_dumps(result.headers),
+                        response_body=try_json_dumps(pack_value(response_body)),
                         log_detail=f"执行测试用例: {test_case.case_name}",
-                        error_message=None if is_success else (
-                            assertion_error if has_assertions and not assertions_passed
-                            else f'HTTP状态码: {response.status_code}'
-                        ),
-                        extracted_variables=try_json_dumps(
-                            handle_variable_extraction(response_body, test_case.case_extractors)[0]),
+                        error_message=error_message,
+                        extracted_variables=try_json_dumps(result.extracted_variables),
                         assertion_results=try_json_dumps({
-                            'has_assertions': has_assertions,
-                            'all_passed': assertions_passed,
-                            'results': assertion_results
+                            'has_assertions': assertions['has_assertions'],
+                            'all_passed': assertions['all_passed'],
+                            'results': assertions['results']
                         })
                     )
-                    print(f"已创建执行日志: ID={log.log_id}，关联测试结果ID={test_result_id}")
-                else:
-                    print(f"自动化接口执行，跳过创建单独的执行日志")
+                    logger.debug("已创建执行日志: ID=%s，关联测试结果ID=%s", log.log_id, test_result_id)
             except Exception as log_error:
-                print(f"处理日志记录时出错: {str(log_error)}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("处理日志记录时出错: %s", log_error)
 
             # 更新测试用例的执行时间和状态
             try:
-                print(f"当前时间: {timezone.localtime(timezone.now())}")
                 # 使用update方法只更新必要的字段，避免清空其他字段
                 current_time = timezone.localtime(timezone.now())
-                
+
                 # 使用Django ORM的update方法，只更新状态相关字段
                 TestCase.objects.filter(test_case_id=case_id).update(
                     last_executed_at=current_time,
                     last_execution_result=status.lower(),
-                    last_assertion_results=try_json_dumps({
-                        'has_assertions': has_assertions,
-                        'all_passed': assertions_passed,
-                        'results': assertion_results,
-                        'error': assertion_error
-                    }),
+                    last_assertion_results=try_json_dumps(assertions),
                     update_time=current_time
                 )
-
-                updated_case = TestCase.objects.get(test_case_id=case_id)
-                print(f"更新后状态: {updated_case.last_executed_at}, {updated_case.last_execution_result}")
             except Exception as e:
-                print(f"更新测试用例状态失败: {str(e)}")
+                logger.warning("更新测试用例状态失败: %s", e)
 
             return JsonResponse({
                 'success': True,
                 'message': '测试用例执行成功',
                 'data': {
                     'result_id': test_result_id,
+                    'trace_id': tracer.trace_id,
                     'status': status,
                     'duration': duration,
                     'execution_time': start_time.strftime('%Y-%m-%d %H:%M:%S'),
@@ -1072,37 +733,41 @@ def execute_test(request, case_id):
                         'body': body
                     },
                     'response': {
-                        'status_code': response.status_code,
+                        'status_code': result.status_code,
                         'content_type': content_type,
                         'response_time': duration,
-                        'headers': dict(response.headers),
+                        'headers': result.headers,
                         'body': response_body
                     },
                     'assertions': {
-                        'has_assertions': has_assertions,
-                        'all_passed': assertions_passed,
-                        'results': assertion_results
+                        'has_assertions': assertions['has_assertions'],
+                        'all_passed': assertions['all_passed'],
+                        'results': assertions['results']
                     }
                 }
             }, charset='utf-8', json_dumps_params={'ensure_ascii': False})
 
-        except requests.RequestException as e:
+        else:
             # 记录请求失败的结果
+            error = result.error
             current_time = timezone.localtime(timezone.now())
             test_result = TestResult.objects.create(
                 case=test_case,
                 execution_time=current_time,
-                status='ERROR',
+                status=result.status,
                 result_data=try_json_dumps({
-                    'error': str(e),
+                    'error': error,
+                    'technical_details': result.error_details,
                     'request': {
                         'url': url,
                         'method': method,
                         'headers': headers,
                         'body': body
-                    }
+                    },
+                    'attempts': result.attempts,
+                    'retries': result.retries
                 }),
-                error_message=str(e)
+                error_message=error
             )
 
             # 获取test_result_id用于后续使用
@@ -1110,37 +775,30 @@ def execute_test(request, case_id):
 
             # 更新测试用例的执行时间和状态为错误
             try:
-                with connection.cursor() as cursor:
-                    cursor.execute("""
-                                   UPDATE test_platform_testcase
-                                   SET last_executed_at       = %s,
-                                       last_execution_result  = 'error',
-                                       last_assertion_results = %s,
-                                       update_time            = %s
-                                   WHERE test_case_id = %s
-                                   """, [
-                                       current_time,
-                                       try_json_dumps({
-                                           'has_assertions': False,
-                                           'all_passed': False,
-                                           'results': [],
-                                           'error': str(e)
-                                       }),
-                                       current_time,
-                                       test_case.test_case_id
-                                   ])
-
-                print(f"已更新测试用例状态: {test_case.test_case_id}, 状态: error, 时间: {current_time}")
+                TestCase.objects.filter(test_case_id=test_case.test_case_id).update(
+                    last_executed_at=current_time,
+                    last_execution_result='error',
+                    last_assertion_results=try_json_dumps({
+                        'has_assertions': False,
+                        'all_passed': False,
+                        'results': [],
+                        'error': error
+                    }),
+                    update_time=current_time
+                )
+
             except Exception as e:
-                print(f"更新测试用例状态失败: {str(e)}")
+                logger.warning("更新测试用例状态失败: %s", e)
 
             return JsonResponse({
                 'success': False,
-                'message': f'请求执行失败: {str(e)}',
+                'message': f'请求执行失败: {error}',
                 'data': {
                     'result_id': test_result_id,
-                    'status': 'ERROR',
-                    'error': str(e),
+                    'trace_id': tracer.trace_id,
+                    'status': result.status,
+                    'error': error,
+                    'technical_details': result.error_details,
                     'request': {
                         'url': url,
                         'method': method,
@@ -1174,9 +832,6 @@ def execute_test_direct(request):
         beijing_tz = pytz.timezone('Asia/Shanghai')
         current_time = timezone.localtime(timezone.now())  # 使用 localtime 获取本地时间
 
-        # 打印请求信息，帮助调试
-        print(f"收到请求: 方法={request.method}, 路径={request.path}")
-
         # 解析请求数据
         try:
             # 尝试解析请求体，同时处理空请求体的情况
@@ -1195,9 +850,6 @@ def execute_test_direct(request):
         # 这样才能正确支持各种HTTP方法
         method = request.method
 
-        # 记录请求数据，便于调试
-        print(f"接收到的测试数据: {test_data}")
-
         # 获取测试用例信息
         case_id = test_data.get('case_id')
         api_path = test_data.get('api_path') or request.path
@@ -1210,9 +862,6 @@ def execute_test_direct(request):
         if not isinstance(context, dict):
             context = {}
 
-        print(f"执行请求: 方法={method}, 路径={api_path}, 环境ID={env_id}")
-        print(f"当前变量上下文: {context}")
-
         # 获取测试用例对象
         try:
             test_case = TestCase.objects.get(test_case_id=case_id)
@@ -1290,129 +939,73 @@ def execute_test_direct(request):
         # 获取提取器信息
         extractors = test_data.get('extractors', [])
 
-        # 变量替换 - 对请求数据中的${变量名}进行替换
-        api_path = replace_variables(api_path, context)
-        headers = replace_variables(headers, context)
-        params = replace_variables(params, context)
-        body = replace_variables(body, context)
-
-        # 准备请求参数
-        request_kwargs = {
-            'url': api_path,
-            'headers': headers,
-            'params': params,
-        }
-
-        # 根据不同的HTTP方法和body_type添加相应的参数
-        if method in ['POST', 'PUT', 'PATCH', 'DELETE']:
-            if body_type == 'form-data':
-                request_kwargs['data'] = body
-            else:
-                request_kwargs['json'] = body
-        # 对于GET请求，params已经在前面设置好了，不需要再额外处理
-
-        # 记录开始时间
-        start_time = timezone.localtime(timezone.now())  # 使用本地时间(北京时间)
-
-        # 发送请求
-        try:
-            response = requests.request(method, **request_kwargs)
-
-            # 计算执行时间
-            end_time = timezone.localtime(timezone.now())  # 使用本地时间(北京时间)
-            duration = (end_time - start_time).total_seconds()
-
-            # 打印完整的请求和响应信息，用于调试
-            print(f"===== 请求详情 =====")
-            print(f"URL: {request_kwargs['url']}")
-            print(f"方法: {method}")
-            print(f"参数: {request_kwargs.get('params', {})}")
-            print(f"请求头: {request_kwargs.get('headers', {})}")
-            if method in ['POST', 'PUT', 'PATCH', 'DELETE']:
-                print(f"请求体: {request_kwargs.get('json', request_kwargs.get('data', {}))}")
-            
-            print(f"===== 响应详情 =====")
-            print(f"状态码: {response.status_code}")
-            print(f"响应头: {dict(response.headers)}")
-            print(f"响应内容: {response.text[:500]}..." if len(response.text) > 500 else f"响应内容: {response.text}")
-
-            # 获取响应内容类型
-            content_type = response.headers.get('Content-Type', '')
-            
-            # 处理响应体
-            try:
-                if 'application/json' in content_type:
-                    response_body = response.json()
-                else:
-                    response_body = {'content': response.text}
-            except json.JSONDecodeError:
-                response_body = {'content': response.text}
-            
-            # 处理提取器，提取变量
-            extracted_variables = {}
-            if extractors:
-                extracted_variables, extraction_error = handle_variable_extraction(response_body, extractors)
-                if extraction_error:
-                    print(f"提取变量时发生错误: {extraction_error}")
-                else:
-                    print(f"成功提取变量: {extracted_variables}")
-                
-                # 更新上下文
-                if extracted_variables and isinstance(context, dict):
-                    context.update(extracted_variables)
-                    print(f"更新后的上下文: {context}")
-            
-            # 返回结果
-            result = {
-                'success': True,
-                'message': '接口调试成功',
-                'data': {
-                    'status_code': response.status_code,
-                    'duration': duration,
-                    'headers': dict(response.headers),
-                    'body': response_body,
-                    'raw_text': response.text,
-                    'content_type': content_type,
-                    'execution_time': current_time.strftime('%Y-%m-%d %H:%M:%S'),
-                    'status': 'PASS' if 200 <= response.status_code < 300 else 'FAIL',
-                    'response': {
-                        'status_code': response.status_code,
-                        'headers': dict(response.headers),
-                        'body': response_body,
-                        'content_type': content_type
-                    },
-                    'extractors': {
-                        'extracted_variables': extracted_variables,
-                        'context': context
-                    }
-                }
-            }
-            
-            return JsonResponse(result, json_dumps_params={'ensure_ascii': False})
-        
-        except requests.RequestException as e:
-            error_msg = f"请求发送失败: {str(e)}"
-            if "codec can't encode" in str(e):
-                error_msg = "请求中包含无法编码的特殊字符，请检查请求参数"
-            elif "Failed to establish a new connection" in str(e):
-                error_msg = "无法连接到服务器，请检查网络或服务是否可用"
-            elif "Read timed out" in str(e):
-                error_msg = "请求超时，服务器响应时间过长"
-                
+        # 执行请求（变量替换在执行核心中完成）
+        spec = CaseSpec(
+            method=method,
+            url=api_path,
+            headers=headers,
+            params=params,
+            body=body if method in BODY_METHODS else None,
+            body_type='form-data' if body_type == 'form-data' else 'json',
+            extractors=extractors,
+            case_id=case_id
+        )
+        # 使用环境对应的连接池和超时设置
+        environment = TestEnvironment.objects.filter(environment_id=env_id).first() if env_id else None
+        retry_policy, retry_budget = single_case_retry(test_data.get('retry'))
+        result = execute_case(
+            spec, context, client=HttpClient(environment), retry_policy=retry_policy, retry_budget=retry_budget
+        )
+        # 请求、响应和变量上下文记录在执行追踪中，通过 /api/trace/<trace_id> 查看
+        tracer = TraceRecorder(resolve_execution_config())
+        tracer.case(result_trace_entry(spec, result, test_case.case_name, context))
+
+        if result.error is not None:
             return JsonResponse({
                 'success': False,
-                'message': error_msg,
+                'message': result.error,
                 'data': {
-                    'error': error_msg,
-                    'technical_details': str(e),
-                    'url': api_path,
-                    'method': method
+                    'trace_id': tracer.trace_id,
+                    'error': result.error,
+                    'technical_details': result.error_details,
+                    'url': result.request['url'],
+                    'method': method,
+                    'attempts': result.attempts,
+                    'retries': result.retries
                 }
             }, json_dumps_params={'ensure_ascii': False})
-    
+
+        # 处理提取器，提取变量并更新上下文
+        extracted_variables = result.extracted_variables
+        if extracted_variables:
+            context.update(extracted_variables)
+
+        # 返回结果
+        return JsonResponse({
+            'success': True,
+            'message': '接口调试成功',
+            'data': {
+                'trace_id': tracer.trace_id,
+                'status_code': result.status_code,
+                'duration': result.duration,
+                'headers': result.headers,
+                'body': result.stored_body(),
+                'raw_text': result.stored_raw_text(),
+                'content_type': result.content_type,
+                'execution_time': current_time.strftime('%Y-%m-%d %H:%M:%S'),
+                'status': result.status,
+                'attempts': result.attempts,
+                'retries': result.retries,
+                'response': result.response_dict(),
+                'extractors': {
+                    'extracted_variables': extracted_variables,
+                    'context': context
+                }
+            }
+        }, json_dumps_params={'ensure_ascii': False})
+
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("调试接口时发生错误: %s", e)
         return JsonResponse({
             'success': False,
             'message': f"调试接口时发生错误: {str(e)}",
@@ -1470,20 +1063,20 @@ def execute_debug(request):
 
         # 如果有环境ID，则获取环境信息
         base_url = ""
+        env = None
         if env_id:
-            from test_platform.models import TestEnvironment
             try:
                 env = TestEnvironment.objects.get(environment_id=env_id)
                 # 构建基础URL
                 if env.base_url and env.base_url.strip():
                     base_url = env.base_url.strip()
                 elif env.host:
-                    protocol = 'https' if env.use_https else 'http'
+                    protocol = (env.protocol or 'http').split('://')[0].lower()
                     port_part = f":{env.port}" if env.port else ""
                     base_url = f"{protocol}://{env.host}{port_part}"
             except TestEnvironment.DoesNotExist:
                 # 环境不存在，不使用基础URL
-                pass
+                env = None
 
         # 构建完整URL
         full_url = api_path
@@ -1500,118 +1093,72 @@ def execute_debug(request):
         if content_type and content_type not in headers:
             headers['Content-Type'] = content_type
 
-        # 准备请求参数
-        request_kwargs = {
-            'url': full_url,
-            'headers': headers,
-        }
-
-        # 处理查询参数
-        if params:
-            request_kwargs['params'] = params
-
-        # 根据请求方法和body_type处理请求体
-        if method in ['POST', 'PUT', 'PATCH', 'DELETE'] and body:
-            if body_type == 'form-data':
-                request_kwargs['data'] = body
-            elif body_type == 'x-www-form-urlencoded':
-                request_kwargs['data'] = body
-            elif body_type == 'json':
-                request_kwargs['json'] = body
-            elif body_type == 'raw':
-                request_kwargs['data'] = body
-            elif body_type == 'binary':
-                request_kwargs['data'] = body
-        
-        print(f"调试接口请求: {method} {full_url}")
-        print(f"请求参数: {request_kwargs}")
+        # 根据请求方法和body_type确定请求体的发送方式
+        if body_type not in ('json', 'form-data', 'x-www-form-urlencoded', 'raw', 'binary'):
+            body_type = 'none'
+        spec = CaseSpec(
+            method=method,
+            url=full_url,
+            headers=headers,
+            params=params or None,
+            body=body if method in BODY_METHODS and body else None,
+            body_type=body_type,
+            extractors=extractors
+        )
 
         # 发送请求
-        start_time = time.time()
-        try:
-            response = requests.request(method, **request_kwargs)
-            
-            # 计算响应时间
-            duration = time.time() - start_time
-            
-            # 获取响应内容类型
-            content_type = response.headers.get('Content-Type', '')
-            
-            # 处理响应体
-            try:
-                if 'application/json' in content_type:
-                    response_body = response.json()
-                else:
-                    response_body = {'content': response.text}
-            except json.JSONDecodeError:
-                response_body = {'content': response.text}
-            
-            # 处理提取器
-            extracted_variables = {}
-            if extractors:
-                extracted_variables, extraction_error = handle_variable_extraction(response_body, extractors)
-                if extraction_error:
-                    print(f"提取变量时发生错误: {extraction_error}")
-                else:
-                    print(f"成功提取变量: {extracted_variables}")
-                
-                # 更新上下文
-                if extracted_variables and isinstance(context, dict):
-                    context.update(extracted_variables)
-                    print(f"更新后的上下文: {context}")
-            
-            # 返回结果
-            result = {
-                'success': True,
-                'message': '接口调试成功',
-                'data': {
-                    'response': {
-                        'status_code': response.status_code,
-                        'headers': dict(response.headers),
-                        'body': response_body
-                    },
-                    'duration': round(duration, 3),
-                    'execution_time': current_time.strftime('%Y-%m-%d %H:%M:%S'),
-                    'extractors': {
-                        'extracted_variables': extracted_variables,
-                        'context': context
-                    }
-                }
-            }
-            
-            return JsonResponse(result, json_dumps_params={'ensure_ascii': False})
-        
-        except requests.RequestException as e:
-            error_msg = f"请求发送失败: {str(e)}"
-            if "codec can't encode" in str(e):
-                error_msg = "请求中包含无法编码的特殊字符，请检查请求参数"
-            elif "Failed to establish a new connection" in str(e):
-                error_msg = "无法连接到服务器，请检查网络或服务是否可用"
-            elif "Read timed out" in str(e):
-                error_msg = "请求超时，服务器响应时间过长"
-                
+        context = test_data.get('context') if isinstance(test_data.get('context'), dict) else {}
+        result = execute_case(spec, context, client=HttpClient(env))
+        tracer = TraceRecorder(resolve_execution_config())
+        tracer.case(result_trace_entry(spec, result, test_data.get('title', ''), context))
+
+        if result.error is not None:
             return JsonResponse({
                 'success': False,
-                'message': error_msg,
+                'message': result.error,
                 'data': {
                     'response': {
                         'status_code': 0,
                         'headers': {},
-                        'body': {'error': error_msg}
+                        'body': {'error': result.error}
                     },
                     'duration': 0,
                     'error': {
-                        'message': error_msg,
-                        'details': str(e),
+                        'message': result.error,
+                        'details': result.error_details,
                         'url': full_url,
                         'method': method
                     }
                 }
             }, json_dumps_params={'ensure_ascii': False})
-    
+
+        # 处理提取器
+        extracted_variables = result.extracted_variables
+        if extracted_variables:
+            context.update(extracted_variables)
+
+        # 返回结果
+        return JsonResponse({
+            'success': True,
+            'message': '接口调试成功',
+            'data': {
+                'trace_id': tracer.trace_id,
+                'response': {
+                    'status_code': result.status_code,
+                    'headers': result.headers,
+                    'body': result.stored_body()
+                },
+                'duration': round(result.duration, 3),
+                'execution_time': current_time.strftime('%Y-%m-%d %H:%M:%S'),
+                'extractors': {
+                    'extracted_variables': extracted_variables,
+                    'context': context
+                }
+            }
+        }, json_dumps_params={'ensure_ascii': False})
+
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("调试接口时发生错误: %s", e)
         return JsonResponse({
             'success': False,
             'message': f"调试接口时发生错误: {str(e)}",
@@ -7,6 +7,8 @@ import json
 from datetime import datetime, timedelta
 
 from test_platform.models import TestExecutionLog, TestCase, TestSuite
+from test_platform.execution.blob_store import unpack_json
+from test_platform.execution.trace import get_trace
 
 
 class ExecutionLogView(APIView):
@@ -45,7 +47,7 @@ class ExecutionLogView(APIView):
                     'response': {
                         'status_code': log.response_status_code,
                         'headers': json.loads(log.response_headers) if log.response_headers else {},
-                        'body': json.loads(log.response_body) if log.response_body else {}
+                        'body': unpack_json(log.response_body) if log.response_body else {}
                     },
                     'log_detail': log.log_detail,
                     'error_message': log.error_message,
@@ -232,4 +234,56 @@ class ExecutionLogView(APIView):
                 'code': 404,
                 'message': '日志不存在',
                 'data': None
-            }, status=404) 
\ No newline at end of file
+            }, status=404) 
+
+class ExecutionTraceView(APIView):
+    """执行追踪查询视图"""
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request, trace_id):
+        """查询一次执行的追踪事件
+
+        trace_id 为执行接口返回的 trace_id（异步执行时即 run_id），可选参数:
+        - status: 只返回该状态的用例事件，如 FAIL
+        - offset / limit: 分页读取事件
+        """
+        try:
+            offset = max(int(request.GET.get('offset', 0)), 0)
+            limit = min(max(int(request.GET.get('limit', 1000)), 1), 5000)
+        except ValueError:
+            return JsonResponse({
+                'code': 400,
+                'message': 'offset和limit必须为整数',
+                'data': None
+            }, status=400)
+
+        try:
+            events = get_trace(trace_id, offset, limit)
+        except Exception as e:
+            return JsonResponse({
+                'code': 500,
+                'message': f'获取执行追踪失败: {str(e)}',
+                'data': None
+            }, status=500)
+
+        if not events and offset == 0:
+            return JsonResponse({
+                'code': 404,
+                'message': '执行追踪不存在或已过期',
+                'data': None
+            }, status=404)
+
+        status = request.GET.get('status')
+        if status:
+            events = [event for event in events if event.get('event') != 'case' or event.get('status') == status]
+
+        return JsonResponse({
+            'code': 200,
+            'message': 'success',
+            'data': {
+                'trace_id': trace_id,
+                'offset': offset,
+                'events': events
+            }
+        })
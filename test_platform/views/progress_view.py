@@ -0,0 +1,122 @@
+import json
+import logging
+import time
+from django.conf import settings
+from django.http import StreamingHttpResponse, JsonResponse
+from rest_framework.decorators import api_view, permission_classes, authentication_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.views.decorators.csrf import csrf_exempt
+from test_platform.execution import run_status
+from test_platform.execution.progress import (
+    PLAN_TERMINAL_EVENTS, SUITE_TERMINAL_EVENTS, plan_channel, run_channel, suite_channel
+)
+
+logger = logging.getLogger(__name__)
+
+# 没有事件时发送心跳注释的间隔（秒），防止代理断开空闲连接
+KEEP_ALIVE_INTERVAL = 15
+
+
+@csrf_exempt
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@authentication_classes([JWTAuthentication])
+def progress_stream(request):
+    """
+    执行进度流式接口（Server-Sent Events）
+
+    请求参数（三选一）:
+    - suite_id: 订阅某个套件的执行进度
+    - plan_id: 订阅某个测试计划的执行进度
+    - run_id: 订阅某次异步执行的进度
+
+    响应格式:
+    每个事件为 "event: <事件类型>\\ndata: <JSON>\\n\\n"，事件类型包括
+    plan_started / suite_started / case_completed / suite_completed / suite_failed / plan_completed，
+    收到结束事件（套件完成/失败或计划完成）后关闭连接
+    """
+    suite_id = request.GET.get('suite_id')
+    plan_id = request.GET.get('plan_id')
+    run_id = request.GET.get('run_id')
+
+    initial_event = None
+    if run_id:
+        channel, terminal_events = run_channel(run_id), SUITE_TERMINAL_EVENTS
+        # 异步执行可能在订阅前已经结束，先推送当前状态
+        try:
+            run_data = run_status.get_run(run_id)
+        except Exception as e:
+            logger.warning(f"获取运行状态失败: {str(e)}")
+            run_data = None
+        if run_data is None:
+            return JsonResponse({
+                'code': 404,
+                'message': '运行记录不存在或已过期',
+                'data': None
+            }, status=404)
+        initial_event = {'event': 'run_status', **run_data}
+    elif plan_id:
+        channel, terminal_events = plan_channel(plan_id), PLAN_TERMINAL_EVENTS
+    elif suite_id:
+        channel, terminal_events = suite_channel(suite_id), SUITE_TERMINAL_EVENTS
+    else:
+        return JsonResponse({
+            'code': 400,
+            'message': '缺少suite_id、plan_id或run_id参数',
+            'data': None
+        }, status=400)
+
+    response = StreamingHttpResponse(
+        event_stream(channel, terminal_events, initial_event),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    # 禁止Nginx缓冲事件流
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def event_stream(channel, terminal_events, initial_event=None):
+    """订阅Redis频道并将进度事件转换为SSE格式"""
+    if initial_event is not None:
+        yield format_event('run_status', json.dumps(initial_event, ensure_ascii=False, default=str))
+        if initial_event.get('status') in ('completed', 'failed'):
+            return
+
+    pubsub = run_status.get_redis().pubsub(ignore_subscribe_messages=True)
+    try:
+        pubsub.subscribe(channel)
+        yield ": connected\n\n"
+
+        deadline = time.monotonic() + settings.TEST_PROGRESS_STREAM_TIMEOUT
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline:
+            message = pubsub.get_message(timeout=1.0)
+            if message is None:
+                if time.monotonic() - last_sent >= KEEP_ALIVE_INTERVAL:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+                continue
+
+            data = message['data']
+            if isinstance(data, bytes):
+                data = data.decode('utf-8')
+            try:
+                event = json.loads(data).get('event', 'message')
+            except (ValueError, AttributeError):
+                event = 'message'
+            yield format_event(event, data)
+            last_sent = time.monotonic()
+
+            if event in terminal_events:
+                break
+    except Exception as e:
+        logger.error(f"执行进度推送失败: {str(e)}", exc_info=True)
+        yield format_event('error', json.dumps({'event': 'error', 'error': str(e)}, ensure_ascii=False))
+    finally:
+        pubsub.close()
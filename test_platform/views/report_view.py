@@ -2,11 +2,28 @@ from django.http import JsonResponse
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from test_platform.models import TestSuite, TestSuiteCase, TestResult, TestSuiteResult, Project
+from test_platform.models import TestSuite, TestSuiteCase, TestResult, TestSuiteResult, TestSuiteCaseResult, TestSuiteLoadResult, Project
 import json
-from django.db.models import Max, Subquery, OuterRef
+from datetime import timedelta
+from django.db.models import Avg, Count, Max, Subquery, OuterRef
+from django.utils import timezone
 from django.db import connection
 
+from test_platform.execution.blob_store import unpack_json
+from test_platform.execution.suite_runner import FAILURE_STATUSES
+
+
+# 用例状态在报告中的显示名称，其余状态（FAIL、ERROR）均显示为失败
+CASE_STATUS_LABELS = {
+    'PASS': '通过',
+    'SKIP': '跳过',
+    'TIMEOUT': '超时'
+}
+
+
+def case_status_label(status):
+    return CASE_STATUS_LABELS.get(status, '失败')
+
 
 class TestReportView(APIView):
     """测试报告视图"""
@@ -45,7 +62,7 @@ class TestReportView(APIView):
                 
                 try:
                     # 解析结果数据
-                    result_data = json.loads(result.result_data)
+                    result_data = unpack_json(result.result_data)
                     
                     # 状态转换为中文
                     status_map = {
@@ -62,7 +79,7 @@ class TestReportView(APIView):
                     case_results = []
                     for case in result_data.get('results', []):
                         # 状态转换为中文
-                        case_status = '通过' if case.get('status') == 'PASS' else '失败'
+                        case_status = case_status_label(case.get('status'))
                         
                         # 添加格式化后的用例结果
                         case_results.append({
@@ -72,7 +89,7 @@ class TestReportView(APIView):
                             'method': case.get('method', ''),
                             'duration': int(float(case.get('duration', 0)) * 1000),  # 转换为毫秒
                             'status': case_status,
-                            'message': case.get('error', '执行成功') if case_status == '失败' else '验证成功',
+                            'message': '验证成功' if case_status == '通过' else case.get('error', '执行成功'),
                             'requestData': str(case.get('request', {})),
                             'responseData': str(case.get('response', {}))
                         })
@@ -94,7 +111,9 @@ class TestReportView(APIView):
                         'projectId': test_suite.project_id,  # 添加项目ID
                         'projectName': test_suite.project.name,  # 添加项目名称
                         'creator': result.creator.username if result.creator else '未知用户',  # 添加执行者
-                        'logs_link': f"/api/log?suite_result_id={result.result_id}"  # 添加日志链接
+                        'logs_link': f"/api/log?suite_result_id={result.result_id}",  # 添加日志链接
+                        # 失败用例重跑的结果关联到被重跑的结果，合并视图见 /api/suite/rerun/<result_id>
+                        'rerunOf': str(result.rerun_of_id) if result.rerun_of_id else None
                     }
                     
                     return JsonResponse({
@@ -266,7 +285,7 @@ class TestReportView(APIView):
                 
                 try:
                     # 解析结果数据
-                    result_data = json.loads(latest_result.result_data)
+                    result_data = unpack_json(latest_result.result_data)
                     
                     # 状态转换为中文
                     status_map = {
@@ -283,7 +302,7 @@ class TestReportView(APIView):
                     case_results = []
                     for case in result_data.get('results', []):
                         # 状态转换为中文
-                        case_status = '通过' if case.get('status') == 'PASS' else '失败'
+                        case_status = case_status_label(case.get('status'))
                         
                         # 添加格式化后的用例结果
                         case_results.append({
@@ -293,7 +312,7 @@ class TestReportView(APIView):
                             'method': case.get('method', ''),
                             'duration': int(float(case.get('duration', 0)) * 1000),  # 转换为毫秒
                             'status': case_status,
-                            'message': case.get('error', '执行成功') if case_status == '失败' else '验证成功',
+                            'message': '验证成功' if case_status == '通过' else case.get('error', '执行成功'),
                             'requestData': str(case.get('request', {})),
                             'responseData': str(case.get('response', {}))
                         })
@@ -408,4 +427,154 @@ class TestReportView(APIView):
                 'code': 500,
                 'message': f'删除测试报告失败: {str(e)}',
                 'data': None
-            }) 
\ No newline at end of file
+            }) 
+
+class CaseResultStatsView(APIView):
+    """用例维度的执行统计（基于 TestSuiteCaseResult 聚合查询）"""
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request):
+        """
+        获取用例执行统计
+        - type=slowest: 平均耗时最长的用例
+        - type=failing: 失败/错误次数最多的用例
+        可选参数: project_id、suite_id、days（统计最近天数，默认7）、limit（默认20）
+        """
+        stats_type = request.GET.get('type', 'slowest')
+        try:
+            days = int(request.GET.get('days', 7))
+            limit = min(int(request.GET.get('limit', 20)), 200)
+        except ValueError:
+            return JsonResponse({
+                'code': 400,
+                'message': 'days和limit必须为整数',
+                'data': None
+            })
+
+        queryset = TestSuiteCaseResult.objects.filter(
+            execution_time__gte=timezone.now() - timedelta(days=days)
+        )
+        if request.GET.get('suite_id'):
+            queryset = queryset.filter(suite_id=request.GET['suite_id'])
+        if request.GET.get('project_id'):
+            queryset = queryset.filter(suite__project_id=request.GET['project_id'])
+
+        if stats_type == 'slowest':
+            rows = queryset.values('case_id').annotate(
+                title=Max('title'),
+                runs=Count('id'),
+                avg_duration=Avg('duration'),
+                max_duration=Max('duration')
+            ).order_by('-avg_duration')[:limit]
+        elif stats_type == 'failing':
+            rows = queryset.filter(status__in=FAILURE_STATUSES).values('case_id').annotate(
+                title=Max('title'),
+                failures=Count('id'),
+                last_failed_at=Max('execution_time')
+            ).order_by('-failures')[:limit]
+        else:
+            return JsonResponse({
+                'code': 400,
+                'message': f'不支持的统计类型: {stats_type}',
+                'data': None
+            })
+
+        data = []
+        for row in rows:
+            item = dict(row)
+            if item.get('avg_duration') is not None:
+                item['avg_duration'] = round(item['avg_duration'], 3)
+            if item.get('last_failed_at'):
+                item['last_failed_at'] = timezone.localtime(item['last_failed_at']).strftime('%Y-%m-%d %H:%M:%S')
+            data.append(item)
+
+        return JsonResponse({
+            'code': 200,
+            'message': 'success',
+            'data': {
+                'type': stats_type,
+                'days': days,
+                'items': data
+            }
+        })
+
+
+class LoadTestReportView(APIView):
+    """套件压测报告"""
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    @staticmethod
+    def format_load_result(load_result, detail=False):
+        data = {
+            'id': load_result.id,
+            'suite_id': load_result.suite_id,
+            'suite_name': load_result.suite.name,
+            'environment_id': load_result.environment_id,
+            'status': load_result.status,
+            'iterations': load_result.iterations,
+            'concurrency': load_result.concurrency,
+            'ramp_up': load_result.ramp_up,
+            'execution_time': timezone.localtime(load_result.execution_time).strftime('%Y-%m-%d %H:%M:%S'),
+            'duration': load_result.duration,
+            'total_requests': load_result.total_requests,
+            'error_requests': load_result.error_requests,
+            'error_rate': round(load_result.error_requests / load_result.total_requests * 100, 2)
+            if load_result.total_requests else 0,
+            'throughput': load_result.throughput,
+            'error': load_result.error,
+            'creator': load_result.creator.username if load_result.creator else None
+        }
+        try:
+            result_data = json.loads(load_result.result_data) if load_result.result_data else {}
+        except json.JSONDecodeError:
+            result_data = {}
+        summary = result_data.get('summary', {})
+        for key in ('p50', 'p90', 'p99', 'max', 'mean'):
+            data[key] = summary.get(key)
+        if detail:
+            data['completed_iterations'] = result_data.get('completed_iterations')
+            data['histogram'] = summary.get('histogram', [])
+            data['cases'] = result_data.get('cases', [])
+        return data
+
+    def get(self, request, load_id=None, suite_id=None):
+        """
+        获取压测报告
+        - /api/report/load/<load_id>: 压测详情（含各用例的延迟百分位和分布直方图）
+        - /api/report/load/list/<suite_id>: 套件的压测记录列表（最近的在前）
+        """
+        if load_id is not None:
+            load_result = TestSuiteLoadResult.objects.select_related('suite', 'creator').filter(id=load_id).first()
+            if load_result is None:
+                return JsonResponse({
+                    'code': 404,
+                    'message': '压测记录不存在',
+                    'data': None
+                }, status=404)
+            return JsonResponse({
+                'code': 200,
+                'message': 'success',
+                'data': self.format_load_result(load_result, detail=True)
+            })
+
+        if suite_id is not None:
+            try:
+                limit = min(int(request.GET.get('limit', 20)), 200)
+            except ValueError:
+                limit = 20
+            load_results = TestSuiteLoadResult.objects.select_related('suite', 'creator').filter(
+                suite_id=suite_id
+            ).order_by('-execution_time')[:limit]
+            return JsonResponse({
+                'code': 200,
+                'message': 'success',
+                'data': [self.format_load_result(load_result) for load_result in load_results]
+            })
+
+        return JsonResponse({
+            'code': 400,
+            'message': '缺少必要的参数',
+            'data': None
+        }, status=400)
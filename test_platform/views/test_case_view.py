@@ -18,8 +18,19 @@ from test_platform.serializers import TestCaseSerializer
 from rest_framework import serializers
 from django.utils import timezone
 import time
-from test_platform.views import execute as execute_module
-from urllib.parse import urlparse, parse_qs
+import logging
+from test_platform.execution.config import parse_execution_config, resolve_execution_config
+from test_platform.execution.sharding import get_shard_count
+from test_platform.execution.suite_runner import resolve_suite_environment, run_suite
+from test_platform.execution import run_status
+from test_platform.tasks import execute_suite_async, execute_suite_load_test, execute_suite_matrix
+from test_platform.execution.load_test import create_load_result
+from test_platform.execution.rerun import merge_rerun_results, rerun_failed_cases
+from test_platform.execution.history import predict_suite_duration
+from test_platform.execution.matrix import check_matrix_config, compare_suite_results, load_matrix_environments
+from test_platform.execution.suite_plan import suite_plan_cache
+
+logger = logging.getLogger(__name__)
 
 
 class TestCaseView(APIView):
@@ -85,42 +96,42 @@ class TestCaseView(APIView):
 
     def _process_extractors(self, extractors):
         """处理提取器数据的通用方法"""
-        print(f"_process_extractors收到的原始数据: {extractors}, 类型: {type(extractors)}")
+        logger.debug("_process_extractors收到的原始数据: %s, 类型: %s", extractors, type(extractors))
         
         if not extractors:  # 如果extractors为None或空
-            print("提取器数据为空，返回空JSON数组")
+            logger.debug("提取器数据为空，返回空JSON数组")
             return '[]'
             
         if isinstance(extractors, str):
             try:
                 # 如果是字符串，尝试解析为JSON以验证格式
                 parsed = json.loads(extractors)
-                print(f"成功解析提取器字符串为: {parsed}")
+                logger.debug("成功解析提取器字符串为: %s", parsed)
                 # 如果是有效的JSON字符串，直接返回
                 return extractors
             except json.JSONDecodeError as e:
-                print(f"JSON解析失败: {str(e)}")
+                logger.warning("JSON解析失败: %s", e)
                 # 如果解析失败，尝试其他方式解析
                 try:
                     import ast
                     # 尝试作为Python表达式解析
                     extractors_obj = ast.literal_eval(extractors)
-                    print(f"通过ast解析成功: {extractors_obj}")
+                    logger.debug("通过ast解析成功: %s", extractors_obj)
                     return json.dumps(extractors_obj)
                 except Exception as e:
-                    print(f"ast解析也失败: {str(e)}")
+                    logger.warning("ast解析也失败: %s", e)
                     return '[]'
         elif isinstance(extractors, list):
             # 如果是列表，转换为JSON字符串
-            print(f"提取器是列表，转换为JSON")
+            logger.debug("提取器是列表，转换为JSON")
             return json.dumps(extractors)
         elif isinstance(extractors, dict):
             # 如果是字典（单个提取器），封装为列表后转换为JSON字符串
-            print(f"提取器是字典，封装为列表后转换为JSON")
+            logger.debug("提取器是字典，封装为列表后转换为JSON")
             return json.dumps([extractors])
         
         # 其他情况返回空JSON数组
-        print(f"提取器是其他类型: {type(extractors)}，返回空数组")
+        logger.debug("提取器是其他类型: %s，返回空数组", type(extractors))
         return '[]'
 
     def _process_tests(self, tests):
@@ -215,7 +226,7 @@ class TestCaseView(APIView):
                     # 先尝试解析为JSON对象
                     if test_case.case_requests_body:
                         # 打印原始body数据，帮助调试
-                        print(f"原始body数据: {test_case.case_requests_body}")
+                        logger.debug("原始body数据: %s", test_case.case_requests_body)
                         
                         if isinstance(test_case.case_requests_body, str):
                             # 检查是否是Python字典字符串表示（而非JSON）
@@ -247,9 +258,9 @@ class TestCaseView(APIView):
                         body = {}
                     
                     # 打印处理后的body数据
-                    print(f"处理后的body数据: {body}")
+                    logger.debug("处理后的body数据: %s", body)
                 except Exception as e:
-                    print(f"处理body时出错: {str(e)}")
+                    logger.warning("处理body时出错: %s", e)
                     body = test_case.case_requests_body or {}
 
                 # 处理 expected_result
@@ -329,14 +340,14 @@ class TestCaseView(APIView):
             processed_params = self._process_body(case_params)
 
             # 打印调试信息
-            print(f"请求的body: {request.data.get('body')}")
-            print(f"处理后的body: {case_body}")
-            print(f"请求的params: {case_params}")
-            print(f"处理后的params: {processed_params}")
-            print(f"请求的extractors: {request.data.get('extractors')}")
-            print(f"处理后的extractors: {case_extractors}")
-            print(f"请求的tests: {request.data.get('tests')}")
-            print(f"处理后的tests: {case_tests}")
+            logger.debug("请求的body: %s", request.data.get('body'))
+            logger.debug("处理后的body: %s", case_body)
+            logger.debug("请求的params: %s", case_params)
+            logger.debug("处理后的params: %s", processed_params)
+            logger.debug("请求的extractors: %s", request.data.get('extractors'))
+            logger.debug("处理后的extractors: %s", case_extractors)
+            logger.debug("请求的tests: %s", request.data.get('tests'))
+            logger.debug("处理后的tests: %s", case_tests)
 
             project = Project.objects.get(project_id=project_id)
 
@@ -422,7 +433,7 @@ class TestCaseView(APIView):
                     )
                     
                     # 打印日志
-                    print(f"PUT更新后状态: {current_time}, {status_map[status]}")
+                    logger.debug("PUT更新后状态: %s, %s", current_time, status_map[status])
                     
                     return JsonResponse({
                         'code': 200,
@@ -459,8 +470,8 @@ class TestCaseView(APIView):
             
             # 明确获取并处理extractors字段
             raw_extractors = request.data.get('extractors', [])
-            print(f"原始请求中的extractors: {raw_extractors}")
-            print(f"extractors类型: {type(raw_extractors)}")
+            logger.debug("原始请求中的extractors: %s", raw_extractors)
+            logger.debug("extractors类型: %s", type(raw_extractors))
             
             # 确保extractors是合适的格式
             if isinstance(raw_extractors, list):
@@ -468,16 +479,16 @@ class TestCaseView(APIView):
             else:
                 case_extractors = self._process_extractors(raw_extractors)
             
-            print(f"处理后的extractors: {case_extractors}")
+            logger.debug("处理后的extractors: %s", case_extractors)
             
             case_tests = self._process_tests(request.data.get('tests'))
             
             # 打印调试信息
-            print(f"请求的body: {request.data.get('body')}")
-            print(f"处理后的body: {case_body}")
-            print(f"请求的params: {case_params}")
-            print(f"处理后的params: {processed_params}")
-            print(f"用例标题: {case_name}")
+            logger.debug("请求的body: %s", request.data.get('body'))
+            logger.debug("处理后的body: %s", case_body)
+            logger.debug("请求的params: %s", case_params)
+            logger.debug("处理后的params: %s", processed_params)
+            logger.debug("用例标题: %s", case_name)
 
             # 准备更新字段，只包含非空字段
             update_fields = {}
@@ -511,18 +522,18 @@ class TestCaseView(APIView):
                 # 使用filter和update方法更新数据
                 TestCase.objects.filter(test_case_id=case_id).update(**update_fields)
             else:
-                print("没有可更新的字段")
+                logger.debug("没有可更新的字段")
 
             # 重新获取更新后的对象
             updated_case = TestCase.objects.get(test_case_id=case_id)
-            print(f"保存后的extractors: {updated_case.case_extractors}")
+            logger.debug("保存后的extractors: %s", updated_case.case_extractors)
             
             # 尝试解析存储的extractors，确认是否可以正确读取
             try:
                 saved_extractors = json.loads(updated_case.case_extractors) if updated_case.case_extractors else []
-                print(f"解析后的extractors: {saved_extractors}")
+                logger.debug("解析后的extractors: %s", saved_extractors)
             except json.JSONDecodeError as e:
-                print(f"解析保存后的extractors失败: {str(e)}")
+                logger.warning("解析保存后的extractors失败: %s", e)
                 saved_extractors = []
 
             return JsonResponse({
@@ -544,7 +555,7 @@ class TestCaseView(APIView):
         except Exception as e:
             import traceback
             traceback.print_exc()
-            print(f"更新测试用例时出错: {str(e)}")
+            logger.warning("更新测试用例时出错: %s", e)
             return JsonResponse({
                 'code': 500,
                 'message': f'更新测试用例失败：{str(e)}',
@@ -588,7 +599,7 @@ class TestCaseView(APIView):
                 )
                 
                 # 打印日志
-                print(f"更新后状态: {current_time}, {status_map[status]}")
+                logger.debug("更新后状态: %s, %s", current_time, status_map[status])
                 
                 return JsonResponse({
                     'code': 200,
@@ -990,6 +1001,10 @@ class TestEnvironmentView(APIView):
                         env_data['db_password'] = value
                     elif key == 'time_out':
                         env_data['time_out'] = int(value)
+                    elif key == 'max_concurrency':
+                        env_data['max_concurrency'] = int(value) if value else None
+                    elif key == 'rate_limit':
+                        env_data['rate_limit'] = float(value) if value else None
                     elif key == 'content_type':
                         env_data['content_type'] = value
                     elif key == 'charset':
@@ -1065,6 +1080,8 @@ class TestEnvironmentView(APIView):
                     ('db_user', '数据库用户'),
                     ('db_password', '数据库密码'),
                     ('time_out', '超时时间'),
+                    ('max_concurrency', '最大并发请求数'),
+                    ('rate_limit', '每秒请求数上限'),
                     ('content_type', '内容类型'),
                     ('charset', '字符集'),
                     ('version', '版本号'),
@@ -1136,6 +1153,8 @@ class TestEnvironmentView(APIView):
                         ('db_user', '数据库用户'),
                         ('db_password', '数据库密码'),
                         ('time_out', '超时时间'),
+                        ('max_concurrency', '最大并发请求数'),
+                        ('rate_limit', '每秒请求数上限'),
                         ('content_type', '内容类型'),
                         ('charset', '字符集'),
                         ('version', '版本号'),
@@ -1210,6 +1229,10 @@ class TestEnvironmentView(APIView):
                 environment.db_password = value
             elif key == 'time_out':
                 environment.time_out = int(value) if value else 0
+            elif key == 'max_concurrency':
+                environment.max_concurrency = int(value) if value else None
+            elif key == 'rate_limit':
+                environment.rate_limit = float(value) if value else None
             elif key == 'content_type':
                 environment.content_type = value
             elif key == 'charset':
@@ -1285,9 +1308,9 @@ class TestCaseImportView(APIView):
             project_id = request.data.get('project_id')
 
             # 添加更详细的调试信息
-            print("原始project_id:", project_id)
-            print("project_id类型:", type(project_id))
-            print("请求数据:", request.data)
+            logger.debug("原始project_id: %s", project_id)
+            logger.debug("project_id类型: %s", type(project_id))
+            logger.debug("请求数据: %s", request.data)
 
             if not file or not project_id:
                 return JsonResponse({
@@ -1297,7 +1320,7 @@ class TestCaseImportView(APIView):
 
             try:
                 project_id = int(project_id)
-                print("转换后的project_id:", project_id)
+                logger.debug("转换后的project_id: %s", project_id)
             except (TypeError, ValueError):
                 return JsonResponse({
                     'code': 400,
@@ -1312,7 +1335,7 @@ class TestCaseImportView(APIView):
 
             # 读取Excel文件并打印列名，帮助调试
             df = pd.read_excel(file)
-            print("Excel列名:", df.columns.tolist())
+            logger.debug("Excel列名: %s", df.columns.tolist())
 
             # 定义Excel列名和代码中使用的字段的映射关系
             column_mapping = {
@@ -1358,17 +1381,17 @@ class TestCaseImportView(APIView):
                         'case_expect_result': row.get('预期结果', '')
                     }
 
-                    print("准备序列化的数据:", test_case_data)
+                    logger.debug("准备序列化的数据: %s", test_case_data)
                     serializer = TestCaseSerializer(data=test_case_data)
 
                     try:
                         if serializer.is_valid(raise_exception=True):
-                            print("序列化后的数据:", serializer.validated_data)
+                            logger.debug("序列化后的数据: %s", serializer.validated_data)
                             test_case = serializer.save()
                             test_cases.append(test_case)
                             imported_count += 1
                     except serializers.ValidationError as e:
-                        print("序列化错误:", e.detail)
+                        logger.warning("序列化错误: %s", e.detail)
                         return JsonResponse({
                             'code': 400,
                             'message': f'第{imported_count + 1}行数据验证失败：{e.detail}'
@@ -1383,7 +1406,7 @@ class TestCaseImportView(APIView):
                 })
 
         except Exception as e:
-            print("导入错误:", str(e))
+            logger.warning("导入错误: %s", e)
             import traceback
             traceback.print_exc()
             return JsonResponse({
@@ -1394,7 +1417,7 @@ class TestCaseImportView(APIView):
     def normalize_priority(self, priority):
         """标准化优先级值"""
         # 打印接收到的优先级值，帮助调试
-        print("接收到的优先级值:", priority)
+        logger.debug("接收到的优先级值: %s", priority)
 
         priority_map = {
             '高': '2',
@@ -1412,7 +1435,7 @@ class TestCaseImportView(APIView):
 
         # 获取映射值，默认返回'1'（中优先级）
         result = priority_map.get(str(priority).strip(), '1')
-        print("转换后的优先级值:", result)
+        logger.debug("转换后的优先级值: %s", result)
         return result
 
     def ensure_json_format(self, value):
@@ -1581,447 +1604,114 @@ class TestSuiteView(APIView):
                         'data': None
                     }, status=404)
                 
-                # 获取测试环境
-                environment = None
-                # 优先使用环境套关联的环境
-                if test_suite.environment_cover:
-                    # 从环境套中获取第一个环境实例
-                    environment = TestEnvironment.objects.filter(environment_cover=test_suite.environment_cover).first()
-                    if not environment:
-                        return JsonResponse({
-                            'code': 400,
-                            'message': f'环境套"{test_suite.environment_cover.environment_name}"下没有可用的环境配置，请先为该环境套添加环境',
-                            'data': None
-                        }, status=400)
-                # 如果没有环境套，回退到使用直接关联的环境
-                elif test_suite.environment:
-                    environment = test_suite.environment
-                else:
-                    return JsonResponse({
-                        'code': 400,
-                        'message': '测试套件未配置执行环境套或环境',
-                        'data': None
-                    }, status=400)
+                request_data = getattr(request, 'data', None) or {}
                 
-                # 获取套件中的所有测试用例，按顺序排序
-                suite_cases = test_suite.suite_cases.all().order_by('order')
-                if not suite_cases:
+                # 获取测试环境
+                environment, env_error = resolve_suite_environment(
+                    test_suite, request_data.get('environment_id')
+                )
+                if env_error:
                     return JsonResponse({
                         'code': 400,
-                        'message': '测试套件中没有测试用例',
+                        'message': env_error,
                         'data': None
                     }, status=400)
                 
-                # 执行结果统计
-                total_cases = len(suite_cases)
-                passed_cases = 0
-                failed_cases = 0
-                error_cases = 0
-                skipped_cases = 0
-                total_duration = 0
-                execution_results = []
-                
-                # 初始化变量上下文
-                context = {}
-                
-                # 记录开始时间
-                suite_start_time = timezone.now()
+                # 请求参数可覆盖套件上保存的执行配置
+                overrides = {
+                    'mode': request_data.get('execution_mode'),
+                    'max_workers': request_data.get('max_workers'),
+                    'backend': request_data.get('execution_backend'),
+                    'case_timeout': request_data.get('case_timeout'),
+                    'suite_timeout': request_data.get('suite_timeout'),
+                    'retry_max_attempts': request_data.get('retry_max_attempts'),
+                    'shards': request_data.get('shards'),
+                    'stop_on_failure': request_data.get('stop_on_failure'),
+                    'skip_missing_variables': request_data.get('skip_missing_variables'),
+                    'cassette': request_data.get('cassette')
+                }
                 
-                # 依次执行每个测试用例
-                for index, suite_case in enumerate(suite_cases):
+                # 压测模式：load_test 为 {iterations, concurrency, ramp_up}，提交到Celery执行，通过压测报告接口查看结果
+                if request_data.get('load_test'):
                     try:
-                        # 解析测试用例数据
-                        case_data = json.loads(suite_case.case_data)
-                        original_case_id = suite_case.original_case_id
-                        
-                        # 替换变量
-                        if context:
-                            # 导入变量替换函数
-                            from test_platform.views.execute import replace_variables
-                            
-                            # 替换URL中的变量
-                            api_path = replace_variables(case_data.get('api_path', ''), context)
-                            # 替换请求头中的变量
-                            headers = replace_variables(case_data.get('headers', {}), context)
-                            # 替换请求参数中的变量
-                            params = replace_variables(case_data.get('params', {}), context)
-                            # 替换请求体中的变量
-                            body = replace_variables(case_data.get('body', {}), context)
-                            
-                            # 更新case_data
-                            case_data['api_path'] = api_path
-                            case_data['headers'] = headers
-                            case_data['params'] = params
-                            case_data['body'] = body
-                        
-                        # 构建执行请求数据
-                        execute_data = {
-                            'case_id': original_case_id,
-                            'api_path': case_data.get('api_path', ''),
-                            'method': case_data.get('method', ''),
-                            'headers': case_data.get('headers', {}),
-                            'params': case_data.get('params', ''),
-                            'body': case_data.get('body', {}),
-                            'body_type': case_data.get('body_type', 'raw'),
-                            'assertions': case_data.get('assertions', ''),
-                            'tests': case_data.get('tests', []),
-                            'extractors': case_data.get('extractors', []),
-                            'context': context  # 传递当前变量上下文
+                        load_result = create_load_result(
+                            test_suite, environment, request_data.get('load_test'), request.user
+                        )
+                    except ValueError as e:
+                        return JsonResponse({
+                            'code': 400,
+                            'message': str(e),
+                            'data': None
+                        }, status=400)
+                    execute_suite_load_test.delay(load_result.id, overrides)
+                    return JsonResponse({
+                        'code': 200,
+                        'message': '压测已提交执行',
+                        'data': {
+                            'load_result_id': load_result.id,
+                            'suite_id': test_suite.suite_id,
+                            'status': load_result.status,
+                            'iterations': load_result.iterations,
+                            'concurrency': load_result.concurrency,
+                            'ramp_up': load_result.ramp_up,
+                            'report_url': f'/api/report/load/{load_result.id}'
                         }
-                        
-                        print(f"执行测试用例 {index + 1}/{total_cases}: ID={original_case_id}, 名称={case_data.get('title', '')}")
-                        print(f"请求方法: {execute_data['method']}")
-                        print(f"当前变量上下文: {context}")
-                        
-                        # 模拟请求对象
-                        class MockRequest:
-                            def __init__(self, data):
-                                self.data = data
-                                # 添加自动化标记，表示这是自动化接口执行
-                                self.data['is_automation'] = True
-                                
-                                # 根据HTTP方法区别处理请求体
-                                method = data.get('method', '').upper()
-                                if method == 'GET':
-                                    # GET请求通常不需要请求体
-                                    self.body = b''  # 空请求体
-                                else:
-                                    # POST/PUT等请求需要请求体
-                                    self.body = json.dumps(data).encode('utf-8')
-                                    
-                                # 不设置默认值，完全使用测试用例中定义的方法
-                                self.method = method
-                                self.path = data.get('api_path', '')
-                                
-                                # 处理URL中的查询参数
-                                parsed_url = urlparse(self.path)
-                                self.path = parsed_url.path  # 只保留路径部分，移除查询参数
-                                
-                                # 添加额外的请求属性
-                                self.user = request.user  # 传递当前用户信息
-                                
-                                # 添加META字典，包含自动化标记
-                                self.META = {
-                                    'HTTP_X_AUTOMATION': 'true'  # 标记为自动化接口执行
-                                }
-                                
-                                # 处理GET请求参数
-                                self.GET = {}
-                                # 首先从URL中提取查询参数
-                                if parsed_url.query:
-                                    query_dict = parse_qs(parsed_url.query)
-                                    self.GET = {k: v[0] for k, v in query_dict.items()}
-                                
-                                # 然后再处理测试用例中的params字段
-                                if method == 'GET' and data.get('params'):
-                                    params = data.get('params')
-                                    if isinstance(params, dict):
-                                        # 合并参数，优先使用params中的值
-                                        self.GET.update(params)
-                                    elif isinstance(params, str):
-                                        try:
-                                            # 尝试解析为字典
-                                            if params.startswith('{'):
-                                                param_dict = json.loads(params)
-                                                self.GET.update(param_dict)
-                                            else:
-                                                # 解析URL查询字符串
-                                                param_dict = parse_qs(params)
-                                                self.GET.update({k: v[0] for k, v in param_dict.items()})
-                                        except:
-                                            pass  # 如果解析失败，保留URL中的参数
-                                
-                                # 添加POST和DELETE请求的空处理
-                                self.POST = {}
-                                self.DELETE = {}
-                                self.PUT = {}
-                                
-                                # 处理请求头，确保只使用测试用例中的头信息
-                                # 明确只从测试用例数据中获取headers，不要添加额外的头信息
-                                case_headers = data.get('headers', {})
-                                self.headers = case_headers.copy() if isinstance(case_headers, dict) else {}
-                                
-                                # 打印调试信息
-                                print(f"请求头信息: {self.headers}")
-                                print(f"处理后的路径: {self.path}")
-                                print(f"处理后的GET参数: {self.GET}")
-                                
-                                self._body = self.body  # Django内部使用_body
-                                
-                                # 确保params字段可以被execute_test_direct函数访问到
-                                # 这是关键的修改：确保params字段在直接执行时可用
-                                if self.method == 'GET':
-                                    self.data['params'] = self.GET
-                        
-                        # 创建模拟请求
-                        mock_request = MockRequest(execute_data)
-                        print(f"模拟请求的HTTP方法: {mock_request.method}")
-                        print(f"模拟请求的路径: {mock_request.path}")
-                        print(f"模拟请求的GET参数: {mock_request.GET}")
-                        print(mock_request.headers)
-                        
-                        # 记录用例开始时间
-                        case_start_time = time.time()
-                        
-                        # 执行测试用例
-                        try:
-                            # 使用direct执行方法，因为它接受更灵活的参数
-                            response = execute_module.execute_test_direct(mock_request)
-                            # 尝试解析响应内容
-                            try:
-                                response_data = json.loads(response.content)
-                                
-                                # 处理提取的变量和上下文更新，不管是否有extractors都执行
-                                # 获取提取的变量，更新上下文
-                                extractors_data = response_data.get('data', {}).get('extractors', {})
-                                new_vars = extractors_data.get('extracted_variables', {})
-                                if new_vars:
-                                    print(f"提取到变量: {new_vars}")
-                                    context.update(new_vars)
-                                
-                                # 更新整个上下文
-                                new_context = extractors_data.get('context', {})
-                                if new_context:
-                                    context = new_context
-                                    print(f"更新后的上下文: {context}")
-                                
-                                # 注释掉为每个测试用例创建执行日志的代码
-                                # 在execute_test_direct方法中，会创建一条总的日志
-                                # 在测试套件执行完成后，会创建一条套件执行结果记录，足够记录执行历史
-                            except Exception as parse_error:
-                                print(f"解析响应内容失败: {str(parse_error)}")
-                            except json.JSONDecodeError:
-                                # 如果无法解析为JSON，则使用原始文本
-                                response_text = response.content.decode('utf-8', errors='ignore')
-                                response_data = {
-                                    'success': False,
-                                    'message': '响应无法解析为JSON',
-                                    'data': {
-                                        'status': 'ERROR',
-                                        'error': f'响应内容不是有效的JSON: {response_text[:200]}...',
-                                        'status_code': getattr(response, 'status_code', 500)
-                                    }
-                                }
-                        except Exception as e:
-                            # 处理请求执行过程中的异常
-                            print(f"执行API请求时出错: {str(e)}")
-                            response_data = {
-                                'success': False,
-                                'message': f'执行API请求时出错: {str(e)}',
-                                'data': {
-                                    'status': 'ERROR',
-                                    'error': str(e)
-                                }
-                            }
-                        
-                        # 计算用例执行时间
-                        case_duration = time.time() - case_start_time
-                        total_duration += case_duration
-                        
-                        # 解析执行结果
-                        success = response_data.get('success', False)
-                        result_data = response_data.get('data', {})
-                        status = result_data.get('status', 'ERROR')
-                        
-                        # 获取API响应信息
-                        api_response = result_data.get('response', {})
-                        api_status_code = api_response.get('status_code', 0) if isinstance(api_response, dict) else 0
-                        
-                        # 提取错误信息
-                        error_message = None
-                        
-                        # 如果API返回了错误状态码(4xx或5xx)，优先使用API的错误信息
-                        if api_status_code >= 400:
-                            # 尝试从API响应中获取错误信息
-                            try:
-                                if isinstance(api_response, dict) and api_response.get('body'):
-                                    # 优先使用body中的内容
-                                    error_body = api_response.get('body')
-                                    if isinstance(error_body, dict):
-                                        # 如果body是字典，尝试获取detail字段
-                                        error_message = json.dumps(error_body)
-                                    elif isinstance(error_body, str):
-                                        error_message = error_body
-                                elif isinstance(api_response, dict) and api_response.get('raw_text'):
-                                    # 如果有原始文本，使用原始文本
-                                    error_message = api_response.get('raw_text')
-                            except Exception as e:
-                                print(f"解析API错误信息失败: {str(e)}")
-                                
-                        # 如果没有从API获取到错误信息，则使用result_data中的error字段
-                        if not error_message:
-                            error_message = result_data.get('error', None)
-                        
-                        # 统计结果
-                        if status == 'PASS':
-                            passed_cases += 1
-                        elif status == 'FAIL':
-                            failed_cases += 1
-                        elif status == 'SKIP':
-                            skipped_cases += 1
-                        else:
-                            error_cases += 1
-                        
-                        # 保存执行结果
-                        execution_results.append({
-                            'index': index + 1,
-                            'case_id': original_case_id,
-                            'title': case_data.get('title', ''),
-                            'status': status,
-                            'duration': round(case_duration, 2),
-                            'api_path': case_data.get('api_path', ''),
-                            'method': case_data.get('method', 'GET'),
-                            'request': execute_data,
-                            'response': result_data.get('response', {}),
-                            'response_headers': result_data.get('response_headers', {}),  # 单独保存响应头
-                            'error': error_message,
-                            'extractors': result_data.get('extractors', {})  # 添加提取器信息
-                        })
-                        
-                    except json.JSONDecodeError as e:
-                        print(f"执行测试用例 {original_case_id} 时JSON解析错误: {str(e)}")
-                        error_cases += 1
-                        execution_results.append({
-                            'index': index + 1,
-                            'case_id': original_case_id,
-                            'title': case_data.get('title', '') if 'case_data' in locals() else f'用例 {original_case_id}',
-                            'status': 'ERROR',
-                            'duration': 0,
-                            'api_path': case_data.get('api_path', '') if 'case_data' in locals() else '',
-                            'method': case_data.get('method', 'GET') if 'case_data' in locals() else '',
-                            'error': f"JSON解析错误: {str(e)}"
-                        })
-                    except Exception as e:
-                        print(f"执行测试用例 {original_case_id} 时出错: {str(e)}")
-                        error_cases += 1
-                        execution_results.append({
-                            'index': index + 1,
-                            'case_id': original_case_id,
-                            'title': case_data.get('title', '') if 'case_data' in locals() else f'用例 {original_case_id}',
-                            'status': 'ERROR',
-                            'duration': 0,
-                            'api_path': case_data.get('api_path', '') if 'case_data' in locals() else '',
-                            'method': case_data.get('method', 'GET') if 'case_data' in locals() else '',
-                            'error': str(e)
-                        })
-                
-                # 计算总耗时
-                suite_end_time = timezone.now()
-                total_duration_seconds = (suite_end_time - suite_start_time).total_seconds()
-                
-                # 确定整体执行状态
-                if failed_cases > 0 or error_cases > 0:
-                    suite_status = 'fail'
-                elif skipped_cases == total_cases:
-                    suite_status = 'skip'
-                elif passed_cases == total_cases:
-                    suite_status = 'pass'
-                else:
-                    suite_status = 'partial'
-                
-                # 更新测试套件状态
-                test_suite.last_executed_at = suite_start_time
-                test_suite.last_execution_status = suite_status
-                test_suite.save()
-                
-                # 计算通过率
-                pass_rate = round(passed_cases / total_cases * 100, 2) if total_cases > 0 else 0
-                
-                # 准备结果数据
-                result_data = {
-                    'execution_time': suite_start_time.strftime('%Y-%m-%d %H:%M:%S'),
-                    'duration': round(total_duration_seconds, 2),
-                    'total_cases': total_cases,
-                    'passed_cases': passed_cases,
-                    'failed_cases': failed_cases,
-                    'error_cases': error_cases,
-                    'skipped_cases': skipped_cases,
-                    'pass_rate': pass_rate,
-                    'results': execution_results
-                }
-                
-                # 创建测试套件执行结果记录
-                suite_result = TestSuiteResult.objects.create(
-                    suite=test_suite,
-                    execution_time=suite_start_time,
-                    status=suite_status,
-                    duration=total_duration_seconds,
-                    total_cases=total_cases,
-                    passed_cases=passed_cases,
-                    failed_cases=failed_cases,
-                    error_cases=error_cases,
-                    skipped_cases=skipped_cases,
-                    pass_rate=pass_rate,
-                    result_data=json.dumps(result_data, ensure_ascii=False),
-                    environment=environment,
-                    creator=request.user
-                )
+                    })
                 
-                # 创建一条总的执行日志记录
-                try:
-                    # 构建请求和响应的汇总信息
-                    summary_request = {
-                        'total_cases': total_cases,
-                        'execution_info': f"测试套件 '{test_suite.name}' 共执行了 {total_cases} 个测试用例"
-                    }
-                    
-                    summary_response = {
-                        'passed': passed_cases,
-                        'failed': failed_cases,
-                        'error': error_cases,
-                        'skipped': skipped_cases,
-                        'pass_rate': f"{pass_rate}%"
-                    }
+                # 异步执行：提交到Celery后立即返回运行ID，通过状态接口查询进度
+                # 分片执行需要多个worker协作，始终以异步方式提交
+                sharded = get_shard_count(resolve_execution_config(test_suite.execution_config, overrides)) > 1
+                if request_data.get('async') or sharded:
+                    total_cases = test_suite.suite_cases.count()
+                    if total_cases == 0:
+                        return JsonResponse({
+                            'code': 400,
+                            'message': '测试套件中没有测试用例',
+                            'data': None
+                        }, status=400)
                     
-                    # 创建执行日志
-                    log = TestExecutionLog.objects.create(
-                        suite=test_suite,
-                        suite_result=suite_result,
-                        status=suite_status,
-                        duration=total_duration_seconds,
-                        executor=None,  # 避免AnonymousUser的问题
-                        request_url=f"测试套件执行: {test_suite.name}",
-                        request_method="SUITE",
-                        request_headers=json.dumps(summary_request),
-                        request_body=json.dumps({'suite_id': suite_id}),
-                        response_status_code=200,
-                        response_headers=json.dumps(summary_response),
-                        response_body=json.dumps(execution_results),
-                        log_detail=f"测试套件 {test_suite.name} 执行完成，共 {total_cases} 个用例，通过 {passed_cases} 个，失败 {failed_cases} 个，错误 {error_cases} 个，跳过 {skipped_cases} 个",
-                        error_message="" if suite_status in ['pass', 'partial'] else f"测试套件执行失败，通过率: {pass_rate}%",
-                        environment=environment
+                    run_id = run_status.new_run_id()
+                    user_id = request.user.id if request.user.is_authenticated else None
+                    run_status.init_run(run_id, test_suite.suite_id, total_cases, user_id)
+                    execute_suite_async.delay(
+                        run_id,
+                        test_suite.suite_id,
+                        environment_id=environment.environment_id if environment else None,
+                        user_id=user_id,
+                        overrides=overrides
                     )
-                    print(f"已创建测试套件执行总日志: ID={log.log_id}")
-                except Exception as log_error:
-                    print(f"创建测试套件执行总日志失败: {str(log_error)}")
-                    import traceback
-                    traceback.print_exc()
+                    return JsonResponse({
+                        'code': 200,
+                        'message': '测试套件已提交异步执行',
+                        'data': {
+                            'run_id': run_id,
+                            'suite_id': test_suite.suite_id,
+                            'status': 'queued',
+                            'total_cases': total_cases,
+                            'status_url': f'/api/suite/run/{run_id}'
+                        }
+                    })
                 
-                # 查询所有尚未关联到suite_result的执行日志并更新
-                TestExecutionLog.objects.filter(
-                    suite=test_suite,
-                    suite_result__isnull=True,
-                    execution_time__gte=suite_start_time
-                ).update(suite_result=suite_result)
+                # 同步执行测试套件
+                try:
+                    run_data = run_suite(
+                        test_suite,
+                        environment,
+                        user=request.user,
+                        overrides=overrides
+                    )
+                except ValueError as e:
+                    return JsonResponse({
+                        'code': 400,
+                        'message': str(e),
+                        'data': None
+                    }, status=400)
                 
                 # 返回执行结果
                 return JsonResponse({
                     'code': 200,
                     'message': '测试套件执行完成',
-                    'data': {
-                        'suite_id': test_suite.suite_id,
-                        'name': test_suite.name,
-                        'status': suite_status,
-                        'execution_time': suite_start_time.strftime('%Y-%m-%d %H:%M:%S'),
-                        'duration': round(total_duration_seconds, 2),
-                        'total_cases': total_cases,
-                        'passed_cases': passed_cases,
-                        'failed_cases': failed_cases,
-                        'error_cases': error_cases,
-                        'skipped_cases': skipped_cases,
-                        'pass_rate': pass_rate,
-                        'results': execution_results
-                    }
+                    'data': run_data
                 })
                 
             except Exception as e:
@@ -2100,7 +1790,7 @@ class TestSuiteView(APIView):
                             original_case = TestCase.objects.get(test_case_id=original_id)
                         except TestCase.DoesNotExist:
                             # 如果原始用例不存在，记录警告但继续
-                            print(f"警告: 原始用例 ID {original_id} 不存在，但仍将其添加到套件")
+                            logger.warning("警告: 原始用例 ID %s 不存在，但仍将其添加到套件", original_id)
                         
                         # 保存用例数据
                         TestSuiteCase.objects.create(
@@ -2343,6 +2033,7 @@ class TestSuiteView(APIView):
                 description = request.data.get('description')
                 env_id = request.data.get('envId')
                 selected_cases = request.data.get('selectedCases', [])
+                execution_config = request.data.get('executionConfig')
                 
                 # 更新套件基本信息
                 if name:
@@ -2350,6 +2041,12 @@ class TestSuiteView(APIView):
                 if description is not None:
                     test_suite.description = description
                 
+                # 更新执行配置（如执行模式、并发数）
+                if execution_config is not None:
+                    test_suite.execution_config = json.dumps(
+                        parse_execution_config(execution_config), ensure_ascii=False
+                    )
+                
                 # 更新环境套
                 if env_id:
                     try:
@@ -2434,6 +2131,245 @@ class TestSuiteView(APIView):
             }, status=500)
 
 
+class SuiteRunStatusView(APIView):
+    """查询异步执行的测试套件的运行状态和进度"""
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request, run_id):
+        try:
+            run_data = run_status.get_run(run_id)
+        except Exception as e:
+            return JsonResponse({
+                'code': 500,
+                'message': f'获取运行状态失败: {str(e)}',
+                'data': None
+            }, status=500)
+        
+        if run_data is None:
+            return JsonResponse({
+                'code': 404,
+                'message': '运行记录不存在或已过期',
+                'data': None
+            }, status=404)
+        
+        return JsonResponse({
+            'code': 200,
+            'message': 'success',
+            'data': run_data
+        })
+
+
+class SuiteRerunView(APIView):
+    """重跑套件执行结果中失败的用例，并查看与原执行合并后的结果"""
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def post(self, request, result_id):
+        """只重跑失败/错误/超时的用例及其依赖的变量产出用例，生成关联到原结果的新执行结果"""
+        suite_result = TestSuiteResult.objects.select_related('suite', 'environment').filter(result_id=result_id).first()
+        if suite_result is None:
+            return JsonResponse({
+                'code': 404,
+                'message': '执行结果不存在',
+                'data': None
+            }, status=404)
+
+        request_data = getattr(request, 'data', None) or {}
+        overrides = {
+            'mode': request_data.get('execution_mode'),
+            'backend': request_data.get('execution_backend'),
+            'case_timeout': request_data.get('case_timeout'),
+            'retry_max_attempts': request_data.get('retry_max_attempts')
+        }
+        try:
+            summary = rerun_failed_cases(
+                suite_result, user=request.user, overrides=overrides,
+                include_skipped=bool(request_data.get('include_skipped'))
+            )
+        except ValueError as e:
+            return JsonResponse({
+                'code': 400,
+                'message': str(e),
+                'data': None
+            }, status=400)
+        except Exception as e:
+            return JsonResponse({
+                'code': 500,
+                'message': f'重跑失败用例失败: {str(e)}',
+                'data': None
+            }, status=500)
+
+        new_result = TestSuiteResult.objects.get(result_id=summary['result_id'])
+        return JsonResponse({
+            'code': 200,
+            'message': '失败用例重跑完成',
+            'data': {
+                'rerun': summary,
+                'merged': merge_rerun_results(new_result)
+            }
+        })
+
+    def get(self, request, result_id):
+        """合并视图：原执行结果与之后各次重跑结果合并后的用例结果和统计"""
+        suite_result = TestSuiteResult.objects.filter(result_id=result_id).first()
+        if suite_result is None:
+            return JsonResponse({
+                'code': 404,
+                'message': '执行结果不存在',
+                'data': None
+            }, status=404)
+        return JsonResponse({
+            'code': 200,
+            'message': 'success',
+            'data': merge_rerun_results(suite_result)
+        })
+
+
+class SuitePredictView(APIView):
+    """执行前根据用例历史耗时预估套件的执行时间"""
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request, suite_id):
+        """查询参数 execution_mode、max_workers、execution_backend、shards 可覆盖套件的执行配置"""
+        test_suite = TestSuite.objects.filter(suite_id=suite_id).first()
+        if test_suite is None:
+            return JsonResponse({
+                'code': 404,
+                'message': '测试套件不存在',
+                'data': None
+            }, status=404)
+
+        overrides = {
+            'mode': request.GET.get('execution_mode'),
+            'max_workers': request.GET.get('max_workers'),
+            'backend': request.GET.get('execution_backend'),
+            'shards': request.GET.get('shards')
+        }
+        try:
+            execution_config = resolve_execution_config(test_suite.execution_config, overrides)
+            prediction = predict_suite_duration(suite_plan_cache.get_plan(test_suite), execution_config)
+        except (TypeError, ValueError) as e:
+            return JsonResponse({
+                'code': 400,
+                'message': f'执行配置无效: {str(e)}',
+                'data': None
+            }, status=400)
+        return JsonResponse({
+            'code': 200,
+            'message': 'success',
+            'data': prediction
+        })
+
+
+class SuiteMatrixView(APIView):
+    """在多个环境上同时执行测试套件，并排对比各环境的执行结果"""
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def post(self, request, suite_id):
+        """
+        请求参数 environment_ids 为执行环境ID列表，其余执行配置参数与套件执行相同，对所有环境生效
+
+        矩阵执行提交到Celery后立即返回运行ID；完成后运行状态中的 result_ids 可用于 GET 对比各环境的结果
+        """
+        test_suite = TestSuite.objects.filter(suite_id=suite_id).first()
+        if test_suite is None:
+            return JsonResponse({
+                'code': 404,
+                'message': '测试套件不存在',
+                'data': None
+            }, status=404)
+
+        request_data = getattr(request, 'data', None) or {}
+        environments, env_error = load_matrix_environments(request_data.get('environment_ids'))
+        if env_error:
+            return JsonResponse({
+                'code': 400,
+                'message': env_error,
+                'data': None
+            }, status=400)
+        total_cases = test_suite.suite_cases.count()
+        if total_cases == 0:
+            return JsonResponse({
+                'code': 400,
+                'message': '测试套件中没有测试用例',
+                'data': None
+            }, status=400)
+
+        overrides = {
+            'mode': request_data.get('execution_mode'),
+            'max_workers': request_data.get('max_workers'),
+            'backend': request_data.get('execution_backend'),
+            'case_timeout': request_data.get('case_timeout'),
+            'suite_timeout': request_data.get('suite_timeout'),
+            'retry_max_attempts': request_data.get('retry_max_attempts'),
+            'stop_on_failure': request_data.get('stop_on_failure'),
+            'skip_missing_variables': request_data.get('skip_missing_variables')
+        }
+        try:
+            check_matrix_config(test_suite, overrides)
+        except ValueError as e:
+            return JsonResponse({
+                'code': 400,
+                'message': str(e),
+                'data': None
+            }, status=400)
+
+        environment_ids = [environment.environment_id for environment in environments]
+        run_id = run_status.new_run_id()
+        user_id = request.user.id if request.user.is_authenticated else None
+        try:
+            run_status.init_run(run_id, test_suite.suite_id, total_cases * len(environments), user_id)
+            execute_suite_matrix.delay(run_id, test_suite.suite_id, environment_ids, user_id=user_id, overrides=overrides)
+        except Exception as e:
+            logger.exception("提交多环境执行失败: %s", e)
+            return JsonResponse({
+                'code': 500,
+                'message': f'提交多环境执行失败: {str(e)}',
+                'data': None
+            }, status=500)
+        return JsonResponse({
+            'code': 200,
+            'message': '多环境执行已提交异步执行',
+            'data': {
+                'run_id': run_id,
+                'suite_id': test_suite.suite_id,
+                'environment_ids': environment_ids,
+                'status': 'queued',
+                'total_cases': total_cases * len(environments),
+                'status_url': f'/api/suite/run/{run_id}'
+            }
+        })
+
+    def get(self, request, suite_id):
+        """查询参数 result_ids 为逗号分隔的执行结果ID，并排对比这些已保存的执行结果"""
+        try:
+            result_ids = [int(result_id) for result_id in request.GET.get('result_ids', '').split(',') if result_id.strip()]
+        except ValueError:
+            result_ids = []
+        if len(result_ids) < 2:
+            return JsonResponse({
+                'code': 400,
+                'message': '请提供至少两个执行结果ID result_ids',
+                'data': None
+            }, status=400)
+        try:
+            comparison = compare_suite_results(suite_id, result_ids)
+        except ValueError as e:
+            return JsonResponse({
+                'code': 400,
+                'message': str(e),
+                'data': None
+            }, status=400)
+        return JsonResponse({
+            'code': 200,
+            'message': 'success',
+            'data': comparison
+        })
+
+
 class EnvironmentSwitchView(APIView):
     """环境套切换视图"""
     permission_classes = [IsAuthenticated]
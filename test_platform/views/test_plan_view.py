@@ -7,6 +7,8 @@ from django.utils import timezone
 from test_platform.models import TestPlan, TestPlanSuite, TestSuite, Project, TestPlanResult, TestSuiteResult
 import datetime
 from test_platform.tasks import execute_test_plan
+from test_platform.execution.blob_store import unpack
+from test_platform.execution.config import parse_execution_config
 
 
 class TestPlanView(APIView):
@@ -29,6 +31,7 @@ class TestPlanView(APIView):
             test_suites = data.get('testSuites', [])
             retry_times = data.get('retryTimes', 0)
             notify_types = data.get('notifyTypes', [])
+            execution_config = data.get('executionConfig')
             project_id = data.get('projectId')
             
             # 验证必要参数
@@ -92,6 +95,7 @@ class TestPlanView(APIView):
                 cron_expression=cron_expression,
                 retry_times=retry_times,
                 notify_types=','.join(notify_types) if notify_types else '',
+                execution_config=json.dumps(parse_execution_config(execution_config), ensure_ascii=False) if execution_config else None,
                 project=project,
                 creator=request.user,
                 status='pending'
@@ -193,6 +197,7 @@ class TestPlanView(APIView):
                     'cron_expression': plan.cron_expression,
                     'retry_times': plan.retry_times,
                     'notify_types': plan.notify_types.split(',') if plan.notify_types else [],
+                    'execution_config': parse_execution_config(plan.execution_config),
                     'status': plan.status,
                     'project_id': plan.project.project_id,
                     'project_name': plan.project.name,
@@ -332,6 +337,11 @@ class TestPlanView(APIView):
                 notify_types = data['notifyTypes']
                 plan.notify_types = ','.join(notify_types) if notify_types else ''
                 
+            if 'executionConfig' in data:
+                plan.execution_config = json.dumps(
+                    parse_execution_config(data['executionConfig']), ensure_ascii=False
+                )
+                
             if 'status' in data:
                 plan.status = data['status']
                 
@@ -679,7 +689,8 @@ class TestPlanView(APIView):
                     'total': total_count,
                     'page': page,
                     'page_size': page_size,
-                    'executions': execution_list
+                    # 结果数据中的响应体引用在整页范围内一次取回
+                    'executions': unpack(execution_list)
                 }
             })
             